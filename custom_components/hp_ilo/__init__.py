@@ -13,14 +13,24 @@ from homeassistant.const import (
     Platform,
 )
 from homeassistant.core import HomeAssistant
+import homeassistant.helpers.config_validation as cv
 
 from .coordinator import HpIloDataUpdateCoordinator
+from .services import async_setup_services
+from .store import HpIloStore
 
 DOMAIN = "hp_ilo"
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.SENSOR, Platform.BINARY_SENSOR, Platform.SWITCH, Platform.BUTTON]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the services of the integration."""
+    async_setup_services(hass)
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up entities of all platforms from a config entry."""
     hass.data.setdefault(DOMAIN, {})
@@ -28,18 +38,37 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Create the coordinator
     coordinator = HpIloDataUpdateCoordinator(hass, entry)
     
-    # Fetch initial data so we have data when entities subscribe
-    await coordinator.async_config_entry_first_refresh()
+    # With the layout of a previous run the entities are created right away
+    # and the initial data is fetched in the background. Otherwise fetch it
+    # first, so we know which entities to create.
+    await coordinator.async_load_layout()
+    if coordinator.layout is None:
+        await coordinator.async_config_entry_first_refresh()
+    else:
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} first refresh"
+        )
     
     # Store coordinator for all platforms to use
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+
+    # Reload to apply changed refresh intervals
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
     return True
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload a config entry after its options changed."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id, None)
     return unload_ok
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored layout of a deleted config entry."""
+    await HpIloStore(hass, entry.entry_id).async_remove()
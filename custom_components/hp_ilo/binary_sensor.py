@@ -2,12 +2,14 @@
 from __future__ import annotations
 
 import logging
+from typing import Any
 
 from homeassistant.components.binary_sensor import (
     BinarySensorDeviceClass,
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity import DeviceInfo
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
@@ -15,10 +17,32 @@ from homeassistant.helpers.device_registry import CONNECTION_UPNP
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .coordinator import HpIloDataUpdateCoordinator
+from .health import HpIloComponent
 
 DOMAIN = "hp_ilo"
 _LOGGER = logging.getLogger(__name__)
 
+# Names of the health at a glance subsystems, others are named after the key
+SUBSYSTEM_NAMES = {
+    "bios_hardware": "BIOS/Hardware health",
+    "fans": "Fans health",
+    "memory": "Memory health",
+    "network": "Network health",
+    "power_supplies": "Power supplies health",
+    "processor": "Processor health",
+    "storage": "Storage health",
+    "temperature": "Temperature health",
+}
+
+# HpIloData field -> whether its problem sensors are enabled by default
+COMPONENT_FIELDS = {
+    "subsystems": True,
+    "power_supplies": True,
+    "storage": True,
+    # Servers have many modules, the memory subsystem covers them
+    "dimms": False,
+}
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -50,7 +74,7 @@ async def async_setup_entry(
     binary_sensors = []
 
     # Add power status binary sensor if power status is available
-    if coordinator.data and coordinator.data.power_status is not None:
+    if coordinator.layout.power_status:
         _LOGGER.info("Adding binary sensor for Server Power Status")
         binary_sensors.append(
             HpIloPowerStatusBinarySensor(
@@ -60,6 +84,22 @@ async def async_setup_entry(
             )
         )
 
+    # Problem sensors of the subsystems and components
+    layout = coordinator.layout
+    for component_field, enabled in COMPONENT_FIELDS.items():
+        for label in getattr(layout, component_field):
+            _LOGGER.info("Adding problem binary sensor for %s", label)
+            binary_sensors.append(
+                HpIloComponentBinarySensor(
+                    coordinator=coordinator,
+                    entry=entry,
+                    device_info=device_info,
+                    component_field=component_field,
+                    label=label,
+                    enabled=enabled,
+                )
+            )
+
     async_add_entities(binary_sensors, False)
 
 
@@ -75,7 +115,7 @@ class HpIloPowerStatusBinarySensor(CoordinatorEntity[HpIloDataUpdateCoordinator]
         device_info: DeviceInfo,
     ) -> None:
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context="power_status")
         self._attr_device_info = device_info
         self._attr_name = "Server Power"
         self._attr_unique_id = f"{entry.data['unique_id']}_server_power"
@@ -94,3 +134,54 @@ class HpIloPowerStatusBinarySensor(CoordinatorEntity[HpIloDataUpdateCoordinator]
         else:
             # get_host_power_status returns "ON" or "OFF"
             self._attr_is_on = self.coordinator.data.power_status == "ON"
+
+
+class HpIloComponentBinarySensor(CoordinatorEntity[HpIloDataUpdateCoordinator], BinarySensorEntity):
+    """Binary sensor for a problem with a subsystem or component of the server."""
+
+    _attr_device_class = BinarySensorDeviceClass.PROBLEM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: HpIloDataUpdateCoordinator,
+        entry: ConfigEntry,
+        device_info: DeviceInfo,
+        component_field: str,
+        label: str,
+        enabled: bool,
+    ) -> None:
+        """Initialize the binary sensor."""
+        super().__init__(coordinator, context=(component_field, label))
+        self._field = component_field
+        self._label = label
+        self._attr_device_info = device_info
+        if component_field == "subsystems":
+            self._attr_name = SUBSYSTEM_NAMES.get(
+                label, f"{label.replace('_', ' ').capitalize()} health"
+            )
+        else:
+            self._attr_name = label
+        self._attr_unique_id = f"{entry.data['unique_id']}_{component_field}_{label}"
+        self._attr_entity_registry_enabled_default = enabled
+
+    @property
+    def _component(self) -> HpIloComponent | None:
+        """Return the component from the coordinator data."""
+        if not self.coordinator.data:
+            return None
+        return getattr(self.coordinator.data, self._field).get(self._label)
+
+    @property
+    def is_on(self) -> bool | None:
+        """Return whether the component reports a problem."""
+        if (component := self._component) is None:
+            return None
+        return component.problem
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the status and details the iLO reports for the component."""
+        if (component := self._component) is None:
+            return None
+        return {"status": component.status, **dict(component.attributes)}
@@ -0,0 +1,67 @@
+"""Circuit breaker backing off from unreachable iLOs."""
+from __future__ import annotations
+
+import logging
+import random
+from time import monotonic
+
+_LOGGER = logging.getLogger(__name__)
+
+# Delay after the first failure, doubled for every further failure
+BACKOFF_MIN = 30
+BACKOFF_MAX = 15 * 60
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class HpIloCircuitBreaker:
+    """Track communication failures of a host and back off from it.
+
+    The breaker opens on a communication error and stays open for an
+    exponentially growing, jittered delay. Once the delay passed it is
+    half open: a cheap liveness probe decides whether the host is polled
+    again or the breaker opens for a longer delay.
+    """
+
+    def __init__(
+        self, backoff_min: float = BACKOFF_MIN, backoff_max: float = BACKOFF_MAX
+    ) -> None:
+        """Initialize the breaker."""
+        self.backoff_min = backoff_min
+        self.backoff_max = backoff_max
+        self.failures = 0
+        self._open_until = 0.0
+
+    @property
+    def state(self) -> str:
+        """Return the state of the breaker."""
+        if not self.failures:
+            return STATE_CLOSED
+        if monotonic() < self._open_until:
+            return STATE_OPEN
+        return STATE_HALF_OPEN
+
+    @property
+    def retry_in(self) -> float:
+        """Return the seconds until the host is tried again."""
+        return max(0.0, self._open_until - monotonic())
+
+    def record_success(self) -> None:
+        """Close the breaker."""
+        if self.failures:
+            _LOGGER.debug("Host is reachable again after %d failures", self.failures)
+        self.failures = 0
+        self._open_until = 0.0
+
+    def record_failure(self) -> None:
+        """Open the breaker for the next backoff delay."""
+        self.failures += 1
+        delay = min(self.backoff_max, self.backoff_min * 2 ** (self.failures - 1))
+        # Jitter, so hosts that went down together don't retry in lockstep
+        delay = random.uniform(delay / 2, delay)
+        self._open_until = monotonic() + delay
+        _LOGGER.debug(
+            "Backing off for %.0f seconds after %d failures", delay, self.failures
+        )
@@ -94,17 +94,18 @@ class HpIloPowerButton(ButtonEntity):
 
     async def async_press(self) -> None:
         """Press the power button."""
-        if not self.coordinator.data or not self.coordinator.data.ilo:
-            _LOGGER.error("No iLO connection available")
-            return
-            
         try:
-            await self.hass.async_add_executor_job(
-                self.coordinator.data.ilo.press_pwr_btn
-            )
+            await self.coordinator.async_command("press_pwr_btn")
             _LOGGER.info("Successfully pressed power button")
-            # Request a refresh to update the power state
-            await self.coordinator.async_request_refresh()
+            # Follow the power state until the server reacted, the button
+            # toggles it
+            if (data := self.coordinator.data) is not None and data.power_status:
+                self.coordinator.async_follow_power(
+                    "OFF" if data.power_status == "ON" else "ON"
+                )
+            else:
+                # Unknown power state, nothing to follow
+                await self.coordinator.async_request_refresh()
         except (
             hpilo.IloError,
             hpilo.IloCommunicationError,
@@ -144,17 +145,11 @@ class HpIloPowerButtonHold(ButtonEntity):
 
     async def async_press(self) -> None:
         """Press and hold the power button (force power off)."""
-        if not self.coordinator.data or not self.coordinator.data.ilo:
-            _LOGGER.error("No iLO connection available")
-            return
-            
         try:
-            await self.hass.async_add_executor_job(
-                self.coordinator.data.ilo.hold_pwr_btn
-            )
+            await self.coordinator.async_command("hold_pwr_btn")
             _LOGGER.info("Successfully held power button (force off)")
-            # Request a refresh to update the power state
-            await self.coordinator.async_request_refresh()
+            # Follow the power state until the server reacted
+            self.coordinator.async_follow_power("OFF")
         except (
             hpilo.IloError,
             hpilo.IloCommunicationError,
@@ -190,16 +185,10 @@ class HpIloResetButton(ButtonEntity):
 
     async def async_press(self) -> None:
         """Reset the server."""
-        if not self.coordinator.data or not self.coordinator.data.ilo:
-            _LOGGER.error("No iLO connection available")
-            return
-            
         try:
-            await self.hass.async_add_executor_job(
-                self.coordinator.data.ilo.reset_server
-            )
+            await self.coordinator.async_command("reset_server")
             _LOGGER.info("Successfully reset server")
-            # Request a refresh to update the state
+            # The server stays on, there is no power state change to follow
             await self.coordinator.async_request_refresh()
         except (
             hpilo.IloError,
@@ -0,0 +1,92 @@
+"""Negative capability cache of an iLO."""
+from __future__ import annotations
+
+from collections.abc import Iterable
+import logging
+from typing import Any
+
+from homeassistant.core import callback
+
+from .store import HpIloStore
+
+_LOGGER = logging.getLogger(__name__)
+
+STORE_KEY = "capabilities"
+
+
+def firmware_key(transport: str, fw_version: dict[str, Any] | None) -> str | None:
+    """Return what the supported calls depend on, None if unknown."""
+    if not fw_version or "firmware_version" not in fw_version:
+        return None
+    return "|".join(
+        (
+            transport,
+            str(fw_version.get("management_processor", "")),
+            str(fw_version["firmware_version"]),
+            str(fw_version.get("license_type", "")),
+        )
+    )
+
+
+class HpIloCapabilities:
+    """Calls an iLO doesn't support, for its firmware version and license.
+
+    The generation, firmware and license of an iLO don't change at runtime,
+    so unsupported calls are skipped from then on. They are probed again
+    when the firmware version (or license) changes.
+    """
+
+    def __init__(self, store: HpIloStore, transport: str) -> None:
+        """Initialize the capabilities."""
+        self._store = store
+        self._transport = transport
+        self._firmware: str | None = None
+        self.unsupported: set[str] = set()
+
+    @callback
+    def async_load(self) -> None:
+        """Load the capabilities from the (already loaded) store.
+
+        Calls recorded with another transport, or before the firmware was
+        known, are probed again.
+        """
+        stored = self._store.async_get(STORE_KEY) or {}
+        firmware = stored.get("firmware")
+        if firmware is None or firmware.split("|", 1)[0] != self._transport:
+            return
+        self._firmware = firmware
+        self.unsupported = set(stored.get("unsupported", []))
+
+    @callback
+    def async_set_firmware(self, fw_version: dict[str, Any] | None) -> None:
+        """Forget the unsupported calls when the firmware changed."""
+        if (key := firmware_key(self._transport, fw_version)) is None:
+            return
+        if key == self._firmware:
+            return
+        if self._firmware is not None and self.unsupported:
+            _LOGGER.info(
+                "Firmware changed to %s, probing %s again",
+                key,
+                ", ".join(sorted(self.unsupported)),
+            )
+        self._firmware = key
+        self.unsupported.clear()
+        self._async_save()
+
+    @callback
+    def async_add_unsupported(self, methods: Iterable[str]) -> None:
+        """Record calls the iLO doesn't support."""
+        if not (new := set(methods) - self.unsupported):
+            return
+        _LOGGER.debug("Skipping unsupported calls from now on: %s", ", ".join(new))
+        self.unsupported |= new
+        self._async_save()
+
+    @callback
+    def _async_save(self) -> None:
+        """Store the capabilities."""
+        self._store.async_set(
+            STORE_KEY,
+            {"firmware": self._firmware, "unsupported": sorted(self.unsupported)},
+        )
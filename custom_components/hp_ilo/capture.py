@@ -0,0 +1,117 @@
+"""Capture of raw iLO responses, for replay in tests and benchmarks."""
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+import re
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import slugify
+
+from .ribcl import has_payload, split_documents
+
+_LOGGER = logging.getLogger(__name__)
+
+CONF_CAPTURE = "capture"
+
+# Captures are saved to <config>/hp_ilo_captures/<host>/{ribcl,redfish}
+CAPTURE_DIR = "hp_ilo_captures"
+RIBCL_DIR = "ribcl"
+REDFISH_DIR = "redfish"
+
+REDACTED = "**REDACTED**"
+
+# Serial numbers, UUIDs and credentials in RIBCL documents, e.g.
+# <SERIAL_NUMBER VALUE = "..."/>, <FIELD NAME="UUID" VALUE="..."/>
+RIBCL_REDACTIONS = (
+    re.compile(
+        r'(<[A-Z_]*(?:SERIAL|UUID)[A-Z_]*\s+VALUE\s*=\s*")[^"]*(")', re.IGNORECASE
+    ),
+    re.compile(
+        r'(<FIELD\s+NAME\s*=\s*"[^"]*(?:Serial|UUID)[^"]*"\s+VALUE\s*=\s*")[^"]*(")',
+        re.IGNORECASE,
+    ),
+    re.compile(r'((?:PASSWORD|USER_LOGIN)\s*=\s*")[^"]*(")', re.IGNORECASE),
+)
+
+# Keys of Redfish resources holding serial numbers or UUIDs
+REDFISH_REDACTED_KEYS = re.compile(r"serial|uuid", re.IGNORECASE)
+
+
+def capture_directory(hass: HomeAssistant, host: str) -> Path:
+    """Return the directory the captures of a host are saved to."""
+    return Path(hass.config.path(CAPTURE_DIR, slugify(host)))
+
+
+def redact_ribcl(document: bytes) -> bytes:
+    """Redact serial numbers, UUIDs and credentials from a RIBCL document."""
+    # latin-1 maps every byte to a character, so this is lossless
+    data = document.decode("latin-1")
+    for pattern in RIBCL_REDACTIONS:
+        data = pattern.sub(rf"\g<1>{REDACTED}\g<2>", data)
+    return data.encode("latin-1")
+
+
+def redact_redfish(resource: Any) -> Any:
+    """Redact serial numbers and UUIDs from a Redfish resource."""
+    if isinstance(resource, dict):
+        return {
+            key: REDACTED
+            if REDFISH_REDACTED_KEYS.search(key) and isinstance(value, str)
+            else redact_redfish(value)
+            for key, value in resource.items()
+        }
+    if isinstance(resource, list):
+        return [redact_redfish(value) for value in resource]
+    return resource
+
+
+def redfish_file_name(path: str) -> str:
+    """Return the capture file name of a Redfish resource path."""
+    return f"{path.strip('/').replace('/', '_')}.json"
+
+
+class HpIloCapture:
+    """Save the raw responses of a transport, redacted.
+
+    RIBCL responses are split into one document per command and saved as
+    <method>.xml, Redfish resources as JSON named after their path. The
+    latest response of each method or resource is kept.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: Path) -> None:
+        """Initialize the capture."""
+        self.hass = hass
+        self.directory = directory
+
+    async def async_save_ribcl(self, methods: list[str], body: bytes) -> None:
+        """Save the response documents of the RIBCL commands."""
+        # Documents without a payload, like the answer to the login, aren't
+        # the answer of a command
+        documents = [
+            document
+            for document in split_documents(body.decode("latin-1"))
+            if has_payload(document)
+        ]
+        files = {
+            f"{method}.xml": redact_ribcl(document.encode("latin-1"))
+            for method, document in zip(methods, documents)
+        }
+        await self.hass.async_add_executor_job(self._write, RIBCL_DIR, files)
+
+    async def async_save_redfish(self, path: str, resource: dict[str, Any]) -> None:
+        """Save a Redfish resource."""
+        data = json.dumps(redact_redfish(resource), indent=2, sort_keys=True)
+        await self.hass.async_add_executor_job(
+            self._write, REDFISH_DIR, {redfish_file_name(path): data.encode()}
+        )
+
+    def _write(self, subdirectory: str, files: dict[str, bytes]) -> None:
+        """Write capture files."""
+        directory = self.directory / subdirectory
+        directory.mkdir(parents=True, exist_ok=True)
+        for name, data in files.items():
+            (directory / name).write_bytes(data)
+        _LOGGER.debug("Captured %s to %s", ", ".join(files), directory)
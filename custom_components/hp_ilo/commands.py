@@ -0,0 +1,64 @@
+"""Serialization of the requests sent to an iLO."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from homeassistant.core import HomeAssistant
+
+from .transport import HpIloTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class HpIloCommandQueue:
+    """Send the refreshes and commands of a host one at a time.
+
+    iLOs handle parallel sessions badly and answer with "busy" errors, so
+    a command waits for the refresh in flight and the other way around, in
+    the order they were issued. A command that is already queued or in
+    flight with the same arguments (e.g. a double press) isn't sent again,
+    the callers share its result. Every command is sent on its own
+    connection and login by the transport.
+    """
+
+    def __init__(self, hass: HomeAssistant, transport: HpIloTransport) -> None:
+        """Initialize the queue."""
+        self.hass = hass
+        self.transport = transport
+        self._lock = asyncio.Lock()
+        # (method, args) -> task of the queued or running command
+        self._commands: dict[tuple[Any, ...], asyncio.Task[Any]] = {}
+
+    async def async_fetch(
+        self, methods: list[str], unsupported: set[str] | None = None
+    ) -> dict[str, Any]:
+        """Fetch the query methods once the requests before are done."""
+        async with self._lock:
+            return await self.transport.async_fetch(methods, unsupported)
+
+    async def async_command(self, method: str, *args: Any) -> Any:
+        """Send a command once the requests before are done.
+
+        The command is sent even if the caller is cancelled while waiting,
+        it may already have reached the iLO.
+        """
+        key = (method, *args)
+        if (task := self._commands.get(key)) is None:
+            task = self._commands[key] = self.hass.async_create_task(
+                self._async_send(method, *args), f"hp_ilo {method}"
+            )
+            task.add_done_callback(lambda _: self._commands.pop(key, None))
+        else:
+            _LOGGER.debug(
+                "%s to %s is already pending, not sending it again",
+                method,
+                self.transport.host,
+            )
+        return await asyncio.shield(task)
+
+    async def _async_send(self, method: str, *args: Any) -> Any:
+        """Send a command in turn."""
+        async with self._lock:
+            return await self.transport.async_call(method, *args)
@@ -5,9 +5,22 @@ import voluptuous as vol
 import hpilo 
 
 from homeassistant import config_entries, data_entry_flow
+from homeassistant.core import callback
 from homeassistant.helpers.service_info.ssdp import SsdpServiceInfo, ATTR_UPNP_FRIENDLY_NAME, ATTR_UPNP_MODEL_NAME
 from homeassistant.data_entry_flow import FlowResult
 from homeassistant.const import CONF_HOST, CONF_NAME, CONF_DESCRIPTION, ATTR_CONFIGURATION_URL, CONF_PORT, CONF_PROTOCOL, CONF_UNIQUE_ID, CONF_USERNAME, CONF_PASSWORD
+from .capture import CONF_CAPTURE
+from .fleet import CONF_PARSE_PROCESSES
+from .coordinator import CONF_HEALTH_INTERVAL, DEFAULT_HEALTH_INTERVAL
+from .probe import HpIloIdentity, async_probe
+from .transport import (
+    CONF_TRANSPORT,
+    DEFAULT_TRANSPORT,
+    TRANSPORT_ASYNC,
+    TRANSPORT_EXECUTOR,
+    TRANSPORT_REDFISH,
+    TRANSPORT_REPLAY,
+)
 from .sensor import SENSOR_TYPES, DOMAIN
 
 _LOGGER = logging.getLogger(__name__)
@@ -22,6 +35,13 @@ class HpIloFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize the HpIlo flow."""
         self.device = None
         self.config = None
+        self.identity: HpIloIdentity | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        """Get the options flow for this handler."""
+        return HpIloOptionsFlowHandler()
 
     async def async_set_device(self, device, raise_on_progress=True):
         """Define a device for the config flow."""
@@ -74,6 +94,11 @@ class HpIloFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
         self._async_abort_entries_match({CONF_HOST: self.config[CONF_HOST]})
 
+        # The product name reported by the iLO itself is more precise than
+        # the UPnP model name
+        if await self._async_probe_identity() and self.identity.product_name:
+            self.config[CONF_DESCRIPTION] = self.identity.product_name
+
         await self.async_set_unique_id(self.config[CONF_UNIQUE_ID])
         self._abort_if_unique_id_configured(updates=self.config)
 
@@ -92,6 +117,12 @@ class HpIloFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Handle user-confirmation of discovered node."""
         if user_input is not None:
             # Update config with user-confirmed values
+            if (user_input[CONF_HOST], int(user_input[CONF_PORT])) != (
+                self.config.get(CONF_HOST),
+                self.config.get(CONF_PORT),
+            ):
+                # The probed identity is of the discovered iLO
+                self.identity = None
             self.config[CONF_HOST] = user_input[CONF_HOST]
             self.config[CONF_PORT] = int(user_input[CONF_PORT])
             return await self.async_step_auth()
@@ -149,12 +180,28 @@ class HpIloFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                     data=self.config,
                 )
 
+    async def _async_probe_identity(self) -> bool:
+        """Read the identity of the iLO without logging in.
+
+        This is best effort, the xmldata endpoint can be disabled on the iLO.
+        """
+        if self.identity is None:
+            try:
+                self.identity = await async_probe(
+                    self.hass, self.config[CONF_HOST], int(self.config[CONF_PORT])
+                )
+            except hpilo.IloCommunicationError as error:
+                _LOGGER.debug("Could not probe %s: %s", self.config[CONF_HOST], error)
+        return self.identity is not None
+
     async def async_step_auth(self, user_input=None, errors=None):
         """Authenticate to the device."""
         device = self.device
         errors_dict = {}
 
-        if user_input is not None:
+        if user_input is None:
+            await self._async_probe_identity()
+        else:
             try:
                 self.ilo = hpilo.Ilo(
                     hostname=self.config[CONF_HOST],
@@ -162,19 +209,27 @@ class HpIloFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
                     login=user_input[CONF_USERNAME],
                     password=user_input[CONF_PASSWORD]
                 ) 
-                # Verify connection and get serial number for unique_id
-                try:
-                    host_data = self.ilo.get_host_data()
-                    # Extract serial number from host data for stable unique_id
-                    # host_data is a list with one dict containing 'Serial Number' field
-                    if host_data and len(host_data) > 0:
-                        serial_number = host_data[0].get("Serial Number")
-                        if serial_number:
-                            # Use combination of host and serial number for unique_id
-                            # This ensures uniqueness across network changes
-                            self.config[CONF_UNIQUE_ID] = f"{self.config[CONF_HOST]}_{serial_number}"
-                except Exception as e:
-                    _LOGGER.error("Failed to get host data from iLO: %s", e)
+                if self.identity and self.identity.serial_number:
+                    # The serial number is already known from the probe, so
+                    # only verify the credentials, with the cheapest call
+                    await self.hass.async_add_executor_job(self.ilo.get_fw_version)
+                    self.config[CONF_UNIQUE_ID] = f"{self.config[CONF_HOST]}_{self.identity.serial_number}"
+                else:
+                    # Verify connection and get serial number for unique_id
+                    try:
+                        host_data = await self.hass.async_add_executor_job(
+                            self.ilo.get_host_data
+                        )
+                        # Extract serial number from host data for stable unique_id
+                        # host_data is a list with one dict containing 'Serial Number' field
+                        if host_data and len(host_data) > 0:
+                            serial_number = host_data[0].get("Serial Number")
+                            if serial_number:
+                                # Use combination of host and serial number for unique_id
+                                # This ensures uniqueness across network changes
+                                self.config[CONF_UNIQUE_ID] = f"{self.config[CONF_HOST]}_{serial_number}"
+                    except Exception as e:
+                        _LOGGER.error("Failed to get host data from iLO: %s", e)
                 
                 self.config[CONF_USERNAME] = user_input[CONF_USERNAME]
                 self.config[CONF_PASSWORD] = user_input[CONF_PASSWORD]
@@ -222,3 +277,37 @@ class HpIloFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Import config from configuration.yaml."""
         self._async_abort_entries_match({CONF_HOST: import_info[CONF_HOST]})
         return await self.async_step_user(import_info)
+
+
+class HpIloOptionsFlowHandler(config_entries.OptionsFlow):
+    """Handle HpIlo options."""
+
+    async def async_step_init(self, user_input=None):
+        """Manage the refresh intervals and transport."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        transport = self.config_entry.options.get(CONF_TRANSPORT, DEFAULT_TRANSPORT)
+        transports = [TRANSPORT_EXECUTOR, TRANSPORT_ASYNC, TRANSPORT_REDFISH]
+        # Replaying captures serves canned data and ignores power commands,
+        # it is meant for reproducing issues
+        if self.show_advanced_options or transport == TRANSPORT_REPLAY:
+            transports.append(TRANSPORT_REPLAY)
+        data_schema = {
+            vol.Required(
+                CONF_HEALTH_INTERVAL,
+                default=self.config_entry.options.get(
+                    CONF_HEALTH_INTERVAL, DEFAULT_HEALTH_INTERVAL
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=30, max=3600)),
+            vol.Required(CONF_TRANSPORT, default=transport): vol.In(transports),
+            vol.Required(
+                CONF_CAPTURE,
+                default=self.config_entry.options.get(CONF_CAPTURE, False),
+            ): bool,
+            vol.Required(
+                CONF_PARSE_PROCESSES,
+                default=self.config_entry.options.get(CONF_PARSE_PROCESSES, False),
+            ): bool,
+        }
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(data_schema))
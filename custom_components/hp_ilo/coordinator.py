@@ -1,47 +1,379 @@
 """DataUpdateCoordinator for HP iLO integration."""
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import timedelta
+import asyncio
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, field, fields, replace
+from datetime import datetime, timedelta
 import logging
+import math
+from time import monotonic, time
 from typing import Any
+import weakref
 
 import hpilo
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
 
+from .breaker import STATE_CLOSED, STATE_OPEN, HpIloCircuitBreaker
+from .capabilities import HpIloCapabilities
+from .capture import CONF_CAPTURE, HpIloCapture, capture_directory
+from .commands import HpIloCommandQueue
+from .energy import HpIloEnergyMeter, index_power_readings
+from .events import EVENT_LOG_CALLS, HpIloEventLog
+from .fleet import CONF_PARSE_PROCESSES, HpIloFleet, async_get_fleet
+from .health import HpIloComponent, HpIloHealth, HpIloReading, reduce_health
+from .probe import async_probe
+from .redfish import HpIloRedfishTransport
+from .replay import HpIloReplayTransport
+from .ribcl import HpIloRibclTransport
+from .store import HpIloStore
+from .transport import (
+    CONF_TRANSPORT,
+    DEFAULT_TRANSPORT,
+    TRANSPORT_ASYNC,
+    TRANSPORT_REDFISH,
+    TRANSPORT_REPLAY,
+    HpIloExecutorTransport,
+    HpIloTransport,
+)
+
 _LOGGER = logging.getLogger(__name__)
 
-# Update interval - all entities will share this single refresh cycle
-UPDATE_INTERVAL = timedelta(seconds=60)
+# Update interval - the coordinator ticks at the fastest tier interval and
+# every tick fetches the tiers that are due in a single request
+UPDATE_INTERVAL = timedelta(seconds=30)
+# Seconds a refresh may start off the host's phase of the interval before
+# the interval is started on the phase again. DataUpdateCoordinator
+# schedules every refresh an interval after the end of the previous one,
+# in whole seconds, so slow refreshes drift.
+PHASE_TOLERANCE = 5
 
+CONF_HEALTH_INTERVAL = "health_interval"
+DEFAULT_HEALTH_INTERVAL = 60
 
-@dataclass
-class HpIloData:
-    """Class to hold all HP iLO data fetched in a single update cycle."""
-    
+TIER_STATIC = "static"
+TIER_HEALTH = "health"
+TIER_POWER = "power"
+TIER_EVENTS = "events"
+
+# Refresh interval of the tiers that don't depend on the config entry options
+STATIC_INTERVAL = timedelta(hours=1)
+POWER_INTERVAL = UPDATE_INTERVAL
+EVENTS_INTERVAL = timedelta(minutes=5)
+
+# Seconds between the power state polls following a power command, until
+# the server reached the state it was sent to. The regular refreshes of the
+# power tier take over after the last one.
+FOLLOW_UP_DELAYS = (2, 2, 3, 5, 8, 13, 13, 13)
+
+# Fetched field -> hpilo.Ilo method queried for it. The results are stored
+# in the HpIloData field of the same name, or reduced by SNAPSHOTS.
+FETCH_CALLS = {
     # Server health data (temperatures, fans, firmware info, etc.)
-    health: dict[str, Any] | None = None
+    "health": "get_embedded_health",
+    "power_status": "get_host_power_status",
+    "power_readings": "get_power_readings",
+    "power_on_time": "get_server_power_on_time",
+    "server_name": "get_server_name",
+    # Host data (SMBIOS entries for model, BIOS version, etc.)
+    "host_data": "get_host_data",
+    "fw_version": "get_fw_version",
+}
+
+# Refresh tier -> fields fetched when the tier is due
+TIERS = {
+    # Inventory that practically never changes
+    TIER_STATIC: ("server_name", "host_data", "fw_version"),
+    # The heaviest call, refreshed at a configurable interval
+    TIER_HEALTH: ("health", "power_on_time"),
+    # Cheap and user visible, refreshed on every tick
+    TIER_POWER: ("power_status", "power_readings"),
+    # The event logs (EVENT_LOG_CALLS), which aren't kept in the data
+    TIER_EVENTS: (),
+}
+
+# Raw results fetched again for diagnostics, the data only keeps the
+# values the entities read
+DIAGNOSTICS_CALLS = ("get_embedded_health", "get_host_data", "get_power_readings")
+
+# Listener context (or first item of a context tuple) -> field fetched for it
+SUBSCRIPTIONS = {
+    "temperatures": "health",
+    "fans": "health",
+    "subsystems": "health",
+    "power_supplies": "health",
+    "storage": "health",
+    "dimms": "health",
+    "memory_size": "health",
+    "power_status": "power_status",
+    "power_on_time": "power_on_time",
+    "power": "power_readings",
+    "energy": "power_readings",
+}
+
+# Fields fetched even without a subscribed entity: the device info and the
+# firmware the capabilities are remembered for
+ALWAYS_FETCHED = ("host_data", "fw_version")
+# Their calls are never skipped as unsupported either, or a transient error
+# of get_fw_version would keep the unsupported calls from being probed again
+ALWAYS_CALLS = frozenset(FETCH_CALLS[field_name] for field_name in ALWAYS_FETCHED)
+
+# Sections of the embedded health data read by the entities
+HEALTH_SECTIONS = (
+    "temperature",
+    "fans",
+    "firmware_information",
+    "health_at_a_glance",
+    "power_supplies",
+    "storage",
+    "memory",
+)
+
+# HpIloData fields holding label-keyed readings or components. Entities
+# listen for changes with a (field, label) context for these and the field
+# name for the others.
+READING_FIELDS = (
+    "temperatures",
+    "fans",
+    "subsystems",
+    "power_supplies",
+    "storage",
+    "dimms",
+    "power",
+)
+
+
+@dataclass(slots=True)
+class HpIloData:
+    """Compact snapshot of the HP iLO data the entities read.
+
+    The raw results are reduced to these values as they come in and then
+    dropped, diagnostics fetch them again when requested.
+    """
+
+    # Whether the health data was available, the readings below come from it
+    health_available: bool = False
+
+    # Temperature and fan readings from the health data, keyed by label
+    temperatures: dict[str, HpIloReading] = field(default_factory=dict)
+    fans: dict[str, HpIloReading] = field(default_factory=dict)
+
+    # Health at a glance, power supplies, storage controllers and drives and
+    # installed memory modules from the health data, keyed by label
+    subsystems: dict[str, HpIloComponent] = field(default_factory=dict)
+    power_supplies: dict[str, HpIloComponent] = field(default_factory=dict)
+    storage: dict[str, HpIloComponent] = field(default_factory=dict)
+    dimms: dict[str, HpIloComponent] = field(default_factory=dict)
+
+    # Installed memory in GB
+    memory_size: float | None = None
+
+    # Firmware versions from the health data, keyed by name ("iLO", ...)
+    firmware: dict[str, str] = field(default_factory=dict)
     
     # Power status ("ON" or "OFF")
     power_status: str | None = None
     
     # Power on time in minutes
     power_on_time: int | None = None
+
+    # Power readings in W, keyed by "present", "average", ...
+    power: dict[str, float] = field(default_factory=dict)
+
+    # Energy consumed in kWh, integrated from the present power
+    energy: float | None = None
     
     # Server name
     server_name: str | None = None
     
-    # Host data (SMBIOS entries)
-    host_data: list[dict] | None = None
-    
-    # Raw iLO connection for commands (buttons, switch actions)
-    ilo: hpilo.Ilo | None = None
+    # Model and BIOS version from the SMBIOS records of the host data
+    model: str | None = None
+    bios: str | None = None
+
+    # iLO firmware version, date, license and management processor
+    fw_version: dict[str, Any] | None = None
+
+
+@dataclass
+class HpIloLayout:
+    """Entities and device info discovered from the data.
+
+    The layout is stored so that the entities can be created right away on
+    the next start, without waiting for the iLO.
+    """
+
+    # Labels of the installed temperature sensors and of the fans
+    temperatures: list[str] = field(default_factory=list)
+    fans: list[str] = field(default_factory=list)
+
+    # Labels of the subsystems, installed power supplies, storage
+    # components and memory modules, and whether the memory size is known
+    subsystems: list[str] = field(default_factory=list)
+    power_supplies: list[str] = field(default_factory=list)
+    storage: list[str] = field(default_factory=list)
+    dimms: list[str] = field(default_factory=list)
+    memory_size: bool = False
+
+    # Whether the iLO reports the power state, the power on time and the
+    # power readings
+    power_status: bool = False
+    power_on_time: bool = False
+    power_readings: bool = False
+
+    # Device info
+    model: str | None = None
+    sw_version: str | None = None
+    hw_version: str | None = None
+
+    @classmethod
+    def from_dict(cls, stored: dict[str, Any]) -> HpIloLayout:
+        """Create a layout from its stored form, ignoring unknown keys."""
+        names = {layout_field.name for layout_field in fields(cls)}
+        return cls(**{key: value for key, value in stored.items() if key in names})
+
+
+def discover_layout(data: HpIloData, previous: HpIloLayout | None) -> HpIloLayout:
+    """Return the layout of the data.
+
+    Parts that are missing from the data because their fetch failed are
+    carried over from the previous layout.
+    """
+    layout = replace(previous) if previous else HpIloLayout()
+    if data.health_available:
+        layout.temperatures = [
+            reading.label
+            for reading in data.temperatures.values()
+            if reading.status != "Not Installed"
+        ]
+        layout.fans = list(data.fans)
+        layout.subsystems = list(data.subsystems)
+        layout.power_supplies = [
+            label
+            for label, supply in data.power_supplies.items()
+            if supply.status != "Not Installed"
+            and dict(supply.attributes).get("present") != "No"
+        ]
+        layout.storage = list(data.storage)
+        layout.dimms = list(data.dimms)
+        layout.memory_size = data.memory_size is not None
+        layout.sw_version = data.firmware.get("iLO", layout.sw_version)
+    if data.power_status is not None:
+        layout.power_status = True
+    if data.power_on_time is not None:
+        layout.power_on_time = True
+    if data.power:
+        layout.power_readings = True
+    if data.bios is not None:
+        layout.hw_version = data.bios
+    if data.model is not None:
+        layout.model = data.model
+    return layout
+
+
+def changed_keys(old: HpIloData, new: HpIloData) -> set[Any]:
+    """Return the listener contexts whose data differs between two updates."""
+    changed: set[Any] = set()
+    for data_field in fields(HpIloData):
+        name = data_field.name
+        old_value, new_value = getattr(old, name), getattr(new, name)
+        if old_value is new_value:
+            continue
+        if name in READING_FIELDS:
+            for label in old_value.keys() | new_value.keys():
+                if old_value.get(label) != new_value.get(label):
+                    changed.add((name, label))
+        elif old_value != new_value:
+            changed.add(name)
+    return changed
+
+
+def _snapshot_health(
+    data: HpIloData, health: HpIloHealth | dict[str, Any] | None
+) -> None:
+    """Take the readings and components of the embedded health data.
+
+    Transports that keep the results reduce the health data themselves
+    (REDUCERS), the raw data of the others is reduced here.
+    """
+    data.health_available = health is not None
+    if not isinstance(health, HpIloHealth):
+        health = reduce_health(health)
+    data.temperatures = health.temperatures
+    data.fans = health.fans
+    data.subsystems = health.subsystems
+    data.power_supplies = health.power_supplies
+    data.storage = health.storage
+    data.dimms = health.dimms
+    data.memory_size = health.memory_size
+    data.firmware = health.firmware
+
+
+def _snapshot_host_data(
+    data: HpIloData, host_data: list[dict[str, Any]] | None
+) -> None:
+    """Take the model and BIOS version from the SMBIOS records."""
+    data.model = data.bios = None
+    for smbios_value in host_data or []:
+        if smbios_value.get("type") == 0:  # BIOS Information
+            data.bios = (
+                f"{smbios_value.get('Family', '')} {smbios_value.get('Date', '')}"
+            )
+        if smbios_value.get("type") == 1:  # System Information
+            data.model = smbios_value.get("Product Name")
+
+
+def _snapshot_power_readings(
+    data: HpIloData, readings: dict[str, Any] | None
+) -> None:
+    """Unwrap the power readings."""
+    data.power = index_power_readings(readings)
+
+
+# Fetched field -> function reducing its raw result to HpIloData fields,
+# the results of the other fields are stored as they are. The readings are
+# indexed once here instead of in every entity.
+SNAPSHOTS: dict[str, Callable[[HpIloData, Any], None]] = {
+    "health": _snapshot_health,
+    "host_data": _snapshot_host_data,
+    "power_readings": _snapshot_power_readings,
+}
+
+
+# hpilo.Ilo query -> function reducing its result to what the snapshot
+# takes from it, for the transports that cache or pickle the results
+REDUCERS: dict[str, Callable[[Any], Any]] = {
+    "get_embedded_health": reduce_health,
+}
+
+
+def create_transport(
+    hass: HomeAssistant, entry: ConfigEntry, fleet: HpIloFleet
+) -> HpIloTransport:
+    """Create the transport selected in the config entry options."""
+    args = (
+        entry.data["host"],
+        int(entry.data["port"]),
+        entry.data["username"],
+        entry.data["password"],
+    )
+    transport = entry.options.get(CONF_TRANSPORT, DEFAULT_TRANSPORT)
+    if transport == TRANSPORT_ASYNC:
+        return HpIloRibclTransport(hass, *args)
+    if transport == TRANSPORT_REDFISH:
+        return HpIloRedfishTransport(hass, *args)
+    if transport == TRANSPORT_REPLAY:
+        return HpIloReplayTransport(
+            hass, capture_directory(hass, entry.data["host"]), *args
+        )
+    return HpIloExecutorTransport(fleet, entry.entry_id, *args)
 
 
 class HpIloDataUpdateCoordinator(DataUpdateCoordinator[HpIloData]):
@@ -60,77 +392,403 @@ class HpIloDataUpdateCoordinator(DataUpdateCoordinator[HpIloData]):
         self.port = int(entry.data["port"])
         self.username = entry.data["username"]
         self.password = entry.data["password"]
+
+        self.tier_intervals = {
+            TIER_STATIC: STATIC_INTERVAL,
+            TIER_HEALTH: timedelta(
+                seconds=entry.options.get(
+                    CONF_HEALTH_INTERVAL, DEFAULT_HEALTH_INTERVAL
+                )
+            ),
+            TIER_POWER: POWER_INTERVAL,
+            TIER_EVENTS: EVENTS_INTERVAL,
+        }
+        # Monotonic time at which each tier is due next, all due right away
+        self._tier_due = dict.fromkeys(TIERS, 0.0)
+
+        # Blocking I/O runs on the fleet's worker pool, and the refreshes of
+        # all hosts are spread over the update interval
+        self.fleet = async_get_fleet(hass)
+        self._phase = (
+            self.fleet.async_register(entry.entry_id)
+            * UPDATE_INTERVAL.total_seconds()
+        )
+        # Cancels the call starting the update interval on this host's phase
+        self._unsub_phase: CALLBACK_TYPE | None = None
+        self.transport = create_transport(hass, entry, self.fleet)
+        self.transport.health_sections = HEALTH_SECTIONS
+        self.transport.reducers = REDUCERS
+        if entry.options.get(CONF_CAPTURE):
+            self.transport.capture = HpIloCapture(
+                hass, capture_directory(hass, self.host)
+            )
+        if entry.options.get(CONF_PARSE_PROCESSES):
+            self.transport.parse_pool = self.fleet
+        # Refreshes and commands are sent one at a time
+        self.queue = HpIloCommandQueue(hass, self.transport)
+        self.breaker = HpIloCircuitBreaker()
+
+        # Layout the entities are created from, loaded from the store and
+        # updated with every refresh
+        self.store = HpIloStore(hass, entry.entry_id)
+        self.layout: HpIloLayout | None = None
+        self.capabilities = HpIloCapabilities(
+            self.store, entry.options.get(CONF_TRANSPORT, DEFAULT_TRANSPORT)
+        )
+        self.event_log = HpIloEventLog(hass, entry, self.store)
+        self.energy_meter = HpIloEnergyMeter(self.store)
+
+        # Task polling the power state after a power command
+        self._follow_up: asyncio.Task[None] | None = None
+
+        # Fetched field -> weak reference to the result the data was last
+        # reduced from
+        self._merged: dict[str, weakref.ref[Any]] = {}
+
+        # Data and availability the listeners were last notified about
+        self._notified_data: HpIloData | None = None
+        self._notified_success: bool | None = None
         
         super().__init__(
             hass,
             _LOGGER,
+            config_entry=entry,
             name=f"HP iLO ({self.host})",
-            update_interval=UPDATE_INTERVAL,
+            # Set on this host's phase of the interval
+            update_interval=None,
         )
+        self._async_align_to_phase()
+        # The config entries aren't unloaded when Home Assistant stops
+        entry.async_on_unload(
+            hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_STOP, self._async_handle_stop
+            )
+        )
+
+    async def async_load_layout(self) -> None:
+        """Load the layout and capabilities stored by a previous run, if any."""
+        await self.store.async_load()
+        self.capabilities.async_load()
+        self.event_log.async_load()
+        self.energy_meter.async_load()
+        if stored := self.store.async_get("layout"):
+            self.layout = HpIloLayout.from_dict(stored)
+
+    async def async_shutdown(self) -> None:
+        """Cancel any scheduled refresh, close the transport and leave the fleet."""
+        await super().async_shutdown()
+        if self._unsub_phase is not None:
+            self._unsub_phase()
+            self._unsub_phase = None
+        self.energy_meter.async_persist()
+        await self.store.async_save()
+        await self.transport.async_close()
+        await self.fleet.async_unregister(self.config_entry.entry_id)
+
+    @callback
+    def _async_handle_stop(self, _event: Event) -> None:
+        """Store the energy when Home Assistant stops.
+
+        async_shutdown only runs when the entry is unloaded, the store's
+        pending changes are written with Home Assistant's final write.
+        """
+        self.energy_meter.async_persist()
+
+    @callback
+    def _async_align_to_phase(self) -> None:
+        """Stop the update interval and start it again on this host's phase.
+
+        The interval starts on the next point of the phase that leaves at
+        least half an interval to the last refresh.
+        """
+        self.update_interval = None
+        if self._unsub_phase is not None:
+            self._unsub_phase()
+        interval = UPDATE_INTERVAL.total_seconds()
+        now = self.hass.loop.time()
+        target = self._phase + interval * math.ceil(
+            (now + interval / 2 - self._phase) / interval
+        )
+        self._unsub_phase = async_call_later(
+            self.hass, target - now, self._async_start_interval
+        )
+
+    @callback
+    def _async_start_interval(self, _now: datetime) -> None:
+        """Refresh on this host's phase and every update interval from then."""
+        self._unsub_phase = None
+        self.update_interval = UPDATE_INTERVAL
+        if self.config_entry.pref_disable_polling:
+            return
+        self.config_entry.async_create_background_task(
+            self.hass,
+            self.async_refresh(),
+            f"{self.name} refresh",
+            eager_start=True,
+        )
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update the listeners whose data changed since the last update.
+
+        Listeners without a context, and all listeners when the
+        availability changed, are always updated.
+        """
+        previous, self._notified_data = self._notified_data, self.data
+        was_success, self._notified_success = (
+            self._notified_success,
+            self.last_update_success,
+        )
+        if (
+            previous is None
+            or self.data is None
+            or was_success != self.last_update_success
+        ):
+            super().async_update_listeners()
+            return
+
+        changed = changed_keys(previous, self.data)
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in changed:
+                update_callback()
+
+    @property
+    def subscribed_fields(self) -> set[str] | None:
+        """Return the fields the entities listen to, None for all fields.
+
+        Disabled entities don't listen, so their data isn't fetched. All
+        fields are fetched until the first refresh succeeded, which is when
+        the layout and with it the entities are discovered. Enabling an
+        entity reloads the config entry, which fetches everything again.
+        """
+        if self.data is None or self.layout is None:
+            return None
+        subscribed = set(ALWAYS_FETCHED)
+        for context in self.async_contexts():
+            key = context[0] if isinstance(context, tuple) else context
+            if (data_field := SUBSCRIPTIONS.get(key)) is not None:
+                subscribed.add(data_field)
+        return subscribed
+
+    @property
+    def due_tiers(self) -> list[str]:
+        """Return the refresh tiers that are due in this update cycle."""
+        # Allow a little slack so tiers with an interval that is a multiple
+        # of the tick aren't pushed back by a full tick because of jitter
+        now = monotonic() + 1
+        return [tier for tier, due in self._tier_due.items() if due <= now]
+
+    @callback
+    def async_mark_due(self, *tiers: str) -> None:
+        """Fetch the given tiers (all if none given) with the next refresh."""
+        for tier in tiers or TIERS:
+            self._tier_due[tier] = 0.0
+
+    async def async_refresh_tiers(self, *tiers: str) -> None:
+        """Refresh the given tiers (all if none given) as soon as possible."""
+        self.async_mark_due(*tiers)
+        await self.async_request_refresh()
 
     async def _async_update_data(self) -> HpIloData:
         """Fetch data from HP iLO.
         
         This is called by the coordinator at the configured interval.
-        All entities will receive the same data from this single fetch.
+        Only the tiers that are due are fetched, the other fields are
+        carried over from the previous update.
         """
+        if self.update_interval is not None:
+            interval = UPDATE_INTERVAL.total_seconds()
+            offset = (self.hass.loop.time() - self._phase) % interval
+            if PHASE_TOLERANCE < offset < interval - PHASE_TOLERANCE:
+                # Drifted off the phase (or requested), the next refresh is
+                # on the phase again
+                self._async_align_to_phase()
+        await self._async_check_breaker()
+
+        # Refreshes requested outside of the schedule (e.g. after a command)
+        # refresh at least the power state
+        tiers = self.due_tiers or [TIER_POWER]
+        # Calls the iLO doesn't support, and data no entity uses, are skipped
+        subscribed = self.subscribed_fields
+        fields = [
+            field_name
+            for tier in tiers
+            for field_name in TIERS[tier]
+            if field_name in ALWAYS_FETCHED
+            or (
+                FETCH_CALLS[field_name] not in self.capabilities.unsupported
+                and (subscribed is None or field_name in subscribed)
+            )
+        ]
+        logs = {
+            log: method
+            for log, method in EVENT_LOG_CALLS.items()
+            if TIER_EVENTS in tiers and method not in self.capabilities.unsupported
+        }
+        _LOGGER.debug(
+            "Fetching %s from HP iLO at %s:%s", ", ".join(tiers), self.host, self.port
+        )
+        unsupported: set[str] = set()
         try:
-            # Run the blocking iLO calls in the executor
-            return await self.hass.async_add_executor_job(self._fetch_data)
+            results = await self.queue.async_fetch(
+                [FETCH_CALLS[field_name] for field_name in fields]
+                + list(logs.values()),
+                unsupported,
+            )
         except hpilo.IloLoginFailed as err:
             raise UpdateFailed(f"Authentication failed: {err}") from err
         except hpilo.IloCommunicationError as err:
+            self.breaker.record_failure()
             raise UpdateFailed(f"Communication error: {err}") from err
         except hpilo.IloError as err:
             raise UpdateFailed(f"iLO error: {err}") from err
+        self.breaker.record_success()
 
-    def _fetch_data(self) -> HpIloData:
-        """Fetch all data from HP iLO (runs in executor thread)."""
-        _LOGGER.debug("Fetching data from HP iLO at %s:%s", self.host, self.port)
-        
-        # Create a new iLO connection
-        ilo = hpilo.Ilo(
-            hostname=self.host,
-            login=self.username,
-            password=self.password,
-            port=self.port,
-        )
-        
-        data = HpIloData(ilo=ilo)
-        
-        # Fetch all the data we need in one batch
-        # Each of these is a separate API call, but they all happen
-        # in this single update cycle and the results are cached
-        
-        # Get embedded health (temperatures, fans, firmware)
-        try:
-            data.health = ilo.get_embedded_health()
-        except (hpilo.IloError, hpilo.IloFeatureNotSupported) as err:
-            _LOGGER.debug("Could not get embedded health: %s", err)
-        
-        # Get power status
-        try:
-            data.power_status = ilo.get_host_power_status()
-        except (hpilo.IloError, hpilo.IloFeatureNotSupported) as err:
-            _LOGGER.debug("Could not get power status: %s", err)
-        
-        # Get power on time
-        try:
-            data.power_on_time = ilo.get_server_power_on_time()
-        except (hpilo.IloError, hpilo.IloFeatureNotSupported) as err:
-            _LOGGER.debug("Could not get power on time: %s", err)
-        
-        # Get server name
-        try:
-            data.server_name = ilo.get_server_name()
-        except (hpilo.IloError, hpilo.IloFeatureNotSupported) as err:
-            _LOGGER.debug("Could not get server name: %s", err)
-        
-        # Get host data (SMBIOS entries for model, BIOS version, etc.)
+        if "fw_version" in fields:
+            self.capabilities.async_set_firmware(results.get("get_fw_version"))
+        self.capabilities.async_add_unsupported(unsupported - ALWAYS_CALLS)
+
+        now = monotonic()
+        for tier in tiers:
+            self._tier_due[tier] = now + self.tier_intervals[tier].total_seconds()
+        # Only the new entries of the logs are processed, the logs are dropped
+        for log, method in logs.items():
+            self.event_log.async_process(log, results.pop(method, None))
+        data = self._merge_data(self.data, fields, results)
+        if "power_readings" in fields and "present" in data.power:
+            self.energy_meter.async_add(time(), data.power["present"])
+            data.energy = self.energy_meter.total
+        self._async_update_layout(data)
+        return data
+
+    @callback
+    def _async_update_layout(self, data: HpIloData) -> None:
+        """Store the layout of the data and reload when it changed.
+
+        The entities were created from the previous layout, a reload adds
+        and removes entities as needed.
+        """
+        previous = self.layout
+        self.layout = discover_layout(data, previous)
+        if self.layout == previous:
+            return
+        self.store.async_set("layout", asdict(self.layout))
+        if previous is not None:
+            _LOGGER.info("Layout of HP iLO at %s changed, reloading", self.host)
+            self.hass.config_entries.async_schedule_reload(
+                self.config_entry.entry_id
+            )
+
+    async def _async_check_breaker(self) -> None:
+        """Fail fast while backing off from an unreachable host.
+
+        After the backoff delay the unauthenticated xmldata endpoint is
+        probed before the host is polled again.
+        """
+        state = self.breaker.state
+        if state == STATE_CLOSED:
+            return
+        if state == STATE_OPEN:
+            raise UpdateFailed(
+                f"{self.host} is unreachable, retrying in "
+                f"{self.breaker.retry_in:.0f} seconds"
+            )
         try:
-            data.host_data = ilo.get_host_data()
-        except (hpilo.IloError, hpilo.IloFeatureNotSupported) as err:
-            _LOGGER.debug("Could not get host data: %s", err)
-        
-        _LOGGER.debug("Successfully fetched data from HP iLO")
+            await async_probe(self.hass, self.host, self.port)
+        except hpilo.IloCommunicationError as err:
+            self.breaker.record_failure()
+            raise UpdateFailed(f"{self.host} is still unreachable: {err}") from err
+
+    def _merge_data(
+        self, previous: HpIloData | None, fields: list[str], results: dict[str, Any]
+    ) -> HpIloData:
+        """Return the previous data updated with the fetched fields.
+
+        Fields that were not fetched are carried over from the previous data,
+        and so are the fields of results that are the very objects they were
+        reduced from last time (transports reuse unchanged results).
+        """
+        data = replace(previous) if previous else HpIloData()
+        for field_name in fields:
+            result = results.get(FETCH_CALLS[field_name])
+            if (snapshot := SNAPSHOTS.get(field_name)) is None:
+                setattr(data, field_name, result)
+                continue
+            if (
+                previous is not None
+                and (merged := self._merged.get(field_name)) is not None
+                and merged() is result
+            ):
+                continue
+            snapshot(data, result)
+            try:
+                self._merged[field_name] = weakref.ref(result)
+            except TypeError:
+                # Plain dicts and lists can't be referenced weakly, and
+                # keeping them would keep the raw data
+                self._merged.pop(field_name, None)
         return data
+
+    async def async_fetch_raw(self) -> dict[str, Any]:
+        """Fetch the raw results the data is reduced from, for diagnostics.
+
+        The queries are sent one by one, single calls aren't reduced.
+        """
+        return {
+            method: await self.queue.async_command(method)
+            for method in DIAGNOSTICS_CALLS
+            if method not in self.capabilities.unsupported
+        }
+
+    async def async_command(self, method: str, *args: Any) -> Any:
+        """Send a command (hpilo.Ilo method) to the iLO on a new connection.
+
+        The command waits for the refresh in flight, and duplicates of a
+        pending command are merged into it.
+        """
+        return await self.queue.async_command(method, *args)
+
+    @callback
+    def async_follow_power(self, target: str) -> None:
+        """Poll the power state until it is the target ("ON" or "OFF").
+
+        The server takes a few seconds to react to a power command, so
+        instead of a full refresh right after the command, only the power
+        state is polled on a decaying schedule. Tiers that are due are
+        fetched along.
+        """
+        if self._follow_up is not None:
+            self._follow_up.cancel()
+            self._follow_up = None
+        if (subscribed := self.subscribed_fields) is not None and (
+            "power_status" not in subscribed
+        ):
+            # No entity shows the power state
+            return
+        if self.data is not None and self.data.power_status == target:
+            # Nothing to wait for, e.g. turning on a server that is on
+            return
+        self._follow_up = self.config_entry.async_create_background_task(
+            self.hass,
+            self._async_follow_power(target),
+            f"{self.name} power follow-up",
+        )
+
+    async def _async_follow_power(self, target: str) -> None:
+        """Poll the power state until it is the target one."""
+        for delay in FOLLOW_UP_DELAYS:
+            await asyncio.sleep(delay)
+            self.async_mark_due(TIER_POWER)
+            await self.async_refresh()
+            if (
+                self.last_update_success
+                and self.data is not None
+                and self.data.power_status == target
+            ):
+                _LOGGER.debug("Power state of %s changed to %s", self.host, target)
+                return
+        _LOGGER.debug(
+            "Power state of %s not %s yet, leaving it to the regular refreshes",
+            self.host,
+            target,
+        )
@@ -0,0 +1,62 @@
+"""Diagnostics support for HP iLO."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+import hpilo
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_UNIQUE_ID, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .coordinator import HpIloDataUpdateCoordinator
+
+DOMAIN = "hp_ilo"
+
+# Serial numbers and UUIDs in the raw results
+TO_REDACT_RAW = {
+    "Serial Number",
+    "UUID",
+    "serial_number",
+    "cache_module_serial_num",
+}
+# The unique ID of the entry (also in its data) holds the serial number or,
+# from SSDP, the UUID, and so do the discovery keys
+TO_REDACT = {
+    CONF_PASSWORD,
+    CONF_USERNAME,
+    CONF_UNIQUE_ID,
+    "discovery_keys",
+    *TO_REDACT_RAW,
+}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: HpIloDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    diagnostics = {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "layout": asdict(coordinator.layout) if coordinator.layout else None,
+        "unsupported_calls": sorted(coordinator.capabilities.unsupported),
+        "event_log_cursors": coordinator.event_log.cursors,
+        "breaker": {
+            "state": coordinator.breaker.state,
+            "failures": coordinator.breaker.failures,
+        },
+        "last_update_success": coordinator.last_update_success,
+        "last_exception": repr(coordinator.last_exception),
+        "requests": coordinator.transport.stats.as_dict(),
+        "data": asdict(coordinator.data) if coordinator.data else None,
+    }
+    # The data only keeps what the entities read, fetch the rest
+    try:
+        diagnostics["raw"] = async_redact_data(
+            await coordinator.async_fetch_raw(), TO_REDACT_RAW
+        )
+    except hpilo.IloError as err:
+        diagnostics["raw"] = {"error": repr(err)}
+    return diagnostics
@@ -0,0 +1,118 @@
+"""Power readings and the energy consumption integrated from them."""
+from __future__ import annotations
+
+from collections import deque
+from itertools import pairwise
+import logging
+from typing import Any
+
+from homeassistant.core import callback
+
+from .health import unwrap
+from .store import HpIloStore
+
+_LOGGER = logging.getLogger(__name__)
+
+STORE_KEY = "energy"
+
+# Power readings key -> key of the get_power_readings() result
+POWER_READINGS = {
+    "present": "present_power_reading",
+    "average": "average_power_reading",
+    "minimum": "minimum_power_reading",
+    "maximum": "maximum_power_reading",
+}
+
+# Samples of the present power kept in the ring buffer
+SAMPLES = 16
+# Samples further apart than this many seconds (e.g. while the iLO was
+# unreachable or Home Assistant was stopped) aren't integrated
+MAX_GAP = 600
+# Seconds of samples between writes of the energy to the store. The samples
+# are only kept in memory, the energy is also stored when Home Assistant
+# stops. Less than MAX_GAP, so that after Home Assistant didn't stop cleanly
+# the stored sample still bridges a short restart.
+PERSIST_INTERVAL = 300
+
+# Watt seconds per kWh
+WATT_SECONDS_PER_KWH = 3_600_000
+
+
+def index_power_readings(readings: dict[str, Any] | None) -> dict[str, float]:
+    """Return the power readings of get_power_readings() in W, keyed by kind."""
+    if not isinstance(readings, dict):
+        return {}
+    power = {}
+    for key, reading_key in POWER_READINGS.items():
+        value, _ = unwrap(readings.get(reading_key))
+        if isinstance(value, (int, float)):
+            power[key] = value
+    return power
+
+
+def trapezoid(samples: list[tuple[float, float]]) -> float:
+    """Return the energy in kWh of (timestamp, W) samples, skipping gaps."""
+    return (
+        sum(
+            (end - start) * (start_power + end_power) / 2
+            for (start, start_power), (end, end_power) in pairwise(samples)
+            if 0 < end - start <= MAX_GAP
+        )
+        / WATT_SECONDS_PER_KWH
+    )
+
+
+class HpIloEnergyMeter:
+    """Integrate the present power of a server into its energy consumption.
+
+    The latest samples are kept in a ring buffer, the energy of the samples
+    that dropped out of it is settled. The total and the last sample are
+    stored every PERSIST_INTERVAL and when Home Assistant stops, not with
+    every sample, so the total keeps increasing across restarts, as the
+    Energy dashboard expects, without wearing out the disk.
+    """
+
+    def __init__(self, store: HpIloStore) -> None:
+        """Initialize the meter."""
+        self._store = store
+        self.samples: deque[tuple[float, float]] = deque(maxlen=SAMPLES)
+        # kWh up to the oldest sample in the buffer
+        self.settled = 0.0
+        # Timestamp of the last sample stored
+        self._persisted: float | None = None
+
+    @property
+    def total(self) -> float:
+        """Return the energy consumed in kWh."""
+        return self.settled + trapezoid(list(self.samples))
+
+    @callback
+    def async_load(self) -> None:
+        """Load the samples and settled energy from the (already loaded) store."""
+        if stored := self._store.async_get(STORE_KEY):
+            self.settled = stored["settled"]
+            self.samples.extend(tuple(sample) for sample in stored["samples"])
+            if self.samples:
+                self._persisted = self.samples[-1][0]
+
+    @callback
+    def async_add(self, timestamp: float, power: float) -> None:
+        """Add a sample of the present power in W taken at a Unix time."""
+        if self.samples and timestamp <= self.samples[-1][0]:
+            _LOGGER.debug("Ignoring power sample older than the last one")
+            return
+        if len(self.samples) == SAMPLES:
+            self.settled += trapezoid([self.samples[0], self.samples[1]])
+        self.samples.append((timestamp, power))
+        if self._persisted is None or timestamp - self._persisted >= PERSIST_INTERVAL:
+            self.async_persist()
+
+    @callback
+    def async_persist(self) -> None:
+        """Store the total and the last sample, the next one is integrated from."""
+        if not self.samples:
+            return
+        self._persisted = self.samples[-1][0]
+        self._store.async_set(
+            STORE_KEY, {"settled": self.total, "samples": [list(self.samples[-1])]}
+        )
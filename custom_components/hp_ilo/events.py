@@ -0,0 +1,114 @@
+"""Incremental ingestion of the IML and iLO event logs."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant, callback
+
+from .store import HpIloStore
+
+_LOGGER = logging.getLogger(__name__)
+
+EVENT_HP_ILO = "hp_ilo_event"
+
+STORE_KEY = "event_log"
+
+LOG_SERVER = "server"
+LOG_ILO = "ilo"
+
+# Log -> hpilo.Ilo method returning its entries, oldest first
+EVENT_LOG_CALLS = {
+    # Integrated Management Log of the server
+    LOG_SERVER: "get_server_event_log",
+    LOG_ILO: "get_ilo_event_log",
+}
+
+
+def fingerprint(entry: dict[str, Any]) -> list[str]:
+    """Return what identifies a log entry.
+
+    RIBCL log entries have no number. Repeats of an event update the count
+    and last update of its entry, the rest stays the same.
+    """
+    return [
+        str(entry.get("initial_update")),
+        str(entry.get("class")),
+        str(entry.get("description")),
+    ]
+
+
+def new_entries(
+    entries: list[dict[str, Any]], cursor: dict[str, Any]
+) -> list[dict[str, Any]]:
+    """Return the entries after the one the cursor points at."""
+    count, last = cursor["count"], cursor["last"]
+    if last is None:
+        return entries
+    # Usually the log only grew since the last poll
+    if 0 < count <= len(entries) and fingerprint(entries[count - 1]) == last:
+        return entries[count:]
+    # Old entries were dropped from a full log
+    for index in range(len(entries) - 1, -1, -1):
+        if fingerprint(entries[index]) == last:
+            return entries[index + 1 :]
+    # The log was cleared
+    return entries
+
+
+class HpIloEventLog:
+    """Fire an event for every new entry of the iLO's logs.
+
+    The position of the last entry seen in every log is stored, entries
+    that were already in the log when it was first read, or seen before a
+    restart, aren't fired (again). python-hpilo returns the whole log, so
+    only what follows the stored position is processed.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, entry: ConfigEntry, store: HpIloStore
+    ) -> None:
+        """Initialize the event log."""
+        self.hass = hass
+        self.entry = entry
+        self._store = store
+        # Log -> {"count": number of entries, "last": fingerprint of the last}
+        self.cursors: dict[str, dict[str, Any]] = {}
+
+    @callback
+    def async_load(self) -> None:
+        """Load the cursors from the (already loaded) store."""
+        self.cursors = dict(self._store.async_get(STORE_KEY) or {})
+
+    @callback
+    def async_process(self, log: str, entries: list[dict[str, Any]] | None) -> int:
+        """Fire the new entries of a log and return how many there were."""
+        if entries is None:
+            return 0
+        if (cursor := self.cursors.get(log)) is None:
+            _LOGGER.debug(
+                "Skipping the %d entries already in the %s log of %s",
+                len(entries),
+                log,
+                self.entry.data["host"],
+            )
+            new = []
+        else:
+            new = new_entries(entries, cursor)
+        for entry in new:
+            self.hass.bus.async_fire(
+                EVENT_HP_ILO,
+                {
+                    "config_entry_id": self.entry.entry_id,
+                    "host": self.entry.data["host"],
+                    "log": log,
+                    **entry,
+                },
+            )
+        self.cursors[log] = {
+            "count": len(entries),
+            "last": fingerprint(entries[-1]) if entries else None,
+        }
+        self._store.async_set(STORE_KEY, dict(self.cursors))
+        return len(new)
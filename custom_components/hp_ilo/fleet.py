@@ -0,0 +1,110 @@
+"""Shared scheduling of blocking iLO I/O and parsing across all configured hosts."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import logging
+import multiprocessing
+import os
+from typing import Any, TypeVar
+
+from homeassistant.core import HomeAssistant, callback
+
+_LOGGER = logging.getLogger(__name__)
+
+_T = TypeVar("_T")
+
+DATA_FLEET = "hp_ilo_fleet"
+
+# Number of iLO requests that may be in flight at the same time
+FLEET_WORKERS = 8
+
+CONF_PARSE_PROCESSES = "parse_processes"
+# Worker processes parsing responses when enabled, leaving a core to the
+# event loop
+PARSE_PROCESSES = max(1, min(4, (os.cpu_count() or 1) - 1))
+
+# Fractional part of the golden ratio, used to spread the phases of any
+# number of hosts evenly over the update interval
+_GOLDEN_RATIO = 0.6180339887498949
+
+
+class HpIloFleet:
+    """Run iLO I/O for all hosts on a dedicated, size-bounded worker pool.
+
+    Each host runs at most one job at a time and has to wait for its turn
+    before competing for a worker, so hosts are served round-robin and a
+    slow host can't take more than one worker.
+    """
+
+    def __init__(self, hass: HomeAssistant, max_workers: int = FLEET_WORKERS) -> None:
+        """Initialize the fleet."""
+        self.hass = hass
+        self.max_workers = max_workers
+        self._executor: ThreadPoolExecutor | None = None
+        self._parse_executor: ProcessPoolExecutor | None = None
+        self._workers = asyncio.Semaphore(max_workers)
+        self._host_locks: dict[str, asyncio.Lock] = {}
+        # entry_id -> slot, slots are reused so reloads keep their phase
+        self._slots: dict[str, int] = {}
+
+    @callback
+    def async_register(self, entry_id: str) -> float:
+        """Register a host and return its phase as a fraction of the interval."""
+        if entry_id not in self._slots:
+            used = set(self._slots.values())
+            self._slots[entry_id] = next(
+                slot for slot in range(len(used) + 1) if slot not in used
+            )
+        return (self._slots[entry_id] * _GOLDEN_RATIO) % 1
+
+    async def async_unregister(self, entry_id: str) -> None:
+        """Unregister a host and stop the worker pools after the last one."""
+        self._slots.pop(entry_id, None)
+        self._host_locks.pop(entry_id, None)
+        if self._slots:
+            return
+        for executor in (self._executor, self._parse_executor):
+            if executor is not None:
+                await self.hass.async_add_executor_job(executor.shutdown)
+        self._executor = self._parse_executor = None
+
+    async def async_run(
+        self, entry_id: str, target: Callable[..., _T], *args: Any
+    ) -> _T:
+        """Run blocking iLO I/O for a host on the worker pool."""
+        lock = self._host_locks.setdefault(entry_id, asyncio.Lock())
+        async with lock, self._workers:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="hp_ilo"
+                )
+            return await self.hass.loop.run_in_executor(
+                self._executor, target, *args
+            )
+
+    async def async_parse(self, target: Callable[..., _T], *args: Any) -> _T:
+        """Run CPU-bound parsing in a worker process.
+
+        The target and its arguments and result are pickled, so it has to
+        be a module level function working on plain data. Worker processes
+        are spawned, not forked from Home Assistant, and import the
+        integration on their first job.
+        """
+        if self._parse_executor is None:
+            self._parse_executor = ProcessPoolExecutor(
+                max_workers=PARSE_PROCESSES,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return await self.hass.loop.run_in_executor(
+            self._parse_executor, target, *args
+        )
+
+
+@callback
+def async_get_fleet(hass: HomeAssistant) -> HpIloFleet:
+    """Return the fleet shared by all config entries."""
+    if (fleet := hass.data.get(DATA_FLEET)) is None:
+        fleet = hass.data[DATA_FLEET] = HpIloFleet(hass)
+    return fleet
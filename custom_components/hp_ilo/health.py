@@ -0,0 +1,265 @@
+"""Helpers to normalize HP iLO embedded health data."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+# Values the iLO reports for readings and thresholds that are not available
+NOT_AVAILABLE = ("N/A", "", None)
+
+
+@dataclass(frozen=True, slots=True)
+class HpIloReading:
+    """A single sensor reading from the embedded health data."""
+
+    label: str
+    value: float | int | None
+    unit: str | None = None
+    status: str | None = None
+    location: str | None = None
+    caution: float | int | None = None
+    critical: float | int | None = None
+
+
+def unwrap(value: Any) -> tuple[Any, str | None]:
+    """Split a python-hpilo (value, unit) tuple and coerce the value."""
+    unit = None
+    if isinstance(value, (list, tuple)):
+        if len(value) > 1:
+            unit = value[1] if value[1] not in NOT_AVAILABLE else None
+        value = value[0] if value else None
+    if value in NOT_AVAILABLE:
+        return None, unit
+    if isinstance(value, str):
+        try:
+            value = float(value) if "." in value else int(value)
+        except ValueError:
+            pass
+    return value, unit
+
+
+def index_readings(
+    health: dict[str, Any] | None, section: str, reading_key: str
+) -> dict[str, HpIloReading]:
+    """Return the readings of a health section keyed by their label.
+
+    python-hpilo keys the sections by label already, but the label is
+    taken from the entry itself so this doesn't depend on that.
+    """
+    if not health or not isinstance(health.get(section), dict):
+        return {}
+
+    readings: dict[str, HpIloReading] = {}
+    for entry in health[section].values():
+        if not isinstance(entry, dict) or "label" not in entry:
+            continue
+        value, unit = unwrap(entry.get(reading_key))
+        readings[entry["label"]] = HpIloReading(
+            label=entry["label"],
+            value=value,
+            unit=unit,
+            status=entry.get("status"),
+            location=entry.get("location"),
+            caution=unwrap(entry.get("caution"))[0],
+            critical=unwrap(entry.get("critical"))[0],
+        )
+    return readings
+
+
+# Beginnings of the (lowercased) statuses of healthy, absent or unused
+# components, e.g. "OK", "Good, In Use", "Redundant", "Not Installed" and
+# "Link Down" of the network when ports aren't connected
+HEALTHY_STATUSES = (
+    "ok",
+    "good",
+    "redundant",
+    "not installed",
+    "not present",
+    "link down",
+)
+# Statuses that don't tell anything about the health
+UNKNOWN_STATUSES = ("unknown", "other", "n/a", "")
+
+
+@dataclass(frozen=True, slots=True)
+class HpIloComponent:
+    """A component or subsystem with a status from the embedded health data."""
+
+    label: str
+    status: str | None
+    # Other properties of the component, e.g. model, capacity or redundancy
+    attributes: tuple[tuple[str, Any], ...] = ()
+
+    @property
+    def problem(self) -> bool | None:
+        """Return whether the status reports a problem, None if unknown."""
+        if self.status is None:
+            return None
+        status = self.status.strip().lower()
+        if status in UNKNOWN_STATUSES:
+            return None
+        return not status.startswith(HEALTHY_STATUSES)
+
+
+def _component(label: str, entry: dict[str, Any]) -> HpIloComponent:
+    """Return a component from an entry of the health data."""
+    return HpIloComponent(
+        label=label,
+        status=entry.get("status"),
+        attributes=tuple(
+            (key, value)
+            for key, value in entry.items()
+            if key not in ("label", "status")
+            and not isinstance(value, (dict, list))
+            and value not in NOT_AVAILABLE
+        ),
+    )
+
+
+def _entries(section: Any) -> list[dict[str, Any]]:
+    """Return the entries of a section keyed by label, or of a list."""
+    if isinstance(section, dict):
+        section = list(section.values())
+    if not isinstance(section, list):
+        return []
+    return [entry for entry in section if isinstance(entry, dict)]
+
+
+def index_subsystems(health: dict[str, Any] | None) -> dict[str, HpIloComponent]:
+    """Return the subsystems of the health at a glance summary."""
+    if not health or not isinstance(health.get("health_at_a_glance"), dict):
+        return {}
+    return {
+        name: _component(name, entry)
+        for name, entry in health["health_at_a_glance"].items()
+        if isinstance(entry, dict)
+    }
+
+
+def index_power_supplies(
+    health: dict[str, Any] | None,
+) -> dict[str, HpIloComponent]:
+    """Return the power supplies keyed by their label."""
+    if not health:
+        return {}
+    return {
+        entry["label"]: _component(entry["label"], entry)
+        for entry in _entries(health.get("power_supplies"))
+        if "label" in entry
+    }
+
+
+def index_storage(health: dict[str, Any] | None) -> dict[str, HpIloComponent]:
+    """Return the storage controllers, logical and physical drives by label.
+
+    Logical drives are labelled with their controller and number, physical
+    drives with their location (port, box and bay), prefixed with the
+    controller if there is more than one with drives. The labels don't
+    depend on the order of the drives, so drives can be added, removed or
+    moved without renaming the others.
+    """
+    if not health:
+        return {}
+    controllers = [
+        controller
+        for controller in _entries(health.get("storage"))
+        if controller.get("label")
+    ]
+    qualify = (
+        sum(
+            any(
+                _entries(logical_drive.get("physical_drives"))
+                for logical_drive in _entries(controller.get("logical_drives"))
+            )
+            for controller in controllers
+        )
+        > 1
+    )
+    components: dict[str, HpIloComponent] = {}
+    for controller in controllers:
+        controller_label = controller["label"]
+        components[controller_label] = _component(controller_label, controller)
+        for logical_drive in _entries(controller.get("logical_drives")):
+            label = f"{controller_label} Logical Drive {logical_drive.get('label')}"
+            components[label] = _component(label, logical_drive)
+            for drive in _entries(logical_drive.get("physical_drives")):
+                if not (location := drive.get("label")):
+                    continue
+                label = f"{controller_label} {location}" if qualify else location
+                # A drive in several logical drives is the same drive
+                components.setdefault(label, _component(label, drive))
+    return components
+
+
+def index_dimms(health: dict[str, Any] | None) -> dict[str, HpIloComponent]:
+    """Return the installed memory modules, labelled "CPU 1 DIMM 1"."""
+    if not health or not isinstance(health.get("memory"), dict):
+        return {}
+    details = health["memory"].get("memory_details")
+    if not isinstance(details, dict):
+        return {}
+    dimms: dict[str, HpIloComponent] = {}
+    for cpu, sockets in details.items():
+        for dimm in _entries(sockets):
+            label = f"{cpu.replace('_', ' ')} DIMM {dimm.get('socket')}"
+            dimm = _component(label, dimm)
+            if dimm.status and dimm.status.lower() != "not present":
+                dimms[label] = dimm
+    return dimms
+
+
+def memory_size(health: dict[str, Any] | None) -> float | None:
+    """Return the installed memory in GB, from the memory summary."""
+    if not health or not isinstance(health.get("memory"), dict):
+        return None
+    summary = health["memory"].get("memory_details_summary")
+    if not isinstance(summary, dict):
+        return None
+    total = None
+    for cpu in summary.values():
+        if not isinstance(cpu, dict):
+            continue
+        # e.g. "32 GB"
+        size, _, unit = str(cpu.get("total_memory_size", "")).partition(" ")
+        try:
+            size_gb = float(size) * (1 / 1024 if unit.upper() == "MB" else 1)
+        except ValueError:
+            continue
+        total = (total or 0) + size_gb
+    return total
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
+class HpIloHealth:
+    """The parts of the embedded health data the entities read, indexed.
+
+    Can be referenced weakly, to tell a reused result without keeping it.
+    """
+
+    temperatures: dict[str, HpIloReading]
+    fans: dict[str, HpIloReading]
+    subsystems: dict[str, HpIloComponent]
+    power_supplies: dict[str, HpIloComponent]
+    storage: dict[str, HpIloComponent]
+    dimms: dict[str, HpIloComponent]
+    # Installed memory in GB
+    memory_size: float | None
+    # Firmware versions, keyed by name ("iLO", "System ROM", ...)
+    firmware: dict[str, str]
+
+
+def reduce_health(health: dict[str, Any] | None) -> HpIloHealth:
+    """Index the readings and components of get_embedded_health().
+
+    Runs in the parse worker processes too, the result is small to pickle.
+    """
+    return HpIloHealth(
+        temperatures=index_readings(health, "temperature", "currentreading"),
+        fans=index_readings(health, "fans", "speed"),
+        subsystems=index_subsystems(health),
+        power_supplies=index_power_supplies(health),
+        storage=index_storage(health),
+        dimms=index_dimms(health),
+        memory_size=memory_size(health),
+        firmware=dict((health or {}).get("firmware_information") or {}),
+    )
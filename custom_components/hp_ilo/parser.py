@@ -0,0 +1,79 @@
+"""Selective parsing of large RIBCL responses."""
+from __future__ import annotations
+
+from collections.abc import Collection
+from xml.etree import ElementTree
+
+# Size of the pieces a document is fed to the parser in
+CHUNK_SIZE = 16 * 1024
+
+
+class _SelectiveTreeBuilder:
+    """Tree builder that drops the sections of a container nobody needs.
+
+    Elements inside an unwanted section are never created, they are
+    skipped while the document is being read.
+    """
+
+    def __init__(self, container: str, keep: Collection[str]) -> None:
+        """Initialize the builder."""
+        self._builder = ElementTree.TreeBuilder()
+        self._container = container
+        self._keep = keep
+        self._path: list[str] = []
+        # Depth of the section being skipped, if any
+        self._skip_depth: int | None = None
+
+    def start(self, tag: str, attrib: dict[str, str]) -> None:
+        """Handle an opening tag."""
+        self._path.append(tag)
+        if (
+            self._skip_depth is None
+            and len(self._path) > 1
+            and self._path[-2] == self._container
+            and tag.lower() not in self._keep
+        ):
+            self._skip_depth = len(self._path)
+        if self._skip_depth is None:
+            self._builder.start(tag, attrib)
+
+    def end(self, tag: str) -> None:
+        """Handle a closing tag."""
+        if self._skip_depth is None:
+            self._builder.end(tag)
+        elif self._skip_depth == len(self._path):
+            self._skip_depth = None
+        self._path.pop()
+
+    def data(self, data: str) -> None:
+        """Handle text."""
+        if self._skip_depth is None:
+            self._builder.data(data)
+
+    def close(self) -> ElementTree.Element:
+        """Return the root of the pruned tree."""
+        return self._builder.close()
+
+
+def parse_selective(
+    document: str, container: str, keep: Collection[str]
+) -> ElementTree.Element:
+    """Parse a RIBCL document, keeping only some sections of a container.
+
+    The document is parsed incrementally and the children of `container`
+    whose lowercased tag is not in `keep` are thrown away as they are read.
+    Raises ElementTree.ParseError for malformed documents.
+    """
+    parser = ElementTree.XMLParser(target=_SelectiveTreeBuilder(container, keep))
+    for start in range(0, len(document), CHUNK_SIZE):
+        parser.feed(document[start : start + CHUNK_SIZE])
+    return parser.close()
+
+
+def response_status_ok(message: ElementTree.Element) -> bool:
+    """Return whether all RESPONSE elements of a RIBCL message report success."""
+    return all(
+        int(response.get("STATUS", "0"), 16) == 0
+        for response in message.iter("RESPONSE")
+    )
+
@@ -0,0 +1,85 @@
+"""Unauthenticated identity probe using the xmldata endpoint of an iLO."""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+import logging
+from xml.etree import ElementTree
+
+import aiohttp
+import hpilo
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+_LOGGER = logging.getLogger(__name__)
+
+# Served without a login by all iLO generations, unless disabled in the
+# iLO's access settings
+XMLDATA_PATH = "/xmldata?item=all"
+
+# Seconds to wait for the probe, it is a small static document
+PROBE_TIMEOUT = 5
+
+
+@dataclass(frozen=True)
+class HpIloIdentity:
+    """Identity of a server as reported by the xmldata endpoint."""
+
+    serial_number: str | None = None
+    product_name: str | None = None
+    uuid: str | None = None
+    # iLO generation (e.g. "Integrated Lights-Out 4 (iLO 4)") and firmware
+    management_processor: str | None = None
+    firmware_version: str | None = None
+
+
+def _text(root: ElementTree.Element, path: str) -> str | None:
+    """Return the stripped text of an element, None if missing or empty."""
+    element = root.find(path)
+    if element is None or element.text is None:
+        return None
+    return element.text.strip() or None
+
+
+def parse_xmldata(body: bytes) -> HpIloIdentity | None:
+    """Parse an xmldata document, None if it isn't one."""
+    try:
+        root = ElementTree.fromstring(body)
+    except ElementTree.ParseError:
+        return None
+    if root.tag != "RIMP":
+        return None
+    return HpIloIdentity(
+        serial_number=_text(root, "HSI/SBSN"),
+        product_name=_text(root, "HSI/SPN"),
+        uuid=_text(root, "HSI/UUID"),
+        management_processor=_text(root, "MP/PN"),
+        firmware_version=_text(root, "MP/FWRI"),
+    )
+
+
+async def async_probe(
+    hass: HomeAssistant, host: str, port: int, timeout: float = PROBE_TIMEOUT
+) -> HpIloIdentity | None:
+    """Check that the iLO answers and return its identity.
+
+    Returns None when the iLO answers but doesn't serve its identity, and
+    raises IloCommunicationError when it can't be reached.
+    """
+    session = async_get_clientsession(hass, verify_ssl=False)
+    url = f"https://{host}:{port}{XMLDATA_PATH}"
+    try:
+        async with asyncio.timeout(timeout):
+            async with session.get(url) as response:
+                if response.status != 200:
+                    _LOGGER.debug(
+                        "xmldata of %s not available (HTTP %s)", host, response.status
+                    )
+                    return None
+                body = await response.read()
+    except (aiohttp.ClientError, TimeoutError) as err:
+        raise hpilo.IloCommunicationError(
+            f"Communication with {host}:{port} failed: {err}"
+        ) from err
+    return parse_xmldata(body)
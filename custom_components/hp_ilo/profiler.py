@@ -0,0 +1,177 @@
+"""Profiling of a single refresh cycle on the running instance."""
+from __future__ import annotations
+
+import cProfile
+from datetime import datetime
+import logging
+import pstats
+from time import perf_counter
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import slugify
+
+if TYPE_CHECKING:
+    from .coordinator import HpIloDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_TOP = 20
+# Frames of the allocation tracebacks kept by tracemalloc
+TRACEMALLOC_FRAMES = 5
+
+# Category -> parts of the file or built-in names of the functions in it.
+# Time spent in a function itself (not its callees) counts for the first
+# match, state writes end up in homeassistant/core.py.
+CATEGORIES: dict[str, tuple[str, ...]] = {
+    "network": (
+        "aiohttp/",
+        "ssl.py",
+        "asyncio/selector_events.py",
+        "asyncio/sslproto.py",
+        "socket.py",
+        "http/client.py",
+        "<method 'recv",
+        "<method 'send",
+        "<method 'read' of '_ssl",
+        "<method 'write' of '_ssl",
+    ),
+    "parsing": (
+        "hpilo.py",
+        "xml/etree/",
+        "<method 'feed' of 'xml",
+        "hp_ilo/parser.py",
+        "hp_ilo/health.py",
+        "json/",
+        "orjson",
+    ),
+    "entities": (
+        "homeassistant/helpers/entity.py",
+        "homeassistant/helpers/update_coordinator.py",
+        "homeassistant/core.py",
+        "hp_ilo/sensor.py",
+        "hp_ilo/binary_sensor.py",
+        "hp_ilo/switch.py",
+    ),
+}
+CATEGORY_OTHER = "other"
+
+
+def _category(file_name: str, function: str) -> str:
+    """Return the category of a function."""
+    location = f"{file_name}{function}"
+    for category, parts in CATEGORIES.items():
+        if any(part in location for part in parts):
+            return category
+    return CATEGORY_OTHER
+
+
+def summarize_profile(stats: pstats.Stats, top: int) -> dict[str, Any]:
+    """Return the time per category and the top functions of a profile."""
+    categories = dict.fromkeys([*CATEGORIES, CATEGORY_OTHER], 0.0)
+    functions = []
+    # (file, line, function) -> (calls, primitive calls, own time,
+    # cumulative time, callers)
+    for (file_name, line, function), (
+        _,
+        calls,
+        own_time,
+        cumulative_time,
+        _,
+    ) in stats.stats.items():  # type: ignore[attr-defined]
+        categories[_category(file_name, function)] += own_time
+        functions.append(
+            {
+                "function": f"{file_name}:{line}({function})",
+                "calls": calls,
+                "own_time": round(own_time, 6),
+                "cumulative_time": round(cumulative_time, 6),
+            }
+        )
+    functions.sort(key=lambda function: function["own_time"], reverse=True)
+    return {
+        "categories": {
+            category: round(seconds, 6) for category, seconds in categories.items()
+        },
+        "top": functions[:top],
+    }
+
+
+def summarize_snapshot(
+    snapshot: tracemalloc.Snapshot, top: int
+) -> list[dict[str, Any]]:
+    """Return the lines allocating the most memory in a snapshot."""
+    snapshot = snapshot.filter_traces(
+        (
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        )
+    )
+    return [
+        {"line": str(stat.traceback[0]), "size": stat.size, "count": stat.count}
+        for stat in snapshot.statistics("lineno")[:top]
+    ]
+
+
+async def async_profile_refresh(
+    hass: HomeAssistant,
+    coordinator: HpIloDataUpdateCoordinator,
+    trace_memory: bool = False,
+    top: int = DEFAULT_TOP,
+) -> dict[str, Any]:
+    """Refresh all tiers of a coordinator under cProfile.
+
+    The statistics are saved to the config directory, for snakeviz or
+    pstats, and a summary is returned. Everything running in the event
+    loop during the refresh is profiled, including other integrations, but
+    not the executor's worker threads (the executor transport, and the
+    parsing of large responses by the async transport).
+    """
+    profiler = cProfile.Profile()
+    # Raises ValueError if another profiler is active, before tracemalloc is
+    # started
+    profiler.enable()
+    tracing = trace_memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    coordinator.async_mark_due()
+    start = perf_counter()
+    try:
+        await coordinator.async_refresh()
+    finally:
+        profiler.disable()
+        duration = perf_counter() - start
+        snapshot = tracemalloc.take_snapshot() if trace_memory else None
+        if tracing:
+            tracemalloc.stop()
+
+    path = hass.config.path(
+        f"hp_ilo_profile_{slugify(coordinator.host)}_"
+        f"{datetime.now():%Y%m%d_%H%M%S}.prof"
+    )
+    stats = await hass.async_add_executor_job(_dump, profiler, path)
+    summary: dict[str, Any] = {
+        "file": path,
+        "duration": round(duration, 6),
+        "success": coordinator.last_update_success,
+        **summarize_profile(stats, top),
+    }
+    if snapshot is not None:
+        summary["memory"] = await hass.async_add_executor_job(
+            summarize_snapshot, snapshot, top
+        )
+    _LOGGER.info(
+        "Profiled refresh of %s in %.3f s, saved to %s: %s",
+        coordinator.host,
+        duration,
+        path,
+        summary["categories"],
+    )
+    return summary
+
+
+def _dump(profiler: cProfile.Profile, path: str) -> pstats.Stats:
+    """Save the statistics of a profile and return them."""
+    profiler.dump_stats(path)
+    return pstats.Stats(profiler)
@@ -0,0 +1,342 @@
+"""Redfish transport for HP iLO 4 (firmware 2.30+) and newer."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Mapping
+from contextlib import AbstractAsyncContextManager
+from http import HTTPStatus
+import logging
+from time import monotonic
+from typing import Any
+
+import aiohttp
+import hpilo
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.json import json_loads
+
+from .stats import note
+from .transport import HpIloTransport, payload_digest
+
+_LOGGER = logging.getLogger(__name__)
+
+SESSIONS_PATH = "/redfish/v1/SessionService/Sessions/"
+SYSTEM_PATH = "/redfish/v1/Systems/1/"
+MANAGER_PATH = "/redfish/v1/Managers/1/"
+THERMAL_PATH = "/redfish/v1/Chassis/1/Thermal/"
+POWER_PATH = "/redfish/v1/Chassis/1/Power/"
+RESET_PATH = "/redfish/v1/Systems/1/Actions/ComputerSystem.Reset/"
+
+# hpilo.Ilo command -> Redfish ResetType
+RESET_TYPES: dict[str, Callable[..., str]] = {
+    "press_pwr_btn": lambda: "PushPowerButton",
+    "hold_pwr_btn": lambda: "ForceOff",
+    "reset_server": lambda: "ForceRestart",
+    "set_host_power": lambda host_power=True: (
+        "On" if host_power else "GracefulShutdown"
+    ),
+}
+
+
+def _status(resource: dict[str, Any]) -> str | None:
+    """Return the health of a resource in RIBCL's words."""
+    status = resource.get("Status") or {}
+    if status.get("State") == "Absent":
+        return "Not Installed"
+    return status.get("Health")
+
+
+def _map_host_power_status(system: dict[str, Any]) -> str | None:
+    """Map the system resource to get_host_power_status()."""
+    if (power_state := system.get("PowerState")) is None:
+        return None
+    return str(power_state).upper()
+
+
+def _map_server_name(system: dict[str, Any]) -> str | None:
+    """Map the system resource to get_server_name()."""
+    return system.get("HostName")
+
+
+def _map_host_data(system: dict[str, Any]) -> list[dict[str, Any]]:
+    """Map the system resource to the SMBIOS records of get_host_data()."""
+    return [
+        {"type": 0, "Family": system.get("BiosVersion", ""), "Date": ""},
+        {
+            "type": 1,
+            "Product Name": system.get("Model"),
+            "Serial Number": system.get("SerialNumber"),
+            "UUID": system.get("UUID"),
+        },
+    ]
+
+
+def _map_fw_version(manager: dict[str, Any]) -> dict[str, Any]:
+    """Map the manager resource to get_fw_version()."""
+    return {
+        "firmware_version": manager.get("FirmwareVersion"),
+        "firmware_date": "",
+        "management_processor": manager.get("Model"),
+    }
+
+
+def _map_embedded_health(
+    thermal: dict[str, Any], manager: dict[str, Any]
+) -> dict[str, Any]:
+    """Map the thermal and manager resources to get_embedded_health()."""
+    temperatures = {}
+    for sensor in thermal.get("Temperatures", []):
+        label = sensor.get("Name")
+        temperatures[label] = {
+            "label": label,
+            "location": sensor.get("PhysicalContext"),
+            "status": _status(sensor),
+            "currentreading": (sensor.get("ReadingCelsius"), "Celsius"),
+            "caution": (sensor.get("UpperThresholdNonCritical"), "Celsius"),
+            "critical": (sensor.get("UpperThresholdCritical"), "Celsius"),
+        }
+
+    fans = {}
+    for fan in thermal.get("Fans", []):
+        # iLO 4 uses FanName/CurrentReading, iLO 5 the standard properties
+        label = fan.get("Name") or fan.get("FanName")
+        reading = fan.get("Reading", fan.get("CurrentReading"))
+        unit = fan.get("ReadingUnits", fan.get("Units"))
+        fans[label] = {
+            "label": label,
+            "status": _status(fan),
+            "speed": (reading, "Percentage" if unit == "Percent" else unit),
+        }
+
+    return {
+        "temperature": temperatures,
+        "fans": fans,
+        "firmware_information": {"iLO": manager.get("FirmwareVersion")},
+    }
+
+
+def _map_power_readings(power: dict[str, Any]) -> dict[str, Any]:
+    """Map the power resource to get_power_readings()."""
+    control = (power.get("PowerControl") or [{}])[0]
+    metrics = control.get("PowerMetrics") or {}
+    return {
+        "present_power_reading": (control.get("PowerConsumedWatts"), "Watts"),
+        "average_power_reading": (metrics.get("AverageConsumedWatts"), "Watts"),
+        "minimum_power_reading": (metrics.get("MinConsumedWatts"), "Watts"),
+        "maximum_power_reading": (metrics.get("MaxConsumedWatts"), "Watts"),
+    }
+
+
+# hpilo.Ilo query -> (resources it needs, mapper taking those resources)
+QUERIES: dict[str, tuple[tuple[str, ...], Callable[..., Any]]] = {
+    "get_host_power_status": ((SYSTEM_PATH,), _map_host_power_status),
+    "get_server_name": ((SYSTEM_PATH,), _map_server_name),
+    "get_host_data": ((SYSTEM_PATH,), _map_host_data),
+    "get_fw_version": ((MANAGER_PATH,), _map_fw_version),
+    "get_power_readings": ((POWER_PATH,), _map_power_readings),
+    "get_embedded_health": ((THERMAL_PATH, MANAGER_PATH), _map_embedded_health),
+}
+
+
+class HpIloRedfishTransport(HpIloTransport):
+    """Fetch iLO data from the Redfish API.
+
+    The responses are mapped onto the values python-hpilo returns for the
+    RIBCL queries, so the coordinator doesn't care where the data came
+    from. One authenticated session is reused, and resources are requested
+    with the ETag of the last response so unchanged ones come back as an
+    empty 304.
+    """
+
+    def __init__(self, hass: HomeAssistant, *args: Any) -> None:
+        """Initialize the transport."""
+        super().__init__(*args)
+        self._session = async_get_clientsession(hass, verify_ssl=False)
+        self._base_url = f"https://{self.host}:{self.port}"
+        self._token: str | None = None
+        self._session_url: str | None = None
+        self._login_lock = asyncio.Lock()
+        # path -> (ETag, body) of the last response. The bodies are kept to
+        # answer 304 responses and to map queries of which only some
+        # resources changed.
+        self._cache: dict[str, tuple[str, dict[str, Any]]] = {}
+        # path -> digest and parsed body of the last response to a GET
+        self._parsed: dict[str, tuple[bytes, dict[str, Any]]] = {}
+        # Query method -> resources and (reduced) result of its last mapping
+        self._mapped: dict[str, tuple[list[dict[str, Any]], Any]] = {}
+
+    async def _async_fetch_batched(self, methods: list[str]) -> list[Any]:
+        """Fetch the resources needed by the queries concurrently."""
+        unsupported = [method for method in methods if method not in QUERIES]
+        if unsupported:
+            raise hpilo.IloFeatureNotSupported(
+                f"Not available over Redfish: {', '.join(unsupported)}"
+            )
+        paths = list(
+            dict.fromkeys(path for method in methods for path in QUERIES[method][0])
+        )
+        bodies = dict(
+            zip(paths, await asyncio.gather(*map(self._async_get, paths)))
+        )
+        return [
+            self._map(method, [bodies[path] for path in QUERIES[method][0]])
+            for method in methods
+        ]
+
+    def _map(self, method: str, resources: list[dict[str, Any]]) -> Any:
+        """Map and reduce the resources of a query, reusing the result if they're the same.
+
+        Unchanged resources are the very objects of the last response (from
+        the ETag or payload digest), so the previous result is returned as
+        is and callers can tell by identity that nothing changed.
+        """
+        if (mapped := self._mapped.get(method)) and all(
+            resource is previous for resource, previous in zip(resources, mapped[0])
+        ):
+            return mapped[1]
+        result = QUERIES[method][1](*resources)
+        if (reducer := self.reducers.get(method)) is not None and result is not None:
+            result = reducer(result)
+        self._mapped[method] = (resources, result)
+        return result
+
+    async def _async_call(self, method: str, *args: Any) -> Any:
+        """Run a query or a power command."""
+        if method in RESET_TYPES:
+            await self._async_request(
+                "POST", RESET_PATH, json={"ResetType": RESET_TYPES[method](*args)}
+            )
+            return None
+        if method not in QUERIES:
+            raise hpilo.IloFeatureNotSupported(f"{method} not available over Redfish")
+        # Single calls aren't reduced
+        return QUERIES[method][1](
+            *[await self._async_get(path) for path in QUERIES[method][0]]
+        )
+
+    async def async_close(self) -> None:
+        """Log out of the Redfish session."""
+        if self._session_url is None:
+            return
+        try:
+            async with (
+                asyncio.timeout(self.timeout),
+                self._session.delete(
+                    self._session_url, headers={"X-Auth-Token": self._token}
+                ),
+            ):
+                pass
+        except (aiohttp.ClientError, TimeoutError) as err:
+            _LOGGER.debug("Could not log out of %s: %s", self.host, err)
+        self._token = self._session_url = None
+
+    async def _async_get(self, path: str) -> dict[str, Any]:
+        """Get a resource, from the cache if it didn't change."""
+        headers = {}
+        if cached := self._cache.get(path):
+            headers["If-None-Match"] = cached[0]
+        status, response_headers, body = await self._async_request(
+            "GET", path, headers=headers
+        )
+        if status == HTTPStatus.NOT_MODIFIED and cached:
+            return cached[1]
+        if etag := response_headers.get("ETag"):
+            self._cache[path] = (etag, body)
+        if self.capture is not None:
+            await self.capture.async_save_redfish(path, body)
+        return body
+
+    async def _async_request(
+        self,
+        method: str,
+        path: str,
+        headers: dict[str, str] | None = None,
+        json: dict[str, Any] | None = None,
+    ) -> tuple[int, Mapping[str, str], dict[str, Any]]:
+        """Send an authenticated request, logging in again if needed."""
+        for _ in range(2):
+            token = await self._async_login()
+            status, response_headers, body = await self._async_send(
+                self._session.request(
+                    method,
+                    f"{self._base_url}{path}",
+                    headers={**(headers or {}), "X-Auth-Token": token},
+                    json=json,
+                ),
+                path if method == "GET" else None,
+            )
+            if status != HTTPStatus.UNAUTHORIZED:
+                break
+            # The session expired or was logged out on the iLO
+            self._token = None
+            note(retries=1)
+        else:
+            raise hpilo.IloLoginFailed("Login failed.")
+
+        if status >= HTTPStatus.BAD_REQUEST:
+            raise hpilo.IloError(f"{method} {path} failed with HTTP status {status}")
+        return status, response_headers, body
+
+    async def _async_login(self) -> str:
+        """Return the token of the Redfish session, creating one if needed."""
+        async with self._login_lock:
+            if self._token is None:
+                status, headers, _ = await self._async_send(
+                    self._session.post(
+                        f"{self._base_url}{SESSIONS_PATH}",
+                        json={"UserName": self.username, "Password": self.password},
+                    )
+                )
+                if status in (HTTPStatus.UNAUTHORIZED, HTTPStatus.FORBIDDEN):
+                    raise hpilo.IloLoginFailed("Login failed.")
+                if status >= HTTPStatus.BAD_REQUEST or "X-Auth-Token" not in headers:
+                    raise hpilo.IloError(f"Redfish login failed with HTTP status {status}")
+                self._token = headers["X-Auth-Token"]
+                if (location := headers.get("Location")) and location.startswith("/"):
+                    location = f"{self._base_url}{location}"
+                self._session_url = location
+            return self._token
+
+    async def _async_send(
+        self,
+        request: AbstractAsyncContextManager[aiohttp.ClientResponse],
+        path: str | None = None,
+    ) -> tuple[int, Mapping[str, str], dict[str, Any]]:
+        """Send a request and return its status, headers and JSON body.
+
+        The body of a GET of a resource path is reused if it didn't change.
+        """
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with request as response:
+                    raw = b""
+                    # Error and 304 responses have no (useful) body
+                    if response.status < HTTPStatus.MULTIPLE_CHOICES:
+                        raw = await response.read()
+                    status, headers = response.status, response.headers.copy()
+        except (aiohttp.ClientError, TimeoutError) as err:
+            raise hpilo.IloCommunicationError(
+                f"Communication with {self.host}:{self.port} failed: {err}"
+            ) from err
+        try:
+            body = self._parse(raw, path) if raw else {}
+        except ValueError as err:
+            # The iLO answered, so this isn't counted as a connection failure
+            raise hpilo.IloError(
+                f"{self.host}:{self.port} returned invalid JSON: {err}"
+            ) from err
+        return status, headers, body
+
+    def _parse(self, raw: bytes, path: str | None) -> dict[str, Any]:
+        """Parse a JSON body, reusing the last one of the path if it's the same."""
+        digest = payload_digest(raw)
+        if path and (parsed := self._parsed.get(path)) and parsed[0] == digest:
+            note(bytes_received=len(raw))
+            return parsed[1]
+        start = monotonic()
+        body = json_loads(raw)
+        note(bytes_received=len(raw), parse_time=monotonic() - start)
+        if path:
+            self._parsed[path] = (digest, body)
+        return body
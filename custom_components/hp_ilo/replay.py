@@ -0,0 +1,181 @@
+"""Transports serving captured iLO responses back."""
+from __future__ import annotations
+
+import json
+import logging
+from pathlib import Path
+from time import monotonic
+from typing import Any
+
+import hpilo
+
+from homeassistant.core import HomeAssistant
+
+from .capture import REDFISH_DIR, RIBCL_DIR, redfish_file_name
+from .redfish import HpIloRedfishTransport
+from .ribcl import RibclRequest
+from .stats import note
+from .transport import HpIloTransport
+
+_LOGGER = logging.getLogger(__name__)
+
+# Captures leave out the answer to the login, which precedes the others
+LOGIN_DOCUMENT = b"""<?xml version="1.0"?>
+<RIBCL VERSION="2.23">
+<RESPONSE
+    STATUS="0x0000"
+    MESSAGE='No error'
+     />
+</RIBCL>
+"""
+
+# Answer to queries that weren't captured
+UNSUPPORTED_DOCUMENT = b"""<?xml version="1.0"?>
+<RIBCL VERSION="2.23">
+<RESPONSE
+    STATUS="0x003C"
+    MESSAGE='Not captured.'
+     />
+</RIBCL>
+"""
+
+
+class HpIloRibclReplayTransport(HpIloTransport):
+    """Answer queries from captured RIBCL documents.
+
+    The response is assembled from the captured documents and parsed like
+    a live one, so parser and refresh performance can be measured against
+    real machines without them. Commands are accepted and ignored, queries
+    that weren't captured are unsupported.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: Path, *args: Any) -> None:
+        """Initialize the transport."""
+        super().__init__(*args)
+        self.hass = hass
+        self.directory = directory / RIBCL_DIR
+        self._documents: dict[str, bytes] | None = None
+
+    async def _async_documents(self) -> dict[str, bytes]:
+        """Return the captured documents by method, loading them once."""
+        if self._documents is None:
+            self._documents = await self.hass.async_add_executor_job(self._load)
+        return self._documents
+
+    def _load(self) -> dict[str, bytes]:
+        """Read the captured documents."""
+        return {
+            path.stem: path.read_bytes() for path in self.directory.glob("*.xml")
+        }
+
+    async def _async_replay(self, methods: list[str]) -> list[Any]:
+        """Parse the captured response of the query methods."""
+        documents = await self._async_documents()
+        request = RibclRequest(self.username, self.password, self.health_sections)
+        for method in methods:
+            request.add(method)
+        body = LOGIN_DOCUMENT + b"".join(
+            documents.get(method, UNSUPPORTED_DOCUMENT) for method in methods
+        )
+        start = monotonic()
+        try:
+            return request.parse(body)
+        finally:
+            note(bytes_received=len(body), parse_time=monotonic() - start)
+
+    async def _async_fetch_batched(self, methods: list[str]) -> list[Any]:
+        """Answer the query methods from the captures."""
+        return await self._async_replay(methods)
+
+    async def _async_call(self, method: str, *args: Any) -> Any:
+        """Answer a query from the captures, ignore commands."""
+        if not method.startswith("get_"):
+            _LOGGER.info("Ignoring %s while replaying captures", method)
+            return None
+        results = await self._async_replay([method])
+        return results[0] if results else None
+
+
+class HpIloRedfishReplayTransport(HpIloRedfishTransport):
+    """Answer queries from captured Redfish resources."""
+
+    def __init__(self, hass: HomeAssistant, directory: Path, *args: Any) -> None:
+        """Initialize the transport."""
+        super().__init__(hass, *args)
+        self.hass = hass
+        self.directory = directory / REDFISH_DIR
+
+    async def _async_get(self, path: str) -> dict[str, Any]:
+        """Return a captured resource."""
+        file = self.directory / redfish_file_name(path)
+        try:
+            raw = await self.hass.async_add_executor_job(file.read_bytes)
+        except FileNotFoundError as err:
+            raise hpilo.IloFeatureNotSupported(f"{path} was not captured") from err
+        start = monotonic()
+        resource = json.loads(raw)
+        note(bytes_received=len(raw), parse_time=monotonic() - start)
+        return resource
+
+    async def _async_call(self, method: str, *args: Any) -> Any:
+        """Answer a query from the captures, ignore power commands."""
+        if not method.startswith("get_"):
+            _LOGGER.info("Ignoring %s while replaying captures", method)
+            return None
+        return await super()._async_call(method, *args)
+
+    async def async_close(self) -> None:
+        """Nothing to log out of."""
+
+
+def _replays_redfish(directory: Path) -> bool:
+    """Return whether only Redfish resources were captured in a directory."""
+    return not (directory / RIBCL_DIR).is_dir() and (directory / REDFISH_DIR).is_dir()
+
+
+class HpIloReplayTransport(HpIloTransport):
+    """Answer queries from the RIBCL or Redfish captures of a host.
+
+    Which of them were captured is looked up on the first call, in the
+    executor, and the calls are handed to the matching replay transport.
+    """
+
+    def __init__(self, hass: HomeAssistant, directory: Path, *args: Any) -> None:
+        """Initialize the transport."""
+        super().__init__(*args)
+        self.hass = hass
+        self.directory = directory
+        self._args = args
+        self._replay: HpIloTransport | None = None
+
+    async def _async_replay(self) -> HpIloTransport:
+        """Return the transport replaying the captures of the host."""
+        if self._replay is None:
+            if await self.hass.async_add_executor_job(
+                _replays_redfish, self.directory
+            ):
+                replay: HpIloTransport = HpIloRedfishReplayTransport(
+                    self.hass, self.directory, *self._args
+                )
+            else:
+                replay = HpIloRibclReplayTransport(
+                    self.hass, self.directory, *self._args
+                )
+            replay.health_sections = self.health_sections
+            self._replay = replay
+        return self._replay
+
+    async def _async_fetch_batched(self, methods: list[str]) -> list[Any]:
+        """Answer the query methods from the captures."""
+        replay = await self._async_replay()
+        return await replay._async_fetch_batched(methods)
+
+    async def _async_call(self, method: str, *args: Any) -> Any:
+        """Answer a query from the captures, ignore commands."""
+        replay = await self._async_replay()
+        return await replay._async_call(method, *args)
+
+    async def async_close(self) -> None:
+        """Close the replay transport, if any."""
+        if self._replay is not None:
+            await self._replay.async_close()
@@ -0,0 +1,308 @@
+"""Asyncio RIBCL-over-HTTPS transport for HP iLO 3 and newer."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Collection, Mapping
+import logging
+from time import monotonic
+from typing import Any
+from xml.etree import ElementTree
+
+import aiohttp
+import hpilo
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .parser import parse_selective, response_status_ok
+from .fleet import HpIloFleet
+from .stats import note
+from .transport import HpIloTransport, payload_digest
+
+_LOGGER = logging.getLogger(__name__)
+
+# Payload element of the get_embedded_health response
+HEALTH_TAG = "GET_EMBEDDED_HEALTH_DATA"
+# Responses of more bytes than this (e.g. the embedded health data) are
+# parsed in the executor, smaller ones in the event loop
+PARSE_IN_EXECUTOR_SIZE = 8192
+
+
+class RibclRequest:
+    """A RIBCL document with one or more commands and its response parser.
+
+    python-hpilo's delayed mode is used to build the document and to turn
+    the response into the same values its blocking client returns, only
+    the I/O is done here.
+    """
+
+    def __init__(
+        self,
+        username: str,
+        password: str,
+        health_sections: Collection[str] | None = None,
+    ) -> None:
+        """Initialize an empty request.
+
+        If health_sections is given, only those sections of the embedded
+        health data are parsed.
+        """
+        self._health_sections = health_sections
+        # hpilo.Ilo methods of the commands, in order
+        self.methods: list[str] = []
+        self._ilo = hpilo.Ilo(
+            "localhost",
+            login=username,
+            password=password,
+            protocol=hpilo.ILO_HTTP,
+            delayed=True,
+        )
+
+    def add(self, method: str, *args: Any) -> None:
+        """Add a call of an hpilo.Ilo method to the request."""
+        getattr(self._ilo, method)(*args)
+        self.methods.append(method)
+
+    def to_xml(self) -> bytes:
+        """Return the serialized request document."""
+        root, _ = self._ilo._elements
+        return (
+            self._ilo.XML_HEADER
+            + b"\r\n".join(ElementTree.tostringlist(root))
+            + b"\r\n"
+        )
+
+    def parse(
+        self,
+        body: bytes,
+        cache: dict[str, tuple[bytes, Any]] | None = None,
+        reducers: Mapping[str, Callable[[Any], Any]] | None = None,
+    ) -> list[Any]:
+        """Parse a response and return the results of the queries.
+
+        Results of methods with a reducer are reduced before they are
+        returned. With a cache (method -> digest of its document and reduced
+        result), a document of such a method identical to the previous one
+        isn't parsed, the previous result is returned instead. Callers must
+        not modify the results. Raises the matching hpilo.IloError when the
+        iLO reports an error.
+        """
+        data = body.decode("ascii", "iloxml_replace")
+        if not data.lstrip().startswith("<?xml"):
+            raise hpilo.IloError("Remote returned bogus data, maybe it's not an iLO")
+
+        # The response contains one XML document per command
+        results: list[Any] = []
+        for document in split_documents(data):
+            if len(results) >= len(self._ilo._processors):
+                break
+            method = self.methods[len(results)]
+            reducer = reducers.get(method) if reducers else None
+            # Only reduced results are cached, the raw results of the other
+            # queries (e.g. the event logs) aren't kept
+            cacheable = cache is not None and reducer is not None
+            if cacheable:
+                digest = payload_digest(document.encode("latin-1"))
+                if (cached := cache.get(method)) and cached[0] == digest:
+                    results.append(cached[1])
+                    continue
+            # The first document answers the login and has no payload
+            if (message := self._parse_document(document)) is None:
+                continue
+            processor = self._ilo._processors[len(results)]
+            result = processor[0](message, *processor[1:])
+            if reducer is not None and result is not None:
+                result = reducer(result)
+            results.append(result)
+            if cacheable:
+                cache[method] = (digest, result)
+        return results
+
+    def _parse_document(self, document: str) -> ElementTree.Element | None:
+        """Parse a response document, or return None if it has no payload."""
+        if self._health_sections is not None and HEALTH_TAG in document:
+            try:
+                message = parse_selective(
+                    document, HEALTH_TAG, self._health_sections
+                )
+            except ElementTree.ParseError:
+                # Let python-hpilo try to fix up the malformed XML
+                pass
+            else:
+                if (
+                    response_status_ok(message)
+                    and message.find(HEALTH_TAG) is not None
+                ):
+                    return message
+        # Errors are raised from here
+        return self._ilo._parse_message(document)
+
+
+def split_documents(data: str) -> list[str]:
+    """Split a RIBCL response into its XML documents."""
+    documents = []
+    start = data.find("<?xml")
+    while start != -1:
+        end = data.find("<?xml", start + 5)
+        documents.append(data[start:] if end == -1 else data[start:end])
+        start = end
+    return documents
+
+
+def has_payload(document: str) -> bool:
+    """Return whether a response document answers a command.
+
+    Like the parser, documents with nothing but a successful status (e.g.
+    the answer to the login) don't count, errors are the answer of their
+    command.
+    """
+    try:
+        message = ElementTree.fromstring(document.strip())
+    except ElementTree.ParseError:
+        # python-hpilo fixes up malformed payloads
+        return True
+    for child in message:
+        if child.tag == "RESPONSE":
+            if int(child.get("STATUS", "0"), 16) != 0:
+                return True
+        elif child.tag != "INFORM":
+            return True
+    return False
+
+
+def parse_in_process(
+    methods: list[str],
+    health_sections: Collection[str] | None,
+    reducers: Mapping[str, Callable[[Any], Any]],
+    body: bytes,
+    digests: dict[str, bytes],
+) -> tuple[list[Any], dict[str, bytes]]:
+    """Parse the response of queries in a worker process.
+
+    Returns the (reduced) results and the digests of the documents of the
+    reduced ones. The results of documents matching the given digests aren't
+    parsed, they are None and have to be taken from the caller's cache. Only the reduced
+    results are pickled back, so the reducers have to be module level
+    functions.
+    """
+    request = RibclRequest("", "", health_sections)
+    for method in methods:
+        request.add(method)
+    cache: dict[str, tuple[bytes, Any]] = {
+        method: (digest, None) for method, digest in digests.items()
+    }
+    results = request.parse(body, cache, reducers)
+    return results, {
+        method: cache[method][0]
+        for method in methods[: len(results)]
+        if method in cache
+    }
+
+
+class HpIloRibclTransport(HpIloTransport):
+    """Send RIBCL commands over HTTPS with aiohttp.
+
+    No thread is held while waiting for the iLO, and cancelling the
+    calling task (on unload or timeout) aborts the request. Requires an
+    iLO 3 or newer, iLO 2 doesn't accept RIBCL over HTTP.
+    """
+
+    def __init__(self, hass: HomeAssistant, *args: Any) -> None:
+        """Initialize the transport."""
+        super().__init__(*args)
+        self.hass = hass
+        self._session = async_get_clientsession(hass, verify_ssl=False)
+        self._url = f"https://{self.host}:{self.port}/ribcl"
+        # Query method with a reducer -> digest of its last response document
+        # and reduced result, for the health sections they were parsed with
+        self._parsed: dict[str, tuple[bytes, Any]] = {}
+        self._parsed_sections: Collection[str] | None = None
+
+    async def _async_fetch_batched(self, methods: list[str]) -> list[Any]:
+        """Call the query methods in one request and return their results."""
+        if self.health_sections != self._parsed_sections:
+            self._parsed.clear()
+            self._parsed_sections = self.health_sections
+        request = RibclRequest(self.username, self.password, self.health_sections)
+        for method in methods:
+            request.add(method)
+        if self.parse_pool is not None:
+            return await self._async_send_parse_in_process(request, self.parse_pool)
+        return await self._async_send(request, self._parsed, self.reducers)
+
+    async def _async_call(self, method: str, *args: Any) -> Any:
+        """Call a single hpilo.Ilo method."""
+        request = RibclRequest(self.username, self.password)
+        request.add(method, *args)
+        results = await self._async_send(request)
+        return results[0] if results else None
+
+    async def _async_send(
+        self,
+        request: RibclRequest,
+        cache: dict[str, tuple[bytes, Any]] | None = None,
+        reducers: Mapping[str, Callable[[Any], Any]] | None = None,
+    ) -> list[Any]:
+        """Send a request to the iLO and return the parsed results."""
+        body = await self._async_post(request)
+        start = monotonic()
+        try:
+            if len(body) > PARSE_IN_EXECUTOR_SIZE:
+                return await self.hass.async_add_executor_job(
+                    request.parse, body, cache, reducers
+                )
+            return request.parse(body, cache, reducers)
+        finally:
+            note(parse_time=monotonic() - start)
+
+    async def _async_send_parse_in_process(
+        self, request: RibclRequest, pool: HpIloFleet
+    ) -> list[Any]:
+        """Send a request to the iLO and parse the response in a worker process.
+
+        Only documents that changed are parsed there, the others are taken
+        from the cache here.
+        """
+        body = await self._async_post(request)
+        start = monotonic()
+        try:
+            results, digests = await pool.async_parse(
+                parse_in_process,
+                request.methods,
+                self.health_sections,
+                self.reducers,
+                body,
+                {method: cached[0] for method, cached in self._parsed.items()},
+            )
+        finally:
+            note(parse_time=monotonic() - start)
+        for index, (method, result) in enumerate(zip(request.methods, results)):
+            if (digest := digests.get(method)) is None:
+                continue
+            if (cached := self._parsed.get(method)) and cached[0] == digest:
+                results[index] = cached[1]
+            else:
+                self._parsed[method] = (digest, result)
+        return results
+
+    async def _async_post(self, request: RibclRequest) -> bytes:
+        """Send a request to the iLO and return the raw response."""
+        try:
+            async with asyncio.timeout(self.timeout):
+                async with self._session.post(
+                    self._url,
+                    data=request.to_xml(),
+                    headers={"Content-Type": "text/xml"},
+                ) as response:
+                    response.raise_for_status()
+                    body = await response.read()
+        except (aiohttp.ClientError, TimeoutError) as err:
+            raise hpilo.IloCommunicationError(
+                f"Communication with {self.host}:{self.port} failed: {err}"
+            ) from err
+
+        _LOGGER.debug("Received %d bytes from %s", len(body), self.host)
+        note(bytes_received=len(body))
+        if self.capture is not None:
+            await self.capture.async_save_ribcl(request.methods, body)
+        return body
@@ -31,6 +31,10 @@ from homeassistant.const import (
     CONF_USERNAME,
     CONF_VALUE_TEMPLATE,
     PERCENTAGE,
+    EntityCategory,
+    UnitOfEnergy,
+    UnitOfInformation,
+    UnitOfPower,
     UnitOfTemperature,
     UnitOfTime,
 )
@@ -42,6 +46,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 
 from .coordinator import HpIloDataUpdateCoordinator, HpIloData
+from .stats import OPERATION_FETCH
 
 DOMAIN = "hp_ilo"
 _LOGGER = logging.getLogger(__name__)
@@ -62,6 +67,30 @@ SENSOR_TYPES = {
     "network_settings": ["Network Settings", "get_network_settings"],
 }
 
+# Power readings sensors: key -> name
+POWER_SENSOR_TYPES = {
+    "present": "Power",
+    "average": "Power average",
+    "minimum": "Power minimum",
+    "maximum": "Power maximum",
+}
+
+# Request statistics sensors: key -> [name, metric, scale, device class, unit]
+STATS_SENSOR_TYPES = {
+    "request_time": [
+        "Request time", "duration", 1000,
+        SensorDeviceClass.DURATION, UnitOfTime.MILLISECONDS,
+    ],
+    "parse_time": [
+        "Parse time", "parse_time", 1000,
+        SensorDeviceClass.DURATION, UnitOfTime.MILLISECONDS,
+    ],
+    "response_size": [
+        "Response size", "bytes_received", 1,
+        SensorDeviceClass.DATA_SIZE, UnitOfInformation.BYTES,
+    ],
+}
+
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend(
     {
         vol.Required(CONF_HOST): cv.string,
@@ -117,60 +146,43 @@ async def async_setup_entry(
         identifiers=identifiers
     )
 
+    # Update device_info with firmware version and model
+    layout = coordinator.layout
+    if layout.sw_version:
+        device_info['sw_version'] = layout.sw_version
+    if layout.hw_version:
+        device_info['hw_version'] = layout.hw_version
+    if layout.model:
+        device_info['model'] = layout.model
+
     sensors: list[SensorEntity] = []
-    
-    # Get initial data from coordinator
-    data = coordinator.data
-    
-    # Process health data for temperature and fan sensors
-    if data.health:
-        health = data.health
-        
-        # Temperature sensors
-        if 'temperature' in health:
-            for temp_sensor in health['temperature'].values():
-                if temp_sensor.get('status') != 'Not Installed':
-                    label = temp_sensor['label']
-                    _LOGGER.info("Adding sensor for Temperature Sensor %s", label)
-                    sensors.append(
-                        HpIloTemperatureSensor(
-                            coordinator=coordinator,
-                            entry=entry,
-                            device_info=device_info,
-                            sensor_label=label,
-                        )
-                    )
-        
-        # Fan sensors
-        if 'fans' in health:
-            for fan_sensor in health['fans'].values():
-                label = fan_sensor['label']
-                _LOGGER.info("Adding sensor for Fan %s", label)
-                sensors.append(
-                    HpIloFanSensor(
-                        coordinator=coordinator,
-                        entry=entry,
-                        device_info=device_info,
-                        sensor_label=label,
-                    )
-                )
-        
-        # Update device_info with firmware version
-        if 'firmware_information' in health:
-            fw_info = health['firmware_information']
-            if 'iLO' in fw_info:
-                device_info['sw_version'] = fw_info['iLO']
-    
-    # Process host data for device info
-    if data.host_data:
-        for smbios_value in data.host_data:
-            if smbios_value.get('type') == 0:  # BIOS Information
-                device_info['hw_version'] = f"{smbios_value.get('Family', '')} {smbios_value.get('Date', '')}"
-            if smbios_value.get('type') == 1:  # System Information
-                device_info['model'] = smbios_value.get('Product Name')
-    
+
+    # Temperature sensors
+    for label in layout.temperatures:
+        _LOGGER.info("Adding sensor for Temperature Sensor %s", label)
+        sensors.append(
+            HpIloTemperatureSensor(
+                coordinator=coordinator,
+                entry=entry,
+                device_info=device_info,
+                sensor_label=label,
+            )
+        )
+
+    # Fan sensors
+    for label in layout.fans:
+        _LOGGER.info("Adding sensor for Fan %s", label)
+        sensors.append(
+            HpIloFanSensor(
+                coordinator=coordinator,
+                entry=entry,
+                device_info=device_info,
+                sensor_label=label,
+            )
+        )
+
     # Power on time sensor
-    if data.power_on_time is not None:
+    if layout.power_on_time:
         _LOGGER.info("Adding sensor for Server Power On time")
         sensors.append(
             HpIloPowerOnTimeSensor(
@@ -180,6 +192,48 @@ async def async_setup_entry(
             )
         )
 
+    # Power readings and the energy integrated from them
+    if layout.power_readings:
+        _LOGGER.info("Adding sensors for Power readings")
+        for kind in POWER_SENSOR_TYPES:
+            sensors.append(
+                HpIloPowerSensor(
+                    coordinator=coordinator,
+                    entry=entry,
+                    device_info=device_info,
+                    kind=kind,
+                )
+            )
+        sensors.append(
+            HpIloEnergySensor(
+                coordinator=coordinator,
+                entry=entry,
+                device_info=device_info,
+            )
+        )
+
+    # Installed memory sensor
+    if layout.memory_size:
+        _LOGGER.info("Adding sensor for Memory size")
+        sensors.append(
+            HpIloMemorySizeSensor(
+                coordinator=coordinator,
+                entry=entry,
+                device_info=device_info,
+            )
+        )
+
+    # Request statistics, disabled by default
+    for stat in STATS_SENSOR_TYPES:
+        sensors.append(
+            HpIloRequestStatsSensor(
+                coordinator=coordinator,
+                entry=entry,
+                device_info=device_info,
+                stat=stat,
+            )
+        )
+
     async_add_entities(sensors, False)
 
 
@@ -198,7 +252,7 @@ class HpIloTemperatureSensor(CoordinatorEntity[HpIloDataUpdateCoordinator], Sens
         sensor_label: str,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=("temperatures", sensor_label))
         self._sensor_label = sensor_label
         self._attr_device_info = device_info
         self._attr_name = sensor_label
@@ -207,20 +261,11 @@ class HpIloTemperatureSensor(CoordinatorEntity[HpIloDataUpdateCoordinator], Sens
     @property
     def native_value(self) -> float | None:
         """Return the current temperature."""
-        if not self.coordinator.data or not self.coordinator.data.health:
+        if not self.coordinator.data:
             return None
         
-        temps = self.coordinator.data.health.get('temperature', {})
-        # Find sensor by label (dict is keyed by index, not label)
-        for sensor_data in temps.values():
-            if sensor_data.get('label') == self._sensor_label:
-                if 'currentreading' in sensor_data:
-                    # currentreading is typically a tuple like (25, 'Celsius')
-                    reading = sensor_data['currentreading']
-                    if isinstance(reading, (list, tuple)) and len(reading) > 0:
-                        return reading[0]
-                    return reading
-        return None
+        reading = self.coordinator.data.temperatures.get(self._sensor_label)
+        return reading.value if reading else None
 
 
 class HpIloFanSensor(CoordinatorEntity[HpIloDataUpdateCoordinator], SensorEntity):
@@ -238,7 +283,7 @@ class HpIloFanSensor(CoordinatorEntity[HpIloDataUpdateCoordinator], SensorEntity
         sensor_label: str,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context=("fans", sensor_label))
         self._sensor_label = sensor_label
         self._attr_device_info = device_info
         self._attr_name = sensor_label
@@ -247,20 +292,11 @@ class HpIloFanSensor(CoordinatorEntity[HpIloDataUpdateCoordinator], SensorEntity
     @property
     def native_value(self) -> int | None:
         """Return the current fan speed percentage."""
-        if not self.coordinator.data or not self.coordinator.data.health:
+        if not self.coordinator.data:
             return None
         
-        fans = self.coordinator.data.health.get('fans', {})
-        # Find sensor by label (dict is keyed by index, not label)
-        for sensor_data in fans.values():
-            if sensor_data.get('label') == self._sensor_label:
-                if 'speed' in sensor_data:
-                    # speed is typically a tuple like (28, 'Percentage')
-                    speed = sensor_data['speed']
-                    if isinstance(speed, (list, tuple)) and len(speed) > 0:
-                        return speed[0]
-                    return speed
-        return None
+        reading = self.coordinator.data.fans.get(self._sensor_label)
+        return reading.value if reading else None
 
 
 class HpIloPowerOnTimeSensor(CoordinatorEntity[HpIloDataUpdateCoordinator], SensorEntity):
@@ -277,7 +313,7 @@ class HpIloPowerOnTimeSensor(CoordinatorEntity[HpIloDataUpdateCoordinator], Sens
         device_info: DeviceInfo,
     ) -> None:
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context="power_on_time")
         self._attr_device_info = device_info
         self._attr_name = "Server Power On time"
         self._attr_unique_id = f"{entry.data['unique_id']}_Server Power On time"
@@ -288,3 +324,150 @@ class HpIloPowerOnTimeSensor(CoordinatorEntity[HpIloDataUpdateCoordinator], Sens
         if not self.coordinator.data:
             return None
         return self.coordinator.data.power_on_time
+
+
+class HpIloPowerSensor(CoordinatorEntity[HpIloDataUpdateCoordinator], SensorEntity):
+    """Representation of an HP iLO power reading."""
+
+    _attr_device_class = SensorDeviceClass.POWER
+    _attr_native_unit_of_measurement = UnitOfPower.WATT
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: HpIloDataUpdateCoordinator,
+        entry: ConfigEntry,
+        device_info: DeviceInfo,
+        kind: str,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, context=("power", kind))
+        self._kind = kind
+        self._attr_device_info = device_info
+        self._attr_name = POWER_SENSOR_TYPES[kind]
+        self._attr_unique_id = f"{entry.data['unique_id']}_power_{kind}"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the power in W."""
+        if not self.coordinator.data:
+            return None
+        return self.coordinator.data.power.get(self._kind)
+
+
+class HpIloEnergySensor(CoordinatorEntity[HpIloDataUpdateCoordinator], SensorEntity):
+    """Representation of the energy consumed by an HP iLO server.
+
+    The coordinator integrates the present power of every refresh, so no
+    integration helper (and its extra state writes) is needed for the
+    Energy dashboard.
+    """
+
+    _attr_device_class = SensorDeviceClass.ENERGY
+    _attr_native_unit_of_measurement = UnitOfEnergy.KILO_WATT_HOUR
+    _attr_state_class = SensorStateClass.TOTAL_INCREASING
+    _attr_suggested_display_precision = 3
+
+    def __init__(
+        self,
+        coordinator: HpIloDataUpdateCoordinator,
+        entry: ConfigEntry,
+        device_info: DeviceInfo,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, context="energy")
+        self._attr_device_info = device_info
+        self._attr_name = "Energy"
+        self._attr_unique_id = f"{entry.data['unique_id']}_energy"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the energy consumed in kWh."""
+        if not self.coordinator.data:
+            return None
+        return self.coordinator.data.energy
+
+
+class HpIloMemorySizeSensor(CoordinatorEntity[HpIloDataUpdateCoordinator], SensorEntity):
+    """Representation of the installed memory of an HP iLO server."""
+
+    _attr_device_class = SensorDeviceClass.DATA_SIZE
+    _attr_native_unit_of_measurement = UnitOfInformation.GIGABYTES
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+
+    def __init__(
+        self,
+        coordinator: HpIloDataUpdateCoordinator,
+        entry: ConfigEntry,
+        device_info: DeviceInfo,
+    ) -> None:
+        """Initialize the sensor."""
+        super().__init__(coordinator, context="memory_size")
+        self._attr_device_info = device_info
+        self._attr_name = "Memory size"
+        self._attr_unique_id = f"{entry.data['unique_id']}_memory_size"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the installed memory in GB."""
+        if not self.coordinator.data:
+            return None
+        return self.coordinator.data.memory_size
+
+
+class HpIloRequestStatsSensor(CoordinatorEntity[HpIloDataUpdateCoordinator], SensorEntity):
+    """Representation of the request statistics of an HP iLO.
+
+    The state is the 95th percentile over the last refreshes, the median,
+    maximum, retries and errors are attributes.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    _attr_state_class = SensorStateClass.MEASUREMENT
+
+    def __init__(
+        self,
+        coordinator: HpIloDataUpdateCoordinator,
+        entry: ConfigEntry,
+        device_info: DeviceInfo,
+        stat: str,
+    ) -> None:
+        """Initialize the sensor."""
+        # No context: the statistics change with every refresh
+        super().__init__(coordinator)
+        name, self._metric, self._scale, device_class, unit = STATS_SENSOR_TYPES[stat]
+        self._attr_device_info = device_info
+        self._attr_name = name
+        self._attr_device_class = device_class
+        self._attr_native_unit_of_measurement = unit
+        self._attr_unique_id = f"{entry.data['unique_id']}_{stat}"
+
+    @property
+    def available(self) -> bool:
+        """Return True, the statistics are most interesting when requests fail."""
+        return True
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the 95th percentile."""
+        if not (summary := self.coordinator.transport.stats.summary(OPERATION_FETCH)):
+            return None
+        if not (distribution := summary[self._metric]):
+            return None
+        return round(distribution["p95"] * self._scale, 1)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the median, maximum, number of requests, retries and errors."""
+        if not (summary := self.coordinator.transport.stats.summary(OPERATION_FETCH)):
+            return None
+        attributes: dict[str, Any] = {
+            "requests": summary["count"],
+            "retries": summary["retries"],
+            "errors": summary["errors"],
+        }
+        if distribution := summary[self._metric]:
+            attributes["median"] = round(distribution["p50"] * self._scale, 1)
+            attributes["max"] = round(distribution["max"] * self._scale, 1)
+        return attributes
@@ -0,0 +1,67 @@
+"""Services of the HP iLO integration."""
+from __future__ import annotations
+
+import voluptuous as vol
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+)
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .profiler import DEFAULT_TOP, async_profile_refresh
+
+DOMAIN = "hp_ilo"
+
+SERVICE_PROFILE_REFRESH = "profile_refresh"
+
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_TRACE_MEMORY = "trace_memory"
+ATTR_TOP = "top"
+
+PROFILE_REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_TRACE_MEMORY, default=False): cv.boolean,
+        vol.Optional(ATTR_TOP, default=DEFAULT_TOP): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=200)
+        ),
+    }
+)
+
+
+async def _async_profile_refresh(call: ServiceCall) -> ServiceResponse:
+    """Profile a refresh of the chosen iLO."""
+    hass = call.hass
+    entry = hass.config_entries.async_get_entry(call.data[ATTR_CONFIG_ENTRY_ID])
+    if entry is None or entry.domain != DOMAIN:
+        raise ServiceValidationError(
+            f"{call.data[ATTR_CONFIG_ENTRY_ID]} is not an HP iLO config entry"
+        )
+    if entry.state is not ConfigEntryState.LOADED:
+        raise ServiceValidationError(f"{entry.title} is not loaded")
+    try:
+        return await async_profile_refresh(
+            hass,
+            hass.data[DOMAIN][entry.entry_id],
+            call.data[ATTR_TRACE_MEMORY],
+            call.data[ATTR_TOP],
+        )
+    except ValueError as err:
+        # Only one profiler can be active at a time
+        raise HomeAssistantError(f"Could not start the profiler: {err}") from err
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of the integration."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        _async_profile_refresh,
+        schema=PROFILE_REFRESH_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
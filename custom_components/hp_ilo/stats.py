@@ -0,0 +1,114 @@
+"""Rolling metrics of the requests sent to an iLO."""
+from __future__ import annotations
+
+from collections import Counter, deque
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+import math
+from time import monotonic
+from typing import Any
+
+# Number of calls per operation the statistics are computed over
+HISTORY = 100
+
+# Operation name of the batched fetch of a refresh, single calls are
+# recorded under their hpilo.Ilo method name
+OPERATION_FETCH = "fetch"
+
+
+@dataclass
+class HpIloCallMetrics:
+    """Metrics of a single call (one or more requests) to an iLO."""
+
+    operation: str
+    # Wall time in seconds, including retries
+    duration: float = 0.0
+    # Size of the response bodies, None if the transport can't tell
+    bytes_received: int | None = None
+    # Time spent parsing the responses in seconds, None if unknown
+    parse_time: float | None = None
+    retries: int = 0
+    # Class name of the error the call failed with
+    error: str | None = None
+
+
+# Metrics of the call in progress in the current task
+_CURRENT_CALL: ContextVar[HpIloCallMetrics | None] = ContextVar(
+    "hp_ilo_current_call", default=None
+)
+
+
+def note(
+    bytes_received: int = 0, parse_time: float = 0.0, retries: int = 0
+) -> None:
+    """Add to the metrics of the call in progress, if any."""
+    if (metrics := _CURRENT_CALL.get()) is None:
+        return
+    if bytes_received:
+        metrics.bytes_received = (metrics.bytes_received or 0) + bytes_received
+    if parse_time:
+        metrics.parse_time = (metrics.parse_time or 0.0) + parse_time
+    metrics.retries += retries
+
+
+def _distribution(values: list[float]) -> dict[str, float] | None:
+    """Return the median, 95th percentile and maximum (nearest rank)."""
+    if not values:
+        return None
+    values = sorted(values)
+
+    def percentile(pct: int) -> float:
+        return values[max(0, math.ceil(pct / 100 * len(values)) - 1)]
+
+    return {"p50": percentile(50), "p95": percentile(95), "max": values[-1]}
+
+
+class HpIloStats:
+    """Keep the metrics of the last calls of every operation."""
+
+    def __init__(self, history: int = HISTORY) -> None:
+        """Initialize the statistics."""
+        self.history = history
+        self._calls: dict[str, deque[HpIloCallMetrics]] = {}
+
+    @asynccontextmanager
+    async def async_measure(self, operation: str) -> AsyncIterator[HpIloCallMetrics]:
+        """Measure a call, transports add bytes and parse time with note()."""
+        metrics = HpIloCallMetrics(operation)
+        token = _CURRENT_CALL.set(metrics)
+        start = monotonic()
+        try:
+            yield metrics
+        except Exception as err:
+            metrics.error = type(err).__name__
+            raise
+        finally:
+            metrics.duration = monotonic() - start
+            _CURRENT_CALL.reset(token)
+            self._calls.setdefault(
+                operation, deque(maxlen=self.history)
+            ).append(metrics)
+
+    def summary(self, operation: str) -> dict[str, Any] | None:
+        """Return the statistics of an operation, None if it wasn't called."""
+        if not (calls := self._calls.get(operation)):
+            return None
+        return {
+            "count": len(calls),
+            "duration": _distribution([call.duration for call in calls]),
+            "bytes_received": _distribution(
+                [call.bytes_received for call in calls if call.bytes_received]
+            ),
+            "parse_time": _distribution(
+                [call.parse_time for call in calls if call.parse_time is not None]
+            ),
+            "retries": sum(call.retries for call in calls),
+            "errors": dict(Counter(call.error for call in calls if call.error)),
+            "last": vars(calls[-1]).copy(),
+        }
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Return the statistics of all operations."""
+        return {operation: self.summary(operation) for operation in self._calls}
@@ -0,0 +1,58 @@
+"""Persistent storage of what was learned about an iLO."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+DOMAIN = "hp_ilo"
+
+STORAGE_VERSION = 1
+# Seconds to wait before writing changes, to batch several of them
+SAVE_DELAY = 10
+
+
+class HpIloStore:
+    """Key/value storage of a config entry, kept in memory and saved lazily."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the store."""
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}"
+        )
+        self._data: dict[str, Any] = {}
+        self._dirty = False
+
+    async def async_load(self) -> None:
+        """Load the stored data."""
+        self._data = await self._store.async_load() or {}
+
+    @callback
+    def async_get(self, key: str) -> Any:
+        """Return a stored value."""
+        return self._data.get(key)
+
+    @callback
+    def async_set(self, key: str, value: Any) -> None:
+        """Store a value, it is written to disk shortly after."""
+        if self._data.get(key) == value:
+            return
+        self._data[key] = value
+        self._dirty = True
+        self._store.async_delay_save(self._async_data_to_save, SAVE_DELAY)
+
+    @callback
+    def _async_data_to_save(self) -> dict[str, Any]:
+        """Return the data to write."""
+        self._dirty = False
+        return self._data
+
+    async def async_save(self) -> None:
+        """Write pending changes now, e.g. before the entry is unloaded."""
+        if self._dirty:
+            await self._store.async_save(self._async_data_to_save())
+
+    async def async_remove(self) -> None:
+        """Remove the stored data."""
+        await self._store.async_remove()
@@ -49,7 +49,7 @@ async def async_setup_entry(
     switches = []
 
     # Add power switch if power status is available
-    if coordinator.data and coordinator.data.power_status is not None:
+    if coordinator.layout.power_status:
         _LOGGER.info("Adding switch for Server Power Control")
         switches.append(
             HpIloPowerSwitch(
@@ -83,7 +83,7 @@ class HpIloPowerSwitch(CoordinatorEntity[HpIloDataUpdateCoordinator], SwitchEnti
         device_info: DeviceInfo,
     ) -> None:
         """Initialize the switch."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, context="power_status")
         self._attr_device_info = device_info
         self._attr_name = "Server Power Control"
         self._attr_unique_id = f"{entry.data['unique_id']}_set_host_power"
@@ -97,18 +97,14 @@ class HpIloPowerSwitch(CoordinatorEntity[HpIloDataUpdateCoordinator], SwitchEnti
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn on the server."""
-        if not self.coordinator.data or not self.coordinator.data.ilo:
-            _LOGGER.error("No iLO connection available")
-            return
-            
         try:
-            await self.hass.async_add_executor_job(
-                self.coordinator.data.ilo.set_host_power,
+            await self.coordinator.async_command(
+                "set_host_power",
                 True  # host_power=True to turn on
             )
             _LOGGER.info("Successfully powered on server")
-            # Request a refresh to update the state
-            await self.coordinator.async_request_refresh()
+            # Follow the power state until the server reacted
+            self.coordinator.async_follow_power("ON")
         except (hpilo.IloError, hpilo.IloCommunicationError) as error:
             _LOGGER.error("Failed to power on server: %s", error)
             raise
@@ -119,18 +115,14 @@ class HpIloPowerSwitch(CoordinatorEntity[HpIloDataUpdateCoordinator], SwitchEnti
         Note: This performs a graceful shutdown. For hard power off,
         use the press_pwr_btn button or hold_pwr_btn method.
         """
-        if not self.coordinator.data or not self.coordinator.data.ilo:
-            _LOGGER.error("No iLO connection available")
-            return
-            
         try:
-            await self.hass.async_add_executor_job(
-                self.coordinator.data.ilo.set_host_power,
+            await self.coordinator.async_command(
+                "set_host_power",
                 False  # host_power=False to turn off
             )
             _LOGGER.info("Successfully powered off server")
-            # Request a refresh to update the state
-            await self.coordinator.async_request_refresh()
+            # Follow the power state until the server reacted
+            self.coordinator.async_follow_power("OFF")
         except (hpilo.IloError, hpilo.IloCommunicationError) as error:
             _LOGGER.error("Failed to power off server: %s", error)
             raise
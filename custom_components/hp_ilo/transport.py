@@ -0,0 +1,179 @@
+"""Transports used to talk to an HP iLO."""
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Collection
+import hashlib
+import logging
+from typing import TYPE_CHECKING, Any
+
+import hpilo
+
+from .fleet import HpIloFleet
+from .stats import OPERATION_FETCH, HpIloStats
+
+if TYPE_CHECKING:
+    from .capture import HpIloCapture
+
+_LOGGER = logging.getLogger(__name__)
+
+CONF_TRANSPORT = "transport"
+TRANSPORT_EXECUTOR = "executor"
+TRANSPORT_ASYNC = "async"
+TRANSPORT_REDFISH = "redfish"
+# Answers from responses captured earlier, for tests and benchmarks
+TRANSPORT_REPLAY = "replay"
+DEFAULT_TRANSPORT = TRANSPORT_EXECUTOR
+
+# Seconds to wait for the iLO, python-hpilo's default
+DEFAULT_TIMEOUT = 60
+
+
+def payload_digest(payload: bytes) -> bytes:
+    """Return the digest identifying a raw response payload."""
+    return hashlib.blake2b(payload, digest_size=16).digest()
+
+
+class HpIloTransport(ABC):
+    """Base class for the ways of sending RIBCL commands to an iLO.
+
+    Queries of a cycle are sent as one batched request. If the batch is
+    rejected because one of the calls is unsupported, the calls are
+    retried one by one and the unsupported ones are left out of the
+    result (and reported, so the caller can stop asking for them). Login
+    and communication errors are raised right away.
+    """
+
+    def __init__(
+        self,
+        host: str,
+        port: int,
+        username: str,
+        password: str,
+        timeout: int = DEFAULT_TIMEOUT,
+    ) -> None:
+        """Initialize the transport."""
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.timeout = timeout
+        # Sections of the embedded health data that are used, None for all.
+        # Transports that parse the responses themselves skip the others.
+        self.health_sections: Collection[str] | None = None
+        # Wall time, size, parse time, retries and errors of the last calls
+        self.stats = HpIloStats()
+        # Saves the raw responses when set, for transports doing their own I/O
+        self.capture: HpIloCapture | None = None
+        # Parses the responses in its worker processes when set, for
+        # transports doing their own parsing
+        self.parse_pool: HpIloFleet | None = None
+        # Query method -> function reducing its result, applied to the
+        # results of batched fetches by transports that cache or pickle
+        # them, so only the reduced results are kept. Single calls return
+        # the results as they are.
+        self.reducers: dict[str, Callable[[Any], Any]] = {}
+
+    async def async_fetch(
+        self, methods: list[str], unsupported: set[str] | None = None
+    ) -> dict[str, Any]:
+        """Call the given hpilo.Ilo query methods and return their results.
+
+        Methods the iLO doesn't support are added to unsupported.
+        """
+        if not methods:
+            return {}
+        try:
+            async with self.stats.async_measure(OPERATION_FETCH):
+                results = await self._async_fetch_batched(methods)
+        except (hpilo.IloLoginFailed, hpilo.IloCommunicationError):
+            raise
+        except hpilo.IloError as err:
+            # A single unsupported call fails the whole batch, so fall back
+            # to individual calls to still get everything else
+            _LOGGER.debug(
+                "Batched fetch failed (%s), falling back to individual calls", err
+            )
+        else:
+            if len(results) == len(methods):
+                return dict(zip(methods, results))
+            _LOGGER.debug(
+                "Expected %d responses, got %d, falling back to individual calls",
+                len(methods),
+                len(results),
+            )
+
+        fetched: dict[str, Any] = {}
+        error: hpilo.IloError | None = None
+        for method in methods:
+            try:
+                fetched[method] = await self.async_call(method)
+            except (hpilo.IloLoginFailed, hpilo.IloCommunicationError):
+                raise
+            except hpilo.IloFeatureNotSupported as err:
+                _LOGGER.debug("%s is not supported: %s", method, err)
+                if unsupported is not None:
+                    unsupported.add(method)
+            except hpilo.IloError as err:
+                _LOGGER.debug("Could not get %s: %s", method, err)
+                error = err
+        # Nothing but errors, e.g. the iLO returned garbage
+        if not fetched and error is not None:
+            raise error
+        return fetched
+
+    @abstractmethod
+    async def _async_fetch_batched(self, methods: list[str]) -> list[Any]:
+        """Call the query methods in one request and return their results."""
+
+    async def async_call(self, method: str, *args: Any) -> Any:
+        """Call a single hpilo.Ilo method (query or command)."""
+        async with self.stats.async_measure(method):
+            return await self._async_call(method, *args)
+
+    @abstractmethod
+    async def _async_call(self, method: str, *args: Any) -> Any:
+        """Call a single hpilo.Ilo method without recording it."""
+
+    async def async_close(self) -> None:
+        """Release the resources held by the transport."""
+
+
+class HpIloExecutorTransport(HpIloTransport):
+    """Send commands with python-hpilo's blocking client on the fleet's pool."""
+
+    def __init__(self, fleet: HpIloFleet, entry_id: str, *args: Any) -> None:
+        """Initialize the transport."""
+        super().__init__(*args)
+        self.fleet = fleet
+        self.entry_id = entry_id
+
+    def _client(self, delayed: bool = False) -> hpilo.Ilo:
+        """Return a new iLO client."""
+        return hpilo.Ilo(
+            hostname=self.host,
+            login=self.username,
+            password=self.password,
+            port=self.port,
+            timeout=self.timeout,
+            delayed=delayed,
+        )
+
+    async def _async_fetch_batched(self, methods: list[str]) -> list[Any]:
+        """Call the query methods in one request and return their results."""
+        return await self.fleet.async_run(self.entry_id, self._fetch_batched, methods)
+
+    def _fetch_batched(self, methods: list[str]) -> list[Any]:
+        """Call the query methods with python-hpilo's delayed mode."""
+        ilo = self._client(delayed=True)
+        for method in methods:
+            getattr(ilo, method)()
+        return ilo.call_delayed()
+
+    async def _async_call(self, method: str, *args: Any) -> Any:
+        """Call a single hpilo.Ilo method on a new connection."""
+        return await self.fleet.async_run(self.entry_id, self._call, method, args)
+
+    def _call(self, method: str, args: tuple[Any, ...]) -> Any:
+        """Call a single hpilo.Ilo method (runs in a fleet worker thread)."""
+        return getattr(self._client(), method)(*args)
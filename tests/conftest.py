@@ -1,4 +1,5 @@
 """Global fixtures for hp_ilo integration."""
+import ssl
 from unittest.mock import patch, MagicMock
 
 import pytest
@@ -7,8 +8,15 @@ import hpilo
 from .const import (
     MOCK_ILO_HOST_DATA,
     MOCK_ILO_EMBEDDED_HEALTH,
+    MOCK_ILO_EVENT_LOG,
     MOCK_ILO_FW_VERSION,
+    MOCK_ILO_POWER_ON_TIME,
+    MOCK_ILO_POWER_READINGS,
+    MOCK_ILO_POWER_STATUS,
+    MOCK_ILO_SERVER_EVENT_LOG,
+    MOCK_ILO_SERVER_NAME,
 )
+from .mock_ilo import MockIloServer, create_certificate
 
 pytest_plugins = "pytest_homeassistant_custom_component"
 
@@ -40,6 +48,24 @@ def mock_hpilo_fixture():
         mock_ilo.get_fw_version.return_value = MOCK_ILO_FW_VERSION
         mock_ilo.get_host_data.return_value = MOCK_ILO_HOST_DATA
         mock_ilo.get_embedded_health.return_value = MOCK_ILO_EMBEDDED_HEALTH
+        mock_ilo.get_host_power_status.return_value = MOCK_ILO_POWER_STATUS
+        mock_ilo.get_server_power_on_time.return_value = MOCK_ILO_POWER_ON_TIME
+        mock_ilo.get_power_readings.return_value = MOCK_ILO_POWER_READINGS
+        mock_ilo.get_server_name.return_value = MOCK_ILO_SERVER_NAME
+        mock_ilo.get_server_event_log.return_value = MOCK_ILO_SERVER_EVENT_LOG
+        mock_ilo.get_ilo_event_log.return_value = MOCK_ILO_EVENT_LOG
+
+        # Delayed mode: answer call_delayed() with the results of all get_*
+        # calls queued since the previous batch, like python-hpilo does
+        def call_delayed():
+            queued = [
+                name for name, _, _ in mock_ilo.method_calls
+                if name.startswith("get_")
+            ]
+            mock_ilo.method_calls.clear()
+            return [getattr(mock_ilo, name).return_value for name in queued]
+
+        mock_ilo.call_delayed.side_effect = call_delayed
         mock_ilo_class.return_value = mock_ilo
         yield mock_ilo
 
@@ -61,3 +87,25 @@ def mock_hpilo_connection_error_fixture():
         mock_ilo_class.side_effect = hpilo.IloCommunicationError("Cannot connect")
         yield mock_ilo_class
 
+
+
+# Server certificate of the local mock iLO, created once per test session
+@pytest.fixture(name="mock_ilo_ssl_context", scope="session")
+def mock_ilo_ssl_context_fixture(tmp_path_factory):
+    """Return the server SSL context of the mock iLO."""
+    path = tmp_path_factory.mktemp("mock_ilo")
+    cert_path, key_path = str(path / "cert.pem"), str(path / "key.pem")
+    create_certificate(cert_path, key_path)
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+    context.load_cert_chain(cert_path, key_path)
+    return context
+
+
+# This fixture runs a local mock iLO answering RIBCL over HTTPS
+@pytest.fixture(name="mock_ilo_server")
+async def mock_ilo_server_fixture(hass, socket_enabled, mock_ilo_ssl_context):
+    """Start a mock iLO on localhost."""
+    server = MockIloServer(mock_ilo_ssl_context)
+    await server.start()
+    yield server
+    await server.stop()
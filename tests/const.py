@@ -52,6 +52,55 @@ MOCK_ILO_HOST_DATA = [
     {"cDNA Asset Tag": "Not Set"},
 ]
 
+# get_host_power_status() response
+MOCK_ILO_POWER_STATUS = "ON"
+
+# get_server_power_on_time() response in minutes
+MOCK_ILO_POWER_ON_TIME = 12345
+
+# get_server_name() response
+MOCK_ILO_SERVER_NAME = "TESTSERVER"
+
+# Mock iLO power readings
+MOCK_ILO_POWER_READINGS = {
+    "average_power_reading": (65, "Watts"),
+    "maximum_power_reading": (101, "Watts"),
+    "minimum_power_reading": (65, "Watts"),
+    "present_power_reading": (67, "Watts"),
+}
+
+# get_server_event_log() response, the Integrated Management Log
+MOCK_ILO_SERVER_EVENT_LOG = [
+    {
+        "severity": "Informational",
+        "class": "Maintenance",
+        "last_update": "01/22/2020 10:15",
+        "initial_update": "01/22/2020 10:15",
+        "count": 1,
+        "description": "IML Cleared (iLO 4 user:admin)",
+    },
+    {
+        "severity": "Caution",
+        "class": "Environment",
+        "last_update": "02/03/2020 08:02",
+        "initial_update": "02/03/2020 07:58",
+        "count": 3,
+        "description": "System Fan Failure (Fan 2, Location System)",
+    },
+]
+
+# get_ilo_event_log() response
+MOCK_ILO_EVENT_LOG = [
+    {
+        "severity": "Informational",
+        "class": "iLO 4",
+        "last_update": "02/03/2020 09:12",
+        "initial_update": "02/03/2020 09:12",
+        "count": 1,
+        "description": "Browser login: admin - 192.168.1.10(DNS name not found).",
+    },
+]
+
 # get_embedded_health() response with realistic health data structure
 MOCK_ILO_EMBEDDED_HEALTH = {
     "health_at_a_glance": {
@@ -115,6 +164,46 @@ MOCK_ILO_EMBEDDED_HEALTH = {
             "firmware_version": "1.00",
         },
     },
+    "storage": {
+        "Controller on System Board": {
+            "label": "Controller on System Board",
+            "status": "OK",
+            "model": "HP Smart Array P440ar Controller",
+            "logical_drives": [
+                {
+                    "label": "01",
+                    "status": "Degraded (Recovering)",
+                    "capacity": "558 GB",
+                    "fault_tolerance": "RAID 1/RAID 1+0",
+                    "physical_drives": [
+                        {
+                            "label": "Port 1I Box 1 Bay 1",
+                            "status": "OK",
+                            "model": "EG0600FCVBK",
+                            "capacity": "558 GB",
+                        },
+                        {
+                            "label": "Port 1I Box 1 Bay 2",
+                            "status": "Rebuilding",
+                            "model": "EG0600FCVBK",
+                            "capacity": "558 GB",
+                        },
+                    ],
+                },
+            ],
+        },
+    },
+    "memory": {
+        "memory_details_summary": {
+            "cpu_1": {"number_of_sockets": 2, "total_memory_size": "32 GB"},
+        },
+        "memory_details": {
+            "CPU_1": {
+                "socket 1": {"socket": 1, "status": "Good, In Use", "size": "32768 MB"},
+                "socket 2": {"socket": 2, "status": "Not Present", "size": "N/A"},
+            },
+        },
+    },
     "firmware_information": {
         "System ROM": "U32 v2.42 (01/22/2020)",
         "iLO": "2.53 Feb 17 2017",
@@ -123,3 +212,319 @@ MOCK_ILO_EMBEDDED_HEALTH = {
     "glance-seperator": None,
 }
 
+
+# Raw RIBCL response to a batched get_host_power_status + get_server_name
+# request, one XML document for the login and one per command
+MOCK_RIBCL_POWER_AND_NAME_RESPONSE = """<?xml version="1.0"?>
+<RIBCL VERSION="2.23">
+<RESPONSE
+    STATUS="0x0000"
+    MESSAGE='No error'
+     />
+</RIBCL>
+<?xml version="1.0"?>
+<RIBCL VERSION="2.23">
+<RESPONSE
+    STATUS="0x0000"
+    MESSAGE='No error'
+     />
+<GET_HOST_POWER
+    HOST_POWER="ON"
+/>
+</RIBCL>
+<?xml version="1.0"?>
+<RIBCL VERSION="2.23">
+<RESPONSE
+    STATUS="0x0000"
+    MESSAGE='No error'
+     />
+<SERVER_NAME VALUE = "TESTSERVER"/>
+</RIBCL>
+"""
+
+# Raw RIBCL response for rejected credentials
+MOCK_RIBCL_LOGIN_FAILED_RESPONSE = """<?xml version="1.0"?>
+<RIBCL VERSION="2.23">
+<RESPONSE
+    STATUS="0x005F"
+    MESSAGE='Login failed.'
+     />
+</RIBCL>
+"""
+
+# Raw RIBCL response to get_embedded_health, modelled on an iLO 4
+MOCK_RIBCL_EMBEDDED_HEALTH_RESPONSE = """<?xml version="1.0"?>
+<RIBCL VERSION="2.23">
+<RESPONSE
+    STATUS="0x0000"
+    MESSAGE='No error'
+     />
+</RIBCL>
+<?xml version="1.0"?>
+<RIBCL VERSION="2.23">
+<RESPONSE
+    STATUS="0x0000"
+    MESSAGE='No error'
+     />
+<GET_EMBEDDED_HEALTH_DATA>
+ <FANS>
+  <FAN>
+   <ZONE VALUE = "System"/>
+   <LABEL VALUE = "Fan 1"/>
+   <STATUS VALUE = "OK"/>
+   <SPEED VALUE = "18" UNIT="Percentage"/>
+  </FAN>
+  <FAN>
+   <ZONE VALUE = "System"/>
+   <LABEL VALUE = "Fan 2"/>
+   <STATUS VALUE = "OK"/>
+   <SPEED VALUE = "18" UNIT="Percentage"/>
+  </FAN>
+ </FANS>
+ <TEMPERATURE>
+  <TEMP>
+   <LABEL VALUE = "01-Inlet Ambient"/>
+   <LOCATION VALUE = "Ambient"/>
+   <STATUS VALUE = "OK"/>
+   <CURRENTREADING VALUE = "21" UNIT="Celsius"/>
+   <CAUTION VALUE = "42" UNIT="Celsius"/>
+   <CRITICAL VALUE = "46" UNIT="Celsius"/>
+  </TEMP>
+  <TEMP>
+   <LABEL VALUE = "02-CPU 1"/>
+   <LOCATION VALUE = "CPU"/>
+   <STATUS VALUE = "OK"/>
+   <CURRENTREADING VALUE = "40" UNIT="Celsius"/>
+   <CAUTION VALUE = "70" UNIT="Celsius"/>
+   <CRITICAL VALUE = "N/A"/>
+  </TEMP>
+ </TEMPERATURE>
+ <POWER_SUPPLIES>
+  <SUPPLY>
+   <LABEL VALUE = "Power Supply 1"/>
+   <PRESENT VALUE = "Yes"/>
+   <STATUS VALUE = "Good, In Use"/>
+   <PDS VALUE = "Other"/>
+   <HOTPLUG_CAPABLE VALUE = "Yes"/>
+   <MODEL VALUE = "656362-B21"/>
+   <SPARE VALUE = "660184-001"/>
+   <SERIAL_NUMBER VALUE = "5DMVV0ALL4B0KM"/>
+   <CAPACITY VALUE = "460 Watts"/>
+   <FIRMWARE_VERSION VALUE = "1.00"/>
+  </SUPPLY>
+  <SUPPLY>
+   <LABEL VALUE = "Power Supply 2"/>
+   <PRESENT VALUE = "Yes"/>
+   <STATUS VALUE = "Good, In Use"/>
+   <PDS VALUE = "Other"/>
+   <HOTPLUG_CAPABLE VALUE = "Yes"/>
+   <MODEL VALUE = "656362-B21"/>
+   <SPARE VALUE = "660184-001"/>
+   <SERIAL_NUMBER VALUE = "5DMVV0ALL4B0KN"/>
+   <CAPACITY VALUE = "460 Watts"/>
+   <FIRMWARE_VERSION VALUE = "1.00"/>
+  </SUPPLY>
+ </POWER_SUPPLIES>
+ <STORAGE>
+  <CONTROLLER>
+   <LABEL VALUE = "Controller on System Board"/>
+   <STATUS VALUE = "OK"/>
+   <CONTROLLER_STATUS VALUE = "OK"/>
+   <SERIAL_NUMBER VALUE = "PCQVU0CRH6D13P"/>
+   <MODEL VALUE = "HP Smart Array P440ar Controller"/>
+   <FW_VERSION VALUE = "7.00"/>
+   <CACHE_MODULE_STATUS VALUE = "OK"/>
+   <CACHE_MODULE_SERIAL_NUM VALUE = "PDNLH0BRH7V6KC"/>
+   <CACHE_MODULE_MEMORY VALUE = "2097152 KB"/>
+   <DRIVE_ENCLOSURE>
+    <LABEL VALUE = "Port 1I Box 1"/>
+    <STATUS VALUE = "OK"/>
+    <DRIVE_BAY VALUE = "04"/>
+   </DRIVE_ENCLOSURE>
+   <LOGICAL_DRIVE>
+    <LABEL VALUE = "01"/>
+    <STATUS VALUE = "Degraded (Recovering)"/>
+    <CAPACITY VALUE = "558 GB"/>
+    <FAULT_TOLERANCE VALUE = "RAID 1/RAID 1+0"/>
+    <ENCRYPTION_STATUS VALUE = "Not Encrypted"/>
+    <PHYSICAL_DRIVE>
+     <LABEL VALUE = "Port 1I Box 1 Bay 1"/>
+     <STATUS VALUE = "OK"/>
+     <SERIAL_NUMBER VALUE = "S0M243NV0000M433M04G"/>
+     <MODEL VALUE = "EG0600FCVBK"/>
+     <CAPACITY VALUE = "558 GB"/>
+     <LOCATION VALUE = "Port 1I Box 1 Bay 1"/>
+     <FW_VERSION VALUE = "HPD5"/>
+     <DRIVE_CONFIGURATION VALUE = "Configured"/>
+     <ENCRYPTION_STATUS VALUE = "Not Encrypted"/>
+    </PHYSICAL_DRIVE>
+    <PHYSICAL_DRIVE>
+     <LABEL VALUE = "Port 1I Box 1 Bay 2"/>
+     <STATUS VALUE = "Rebuilding"/>
+     <SERIAL_NUMBER VALUE = "S0M244080000M433FABZ"/>
+     <MODEL VALUE = "EG0600FCVBK"/>
+     <CAPACITY VALUE = "558 GB"/>
+     <LOCATION VALUE = "Port 1I Box 1 Bay 2"/>
+     <FW_VERSION VALUE = "HPD5"/>
+     <DRIVE_CONFIGURATION VALUE = "Configured"/>
+     <ENCRYPTION_STATUS VALUE = "Not Encrypted"/>
+    </PHYSICAL_DRIVE>
+   </LOGICAL_DRIVE>
+  </CONTROLLER>
+  <DISCOVERY_STATUS>
+   <STATUS VALUE = "Discovery Complete"/>
+  </DISCOVERY_STATUS>
+ </STORAGE>
+ <MEMORY>
+  <ADVANCED_MEMORY_PROTECTION>
+   <AMP_MODE_STATUS VALUE = "Advanced ECC"/>
+   <CONFIGURED_AMP_MODE VALUE = "Advanced ECC"/>
+   <AVAILABLE_AMP_MODES VALUE = "On-line Spare, Advanced ECC"/>
+  </ADVANCED_MEMORY_PROTECTION>
+  <MEMORY_DETAILS_SUMMARY>
+   <CPU_1>
+    <NUMBER_OF_SOCKETS VALUE = "2"/>
+    <TOTAL_MEMORY_SIZE VALUE = "32 GB"/>
+    <OPERATING_FREQUENCY VALUE = "2133 MHz"/>
+    <OPERATING_VOLTAGE VALUE = "1.20 v"/>
+   </CPU_1>
+  </MEMORY_DETAILS_SUMMARY>
+  <MEMORY_DETAILS>
+   <CPU_1>
+    <SOCKET VALUE = "1"/>
+    <STATUS VALUE = "Good, In Use"/>
+    <HP_SMART_MEMORY VALUE = "Yes"/>
+    <PART NUMBER = "726719-B21"/>
+    <TYPE VALUE = "DIMM DDR4"/>
+    <SIZE VALUE = "32768 MB"/>
+    <FREQUENCY VALUE = "2133 MHz"/>
+    <MINIMUM_VOLTAGE VALUE = "1.20 v"/>
+    <RANKS VALUE = "2"/>
+    <TECHNOLOGY VALUE = "RDIMM"/>
+   </CPU_1>
+   <CPU_1>
+    <SOCKET VALUE = "2"/>
+    <STATUS VALUE = "Not Present"/>
+    <HP_SMART_MEMORY VALUE = "N/A"/>
+    <PART NUMBER = "N/A"/>
+    <TYPE VALUE = "N/A"/>
+    <SIZE VALUE = "N/A"/>
+    <FREQUENCY VALUE = "N/A"/>
+    <MINIMUM_VOLTAGE VALUE = "N/A"/>
+    <RANKS VALUE = "N/A"/>
+    <TECHNOLOGY VALUE = "N/A"/>
+   </CPU_1>
+  </MEMORY_DETAILS>
+ </MEMORY>
+ <HEALTH_AT_A_GLANCE>
+  <BIOS_HARDWARE STATUS= "OK"/>
+  <FANS STATUS= "OK"/>
+  <FANS REDUNDANCY= "Redundant"/>
+  <TEMPERATURE STATUS= "OK"/>
+  <POWER_SUPPLIES STATUS= "OK"/>
+  <POWER_SUPPLIES REDUNDANCY= "Redundant"/>
+  <PROCESSOR STATUS= "OK"/>
+  <MEMORY STATUS= "OK"/>
+  <NETWORK STATUS= "Link Down"/>
+  <STORAGE STATUS= "OK"/>
+ </HEALTH_AT_A_GLANCE>
+ <FIRMWARE_INFORMATION>
+  <INDEX_1>
+   <FIRMWARE_NAME VALUE = "iLO"/>
+   <FIRMWARE_VERSION VALUE = "2.53 Feb 17 2017"/>
+  </INDEX_1>
+  <INDEX_2>
+   <FIRMWARE_NAME VALUE = "System ROM"/>
+   <FIRMWARE_VERSION VALUE = "P71 05/24/2019"/>
+  </INDEX_2>
+ </FIRMWARE_INFORMATION>
+</GET_EMBEDDED_HEALTH_DATA>
+</RIBCL>
+"""
+
+# Redfish resources of an iLO 5
+MOCK_REDFISH_SYSTEM = {
+    "@odata.id": "/redfish/v1/Systems/1/",
+    "BiosVersion": "U32 v2.42 (01/22/2020)",
+    "HostName": "TESTSERVER",
+    "Model": "ProLiant DL360 Gen10",
+    "PowerState": "On",
+    "SerialNumber": "ABC123DEF456",
+    "UUID": "12345678-1234-1234-1234-123456789012",
+}
+
+MOCK_REDFISH_MANAGER = {
+    "@odata.id": "/redfish/v1/Managers/1/",
+    "FirmwareVersion": "iLO 5 v2.44",
+    "Model": "iLO 5",
+}
+
+MOCK_REDFISH_THERMAL = {
+    "@odata.id": "/redfish/v1/Chassis/1/Thermal/",
+    "Fans": [
+        {
+            "Name": "Fan 1",
+            "Reading": 18,
+            "ReadingUnits": "Percent",
+            "Status": {"Health": "OK", "State": "Enabled"},
+        },
+    ],
+    "Temperatures": [
+        {
+            "Name": "01-Inlet Ambient",
+            "PhysicalContext": "Intake",
+            "ReadingCelsius": 21,
+            "Status": {"Health": "OK", "State": "Enabled"},
+            "UpperThresholdCritical": 42,
+            "UpperThresholdFatal": 46,
+        },
+        {
+            "Name": "12-P1 DIMM 1-6",
+            "PhysicalContext": "SystemBoard",
+            "ReadingCelsius": 0,
+            "Status": {"State": "Absent"},
+        },
+    ],
+}
+
+MOCK_REDFISH_POWER = {
+    "@odata.id": "/redfish/v1/Chassis/1/Power/",
+    "PowerControl": [
+        {
+            "PowerConsumedWatts": 67,
+            "PowerMetrics": {
+                "AverageConsumedWatts": 65,
+                "IntervalInMin": 20,
+                "MaxConsumedWatts": 101,
+                "MinConsumedWatts": 65,
+            },
+        },
+    ],
+}
+
+# Unauthenticated /xmldata?item=all response (iLO 4)
+MOCK_XMLDATA_RESPONSE = """<?xml version="1.0"?>
+<RIMP>
+<HSI>
+<SBSN>ABC123DEF456      </SBSN>
+<SPN>ProLiant DL360 Gen10</SPN>
+<UUID>12345678-1234-1234-1234-123456789012</UUID>
+<SP>1</SP>
+<cUUID>31323334-3536-3738-3132-333435363738</cUUID>
+<VIRTUAL><STATE>Inactive</STATE><VID><BSN></BSN><cUUID></cUUID></VID></VIRTUAL>
+<PRODUCTID>123456-B21</PRODUCTID>
+</HSI>
+<MP>
+<ST>1</ST>
+<PN>Integrated Lights-Out 4 (iLO 4)</PN>
+<FWRI>2.53</FWRI>
+<BBLK></BBLK>
+<HWRI>ASIC: 16</HWRI>
+<SN>ILOABC123DEF456</SN>
+<UUID>ILOABC123DEF456</UUID>
+<IPM>1</IPM>
+<SSO>0</SSO>
+<PWRM>3.4</PWRM>
+</MP>
+</RIMP>
+"""
@@ -0,0 +1,325 @@
+"""Local stand-in for an iLO serving RIBCL over HTTPS.
+
+Responses are built from the payloads in const.py, so both python-hpilo's
+blocking client and the aiohttp transports can be exercised end to end,
+including TLS, HTTP and XML parsing. Latency, jitter, failure rate and the
+size of the health data are configurable for benchmarks.
+"""
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+import datetime
+import random
+import re
+import ssl
+import threading
+from xml.etree import ElementTree
+
+from aiohttp import web
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from cryptography.x509.oid import NameOID
+
+from .const import (
+    MOCK_CONFIG_FULL,
+    MOCK_ILO_EVENT_LOG,
+    MOCK_ILO_FW_VERSION,
+    MOCK_ILO_POWER_ON_TIME,
+    MOCK_ILO_POWER_STATUS,
+    MOCK_ILO_SERVER_EVENT_LOG,
+    MOCK_ILO_SERVER_NAME,
+    MOCK_RIBCL_EMBEDDED_HEALTH_RESPONSE,
+    MOCK_XMLDATA_RESPONSE,
+)
+
+RESPONSE_DOCUMENT = """<?xml version="1.0"?>
+<RIBCL VERSION="2.23">
+<RESPONSE
+    STATUS="{status}"
+    MESSAGE='{message}'
+     />
+{payload}</RIBCL>
+"""
+
+HEALTH_PAYLOAD = re.search(
+    r"<GET_EMBEDDED_HEALTH_DATA>.*</GET_EMBEDDED_HEALTH_DATA>\n",
+    MOCK_RIBCL_EMBEDDED_HEALTH_RESPONSE,
+    re.DOTALL,
+).group(0)
+
+EXTRA_TEMPERATURE = """  <TEMP>
+   <LABEL VALUE = "{index:02d}-Extra Sensor"/>
+   <LOCATION VALUE = "System"/>
+   <STATUS VALUE = "OK"/>
+   <CURRENTREADING VALUE = "{reading}" UNIT="Celsius"/>
+   <CAUTION VALUE = "80" UNIT="Celsius"/>
+   <CRITICAL VALUE = "90" UNIT="Celsius"/>
+  </TEMP>
+"""
+
+EVENT = """<EVENT
+    SEVERITY="{severity}"
+    CLASS="{class}"
+    LAST_UPDATE="{last_update}"
+    INITIAL_UPDATE="{initial_update}"
+    COUNT="{count}"
+    DESCRIPTION="{description}"
+/>
+"""
+
+HOST_DATA_PAYLOAD = """<GET_HOST_DATA>
+<SMBIOS_RECORD TYPE="0" B64_DATA="">
+ <FIELD NAME="Family" VALUE="U32"/>
+ <FIELD NAME="Date" VALUE="01/22/2020"/>
+</SMBIOS_RECORD>
+<SMBIOS_RECORD TYPE="1" B64_DATA="">
+ <FIELD NAME="Product Name" VALUE="ProLiant DL360 Gen10"/>
+ <FIELD NAME="Serial Number" VALUE="ABC123DEF456"/>
+ <FIELD NAME="UUID" VALUE="12345678-1234-1234-1234-123456789012"/>
+</SMBIOS_RECORD>
+</GET_HOST_DATA>
+"""
+
+POWER_READINGS_PAYLOAD = """<GET_POWER_READINGS>
+    <PRESENT_POWER_READING VALUE="67" UNIT="Watts"/>
+    <AVERAGE_POWER_READING VALUE="65" UNIT="Watts"/>
+    <MAXIMUM_POWER_READING VALUE="101" UNIT="Watts"/>
+    <MINIMUM_POWER_READING VALUE="65" UNIT="Watts"/>
+</GET_POWER_READINGS>
+"""
+
+# RIBCL command -> payload of its response
+PAYLOADS = {
+    "GET_HOST_POWER_STATUS": (
+        f'<GET_HOST_POWER\n    HOST_POWER="{MOCK_ILO_POWER_STATUS}"\n/>\n'
+    ),
+    "GET_SERVER_NAME": f'<SERVER_NAME VALUE = "{MOCK_ILO_SERVER_NAME}"/>\n',
+    "GET_SERVER_POWER_ON_TIME": (
+        f'<SERVER_POWER_ON_MINUTES VALUE="{MOCK_ILO_POWER_ON_TIME}"/>\n'
+    ),
+    "GET_FW_VERSION": (
+        (
+            "<GET_FW_VERSION\n"
+            '    FIRMWARE_VERSION = "{firmware_version}"\n'
+            '    FIRMWARE_DATE = "{firmware_date}"\n'
+            '    MANAGEMENT_PROCESSOR = "{management_processor}"\n'
+            '    LICENSE_TYPE = "{license_type}"\n'
+            "    />\n"
+        ).format(**MOCK_ILO_FW_VERSION)
+    ),
+    "GET_HOST_DATA": HOST_DATA_PAYLOAD,
+    "GET_POWER_READINGS": POWER_READINGS_PAYLOAD,
+    "GET_EMBEDDED_HEALTH": HEALTH_PAYLOAD,
+}
+
+# Event logs, both are read with GET_EVENT_LOG in different sections
+EVENT_LOGS = {
+    "SERVER_INFO": "Integrated Management Log",
+    "RIB_INFO": "iLO Event Log",
+}
+
+# Commands that are accepted without a response payload
+COMMANDS = {"PRESS_PWR_BTN", "HOLD_PWR_BTN", "COLD_BOOT_SERVER", "SET_HOST_POWER"}
+
+
+def create_certificate(cert_path: str, key_path: str) -> None:
+    """Write a self-signed certificate for localhost."""
+    key = ec.generate_private_key(ec.SECP256R1())
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "localhost")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    with open(cert_path, "wb") as file:
+        file.write(cert.public_bytes(serialization.Encoding.PEM))
+    with open(key_path, "wb") as file:
+        file.write(
+            key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.PKCS8,
+                serialization.NoEncryption(),
+            )
+        )
+
+
+@dataclass
+class MockIloSettings:
+    """Behaviour of the mock iLO."""
+
+    username: str = MOCK_CONFIG_FULL["username"]
+    password: str = MOCK_CONFIG_FULL["password"]
+    # Seconds before a response is sent, +- up to jitter seconds
+    latency: float = 0.0
+    jitter: float = 0.0
+    # Share of requests whose connection is dropped without a response
+    failure_rate: float = 0.0
+    # Temperature sensors added to the health data, to scale its size
+    extra_temperatures: int = 0
+    # Commands answered with "feature not supported"
+    unsupported: frozenset[str] = frozenset()
+    # Entries of the event logs, by the section they are read in
+    event_logs: dict[str, list[dict]] = field(
+        default_factory=lambda: {
+            "SERVER_INFO": list(MOCK_ILO_SERVER_EVENT_LOG),
+            "RIB_INFO": list(MOCK_ILO_EVENT_LOG),
+        }
+    )
+
+
+class MockIloServer:
+    """HTTPS server answering RIBCL requests like an iLO 4.
+
+    The server runs an event loop in its own thread, so its work doesn't
+    show up in measurements of the event loop under test.
+    """
+
+    def __init__(
+        self, ssl_context: ssl.SSLContext, settings: MockIloSettings | None = None
+    ) -> None:
+        """Initialize the server."""
+        self.settings = settings or MockIloSettings()
+        self.ssl_context = ssl_context
+        self.port = 0
+        # Number of RIBCL requests and commands received
+        self.requests = 0
+        self.commands: list[str] = []
+        self._random = random.Random(0)
+        self._runner: web.AppRunner | None = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._loop.run_forever, name="mock_ilo", daemon=True
+        )
+
+    async def start(self) -> None:
+        """Start listening on a free port of 127.0.0.1."""
+        self._thread.start()
+        await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self._async_start(), self._loop)
+        )
+
+    async def stop(self) -> None:
+        """Stop the server and its thread."""
+        if self._runner is not None:
+            await asyncio.wrap_future(
+                asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop)
+            )
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    async def _async_start(self) -> None:
+        """Start the web server, in the server's thread."""
+        app = web.Application()
+        app.router.add_post("/ribcl", self._handle_ribcl)
+        app.router.add_get("/xmldata", self._handle_xmldata)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(
+            self._runner, "127.0.0.1", 0, ssl_context=self.ssl_context
+        )
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+
+    def health_payload(self) -> str:
+        """Return the health data, with the extra temperature sensors."""
+        extra = "".join(
+            EXTRA_TEMPERATURE.format(index=index, reading=20 + index % 30)
+            for index in range(3, 3 + self.settings.extra_temperatures)
+        )
+        return HEALTH_PAYLOAD.replace(" </TEMPERATURE>", f"{extra} </TEMPERATURE>")
+
+    async def _delay(self) -> None:
+        """Wait for the configured latency."""
+        settings = self.settings
+        delay = settings.latency + self._random.uniform(
+            -settings.jitter, settings.jitter
+        )
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def _handle_xmldata(self, request: web.Request) -> web.StreamResponse:
+        """Answer the unauthenticated identity request."""
+        await self._delay()
+        return web.Response(
+            body=MOCK_XMLDATA_RESPONSE.encode(), content_type="text/xml"
+        )
+
+    async def _handle_ribcl(self, request: web.Request) -> web.StreamResponse:
+        """Answer a RIBCL request with one document per command."""
+        body = await request.read()
+        self.requests += 1
+        await self._delay()
+        if self._random.random() < self.settings.failure_rate:
+            request.transport.close()
+            return web.Response()
+
+        response = web.StreamResponse(headers={"Content-Type": "text/xml"})
+        # Like real iLOs, python-hpilo relies on it
+        response.enable_chunked_encoding()
+        await response.prepare(request)
+        await response.write(self._answer(body).encode())
+        await response.write_eof()
+        return response
+
+    def _answer(self, body: bytes) -> str:
+        """Return the response documents for a request."""
+        root = ElementTree.fromstring(body.decode().split("?>", 1)[-1].strip())
+        login = root.find("LOGIN")
+        # Protocol detection sends an empty document
+        if login is None:
+            return RESPONSE_DOCUMENT.format(
+                status="0x0000", message="No error", payload=""
+            )
+        if (
+            login.get("USER_LOGIN") != self.settings.username
+            or login.get("PASSWORD") != self.settings.password
+        ):
+            return RESPONSE_DOCUMENT.format(
+                status="0x005F", message="Login failed.", payload=""
+            )
+
+        documents = [
+            RESPONSE_DOCUMENT.format(status="0x0000", message="No error", payload="")
+        ]
+        for section in login:
+            for command in section:
+                self.commands.append(command.tag)
+                documents.append(self._answer_command(section.tag, command.tag))
+        return "".join(documents)
+
+    def event_log_payload(self, section: str) -> str:
+        """Return the event log read in a section."""
+        events = "".join(
+            EVENT.format(**event) for event in self.settings.event_logs[section]
+        )
+        return (
+            f'<EVENT_LOG DESCRIPTION="{EVENT_LOGS[section]}">\n{events}</EVENT_LOG>\n'
+        )
+
+    def _answer_command(self, section: str, command: str) -> str:
+        """Return the response document of a single command."""
+        is_event_log = command == "GET_EVENT_LOG" and section in EVENT_LOGS
+        if command in self.settings.unsupported or (
+            command not in PAYLOADS and command not in COMMANDS and not is_event_log
+        ):
+            return RESPONSE_DOCUMENT.format(
+                status="0x003C", message="Feature not supported.", payload=""
+            )
+        if is_event_log:
+            payload = self.event_log_payload(section)
+        elif command == "GET_EMBEDDED_HEALTH":
+            payload = self.health_payload()
+        else:
+            payload = PAYLOADS.get(command, "")
+        return RESPONSE_DOCUMENT.format(
+            status="0x0000", message="No error", payload=payload
+        )
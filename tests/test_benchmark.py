@@ -0,0 +1,176 @@
+"""Refresh benchmarks against the local mock iLO.
+
+Skipped unless HP_ILO_BENCHMARK is set, run them with
+
+    HP_ILO_BENCHMARK=1 pytest tests/test_benchmark.py -s
+
+Every case refreshes all tiers of 1 to 200 simulated iLOs at once for a few
+rounds and reports the refresh latency, the longest the event loop was
+blocked, the CPU time and the peak memory allocated. The event loop
+blocking time is also checked against HP_ILO_BENCHMARK_MAX_LAG (seconds,
+default 0.5), making the suite a regression gate for scaling changes.
+
+Parsing and refreshing is also benchmarked against responses captured from
+real iLOs (see the capture option) when HP_ILO_REPLAY_CORPUS points at a
+directory with one capture directory per machine, like hp_ilo_captures.
+"""
+import asyncio
+import os
+from pathlib import Path
+import time
+import tracemalloc
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.hp_ilo.capture import CAPTURE_DIR
+from custom_components.hp_ilo.coordinator import HpIloDataUpdateCoordinator
+from custom_components.hp_ilo.sensor import DOMAIN
+from custom_components.hp_ilo.stats import OPERATION_FETCH
+from custom_components.hp_ilo.transport import (
+    CONF_TRANSPORT,
+    TRANSPORT_ASYNC,
+    TRANSPORT_EXECUTOR,
+    TRANSPORT_REPLAY,
+)
+
+from .const import MOCK_CONFIG_FULL
+from .test_mock_ilo import create_coordinator
+
+pytestmark = pytest.mark.skipif(
+    not os.environ.get("HP_ILO_BENCHMARK"), reason="HP_ILO_BENCHMARK not set"
+)
+
+ROUNDS = 3
+# Response time of the simulated iLOs, real ones take 0.2 to several seconds
+LATENCY = 0.2
+JITTER = 0.1
+# Temperature sensors added to the health data, a loaded DL380 has ~40
+EXTRA_TEMPERATURES = 40
+MAX_LAG = float(os.environ.get("HP_ILO_BENCHMARK_MAX_LAG", "0.5"))
+REPLAY_ROUNDS = 20
+CORPUS = Path(os.environ.get("HP_ILO_REPLAY_CORPUS", "/nonexistent"))
+MACHINES = sorted(path.name for path in CORPUS.glob("*") if path.is_dir())
+
+
+def _percentile(values, pct):
+    """Return a percentile (nearest rank) of the values."""
+    values = sorted(values)
+    return values[max(0, -(-pct * len(values) // 100) - 1)]
+
+
+async def _monitor_lag(interval, lags):
+    """Record how late the event loop wakes up a sleeping task."""
+    loop = asyncio.get_running_loop()
+    while True:
+        start = loop.time()
+        await asyncio.sleep(interval)
+        lags.append(loop.time() - start - interval)
+
+
+async def _timed_refresh(coordinator):
+    """Refresh all tiers of a coordinator and return the wall time."""
+    coordinator._tier_due = dict.fromkeys(coordinator._tier_due, 0.0)
+    start = time.perf_counter()
+    await coordinator.async_refresh()
+    return time.perf_counter() - start
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("transport", [TRANSPORT_EXECUTOR, TRANSPORT_ASYNC])
+@pytest.mark.parametrize("hosts", [1, 10, 50, 200])
+async def test_refresh_benchmark(hass, mock_ilo_server, transport, hosts):
+    """Benchmark concurrent refreshes of many iLOs."""
+    settings = mock_ilo_server.settings
+    settings.latency = LATENCY
+    settings.jitter = JITTER
+    settings.extra_temperatures = EXTRA_TEMPERATURES
+    coordinators = [
+        create_coordinator(hass, mock_ilo_server, transport, index)
+        for index in range(hosts)
+    ]
+
+    async def refresh_all():
+        latencies = await asyncio.gather(
+            *(_timed_refresh(coordinator) for coordinator in coordinators)
+        )
+        assert all(coordinator.last_update_success for coordinator in coordinators)
+        return latencies
+
+    # The test harness runs the loop in debug mode, which is much slower
+    debug = hass.loop.get_debug()
+    hass.loop.set_debug(False)
+    lags: list[float] = []
+    latencies = []
+    try:
+        # Warm up: protocol detection, sessions, layouts
+        await refresh_all()
+
+        monitor = asyncio.create_task(_monitor_lag(0.01, lags))
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        try:
+            for _ in range(ROUNDS):
+                latencies += await refresh_all()
+        finally:
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            monitor.cancel()
+
+        # Memory is traced in a separate round, tracing slows everything down
+        tracemalloc.start()
+        try:
+            await refresh_all()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    finally:
+        hass.loop.set_debug(debug)
+        for coordinator in coordinators:
+            await coordinator.async_shutdown()
+
+    max_lag = max(lags, default=0.0)
+    print(
+        f"\n{transport:>8} {hosts:>3} hosts: "
+        f"refresh p50 {_percentile(latencies, 50) * 1000:.0f} ms, "
+        f"p95 {_percentile(latencies, 95) * 1000:.0f} ms, "
+        f"max {max(latencies) * 1000:.0f} ms | "
+        f"loop lag max {max_lag * 1000:.1f} ms, "
+        f"p95 {_percentile(lags, 95) * 1000:.1f} ms | "
+        f"CPU {cpu:.2f} s for {wall:.2f} s | "
+        f"peak memory {peak / 1024 / 1024:.1f} MiB"
+    )
+    assert max_lag < MAX_LAG
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("machine", MACHINES)
+async def test_replay_benchmark(hass, tmp_path, machine):
+    """Benchmark refreshes from the captures of a real iLO."""
+    hass.config.config_dir = str(tmp_path)
+    (tmp_path / CAPTURE_DIR).symlink_to(CORPUS)
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={**MOCK_CONFIG_FULL, "host": machine},
+        options={CONF_TRANSPORT: TRANSPORT_REPLAY},
+    )
+    entry.add_to_hass(hass)
+    coordinator = HpIloDataUpdateCoordinator(hass, entry)
+    debug = hass.loop.get_debug()
+    hass.loop.set_debug(False)
+    latencies = []
+    try:
+        for _ in range(REPLAY_ROUNDS):
+            latencies.append(await _timed_refresh(coordinator))
+            assert coordinator.last_update_success
+    finally:
+        hass.loop.set_debug(debug)
+        await coordinator.async_shutdown()
+
+    summary = coordinator.transport.stats.summary(OPERATION_FETCH)
+    print(
+        f"\n{machine}: refresh p50 {_percentile(latencies, 50) * 1000:.1f} ms, "
+        f"max {max(latencies) * 1000:.1f} ms | "
+        f"parse p50 {summary['parse_time']['p50'] * 1000:.1f} ms | "
+        f"response {summary['bytes_received']['max'] / 1024:.0f} KiB"
+    )
@@ -0,0 +1,77 @@
+"""Test the serialization of refreshes and commands."""
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from custom_components.hp_ilo.commands import HpIloCommandQueue
+
+
+@pytest.fixture(name="transport")
+def transport_fixture():
+    """Return a transport whose requests wait for the test to release them."""
+    transport = MagicMock(host="192.168.1.100")
+    transport.release = asyncio.Event()
+    transport.sent = []
+
+    async def request(name, *args):
+        transport.sent.append((name, *args))
+        await transport.release.wait()
+        return name
+
+    async def fetch(methods, unsupported=None):
+        return await request("fetch")
+
+    transport.async_fetch = AsyncMock(side_effect=fetch)
+    transport.async_call = AsyncMock(side_effect=request)
+    return transport
+
+
+@pytest.mark.asyncio
+async def test_command_waits_for_refresh(hass, transport):
+    """Test that a command isn't sent while a refresh is in flight."""
+    queue = HpIloCommandQueue(hass, transport)
+    fetch = hass.async_create_task(queue.async_fetch(["get_host_power_status"]))
+    command = hass.async_create_task(queue.async_command("press_pwr_btn"))
+    await asyncio.sleep(0)
+    assert transport.sent == [("fetch",)]
+
+    transport.release.set()
+    assert await fetch == "fetch"
+    assert await command == "press_pwr_btn"
+    assert transport.sent == [("fetch",), ("press_pwr_btn",)]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_commands_are_merged(hass, transport):
+    """Test that a pending command is sent once for all callers."""
+    queue = HpIloCommandQueue(hass, transport)
+    presses = [
+        hass.async_create_task(queue.async_command("press_pwr_btn"))
+        for _ in range(3)
+    ]
+    power_on = hass.async_create_task(queue.async_command("set_host_power", True))
+    await asyncio.sleep(0)
+
+    transport.release.set()
+    assert await asyncio.gather(*presses) == ["press_pwr_btn"] * 3
+    await power_on
+    assert transport.sent == [("press_pwr_btn",), ("set_host_power", True)]
+
+    # Once done, the command is sent again
+    await queue.async_command("press_pwr_btn")
+    assert transport.async_call.call_count == 3
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_abort_command(hass, transport):
+    """Test that a command is still sent when its caller is cancelled."""
+    queue = HpIloCommandQueue(hass, transport)
+    caller = hass.async_create_task(queue.async_command("hold_pwr_btn"))
+    await asyncio.sleep(0)
+    caller.cancel()
+    transport.release.set()
+    await hass.async_block_till_done()
+
+    assert caller.cancelled()
+    assert transport.sent == [("hold_pwr_btn",)]
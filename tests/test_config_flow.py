@@ -2,11 +2,18 @@
 from unittest.mock import patch
 
 from homeassistant import config_entries, data_entry_flow
-from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_USERNAME
+from homeassistant.const import CONF_HOST, CONF_PASSWORD, CONF_PORT, CONF_USERNAME
+from homeassistant.helpers.service_info.ssdp import (
+    ATTR_UPNP_FRIENDLY_NAME,
+    ATTR_UPNP_MODEL_NAME,
+    SsdpServiceInfo,
+)
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.hp_ilo.probe import HpIloIdentity
 from custom_components.hp_ilo.sensor import DOMAIN
+from custom_components.hp_ilo.transport import CONF_TRANSPORT, TRANSPORT_REPLAY
 
 from .const import (
     MOCK_CONFIG_AUTH_INPUT,
@@ -153,3 +160,61 @@ async def test_duplicate_entry(hass, mock_hpilo):
     # Should abort due to duplicate
     assert result["type"] == data_entry_flow.FlowResultType.ABORT
     assert result["reason"] == "already_configured"
+
+
+@pytest.mark.asyncio
+async def test_discovered_identity_is_dropped_for_edited_host(hass, mock_hpilo):
+    """Test that the identity is probed again when the host is edited."""
+    probed = []
+
+    async def probe(hass, host, port):
+        probed.append(host)
+        return HpIloIdentity(serial_number="ABC123DEF456")
+
+    with patch("custom_components.hp_ilo.config_flow.async_probe", probe):
+        result = await hass.config_entries.flow.async_init(
+            DOMAIN,
+            context={"source": config_entries.SOURCE_SSDP},
+            data=SsdpServiceInfo(
+                ssdp_usn="mock_usn",
+                ssdp_st="mock_st",
+                ssdp_location="https://192.168.1.100:443/upnp/BasicDevice.xml",
+                ssdp_server="HP-iLO-Server/1.0",
+                ssdp_udn="uuid:mock",
+                upnp={
+                    ATTR_UPNP_FRIENDLY_NAME: "TESTSERVER",
+                    ATTR_UPNP_MODEL_NAME: "ProLiant DL360 Gen10",
+                },
+            ),
+        )
+        assert result["step_id"] == "confirm"
+
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], user_input={CONF_HOST: "192.168.1.101", CONF_PORT: 443}
+        )
+        assert result["step_id"] == "auth"
+        result = await hass.config_entries.flow.async_configure(
+            result["flow_id"], user_input=MOCK_CONFIG_AUTH_INPUT
+        )
+
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert result["data"][CONF_HOST] == "192.168.1.101"
+    assert probed == ["192.168.1.100", "192.168.1.101"]
+    # The serial number is known, only the credentials were verified
+    mock_hpilo.get_fw_version.assert_called_once()
+    mock_hpilo.get_host_data.assert_not_called()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("advanced", [False, True])
+async def test_replay_is_only_offered_in_advanced_mode(hass, advanced):
+    """Test that replaying captures isn't offered to regular users."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG_FULL)
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(
+        entry.entry_id, context={"show_advanced_options": advanced}
+    )
+
+    transports = result["data_schema"].schema[CONF_TRANSPORT].container
+    assert (TRANSPORT_REPLAY in transports) is advanced
@@ -0,0 +1,585 @@
+"""Test hp_ilo coordinator."""
+from unittest.mock import patch
+
+import hpilo
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.helpers.device_registry import DeviceInfo
+from homeassistant.util import dt as dt_util
+
+from custom_components.hp_ilo.breaker import STATE_CLOSED, STATE_OPEN
+from custom_components.hp_ilo.button import (
+    HpIloPowerButton,
+    HpIloPowerButtonHold,
+    HpIloResetButton,
+)
+from custom_components.hp_ilo.capabilities import firmware_key
+from custom_components.hp_ilo.coordinator import (
+    PHASE_TOLERANCE,
+    SUBSCRIPTIONS,
+    TIER_HEALTH,
+    TIER_POWER,
+    TIER_STATIC,
+    UPDATE_INTERVAL,
+    HpIloDataUpdateCoordinator,
+)
+from custom_components.hp_ilo.health import index_storage
+from custom_components.hp_ilo.sensor import DOMAIN
+from custom_components.hp_ilo.transport import TRANSPORT_EXECUTOR, TRANSPORT_REDFISH
+
+from .const import (
+    MOCK_CONFIG_FULL,
+    MOCK_ILO_EMBEDDED_HEALTH,
+    MOCK_ILO_FW_VERSION,
+    MOCK_ILO_POWER_ON_TIME,
+    MOCK_ILO_POWER_STATUS,
+    MOCK_ILO_SERVER_NAME,
+)
+
+
+async def _refresh_all_tiers(coordinator):
+    """Refresh all tiers right away, bypassing the request debouncer."""
+    coordinator._tier_due = dict.fromkeys(coordinator._tier_due, 0.0)
+    await coordinator.async_refresh()
+
+
+@pytest.fixture(name="coordinator")
+async def coordinator_fixture(hass):
+    """Return a coordinator for a mock config entry."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_CONFIG_FULL,
+        unique_id="192.168.1.100",
+    )
+    entry.add_to_hass(hass)
+    coordinator = HpIloDataUpdateCoordinator(hass, entry)
+    # Subscribe to everything, like enabled entities
+    unsubs = [
+        coordinator.async_add_listener(lambda: None, context)
+        for context in SUBSCRIPTIONS
+    ]
+    yield coordinator
+    for unsub in unsubs:
+        unsub()
+    await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_fetch_is_batched(hass, mock_hpilo, coordinator):
+    """Test that all queries of a cycle are sent as a single request."""
+    await coordinator.async_refresh()
+    data = coordinator.data
+
+    assert mock_hpilo.call_delayed.call_count == 1
+    assert data.health_available
+    assert data.temperatures["02-CPU 1"].value == 40
+    assert data.power_status == MOCK_ILO_POWER_STATUS
+    assert data.power_on_time == MOCK_ILO_POWER_ON_TIME
+    assert data.server_name == MOCK_ILO_SERVER_NAME
+
+
+@pytest.mark.asyncio
+async def test_data_is_a_compact_snapshot(hass, mock_hpilo, coordinator):
+    """Test that only what the entities read is kept of the raw results."""
+    await coordinator.async_refresh()
+    data = coordinator.data
+
+    assert not hasattr(data, "__dict__")
+    assert not hasattr(data, "health")
+    assert not hasattr(data, "host_data")
+    assert data.firmware == MOCK_ILO_EMBEDDED_HEALTH["firmware_information"]
+
+
+@pytest.mark.asyncio
+async def test_fetch_falls_back_to_individual_calls(hass, mock_hpilo, coordinator):
+    """Test that an unsupported call only drops its own field."""
+    mock_hpilo.call_delayed.side_effect = hpilo.IloFeatureNotSupported("nope")
+    mock_hpilo.get_server_power_on_time.side_effect = hpilo.IloFeatureNotSupported(
+        "nope"
+    )
+
+    await coordinator.async_refresh()
+    data = coordinator.data
+
+    assert data.power_on_time is None
+    assert data.power_status == MOCK_ILO_POWER_STATUS
+    assert data.health_available
+
+
+@pytest.mark.asyncio
+async def test_fetch_does_not_retry_unreachable_host(hass, mock_hpilo, coordinator):
+    """Test that communication errors are not retried call by call."""
+    mock_hpilo.call_delayed.side_effect = hpilo.IloCommunicationError("down")
+
+    await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+
+    mock_hpilo.get_host_power_status.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_tiers_refresh_on_their_own_cadence(hass, mock_hpilo, coordinator):
+    """Test that only due tiers are fetched and the rest is carried over."""
+    await coordinator.async_refresh()
+    assert coordinator.data.server_name == MOCK_ILO_SERVER_NAME
+    assert mock_hpilo.get_embedded_health.call_count == 1
+
+    # Next tick: only the fast power tier is due
+    assert coordinator.due_tiers == []
+    coordinator._tier_due[TIER_POWER] = 0.0
+    mock_hpilo.get_host_power_status.return_value = "OFF"
+    await coordinator.async_refresh()
+
+    assert coordinator.data.power_status == "OFF"
+    assert coordinator.data.server_name == MOCK_ILO_SERVER_NAME
+    assert coordinator.data.temperatures["02-CPU 1"].value == 40
+    assert mock_hpilo.get_embedded_health.call_count == 1
+    assert mock_hpilo.get_host_data.call_count == 1
+
+    # On demand refresh of the static inventory
+    await coordinator.async_refresh_tiers(TIER_STATIC)
+    assert mock_hpilo.get_host_data.call_count == 2
+    assert mock_hpilo.get_embedded_health.call_count == 1
+    assert TIER_HEALTH not in coordinator.due_tiers
+
+
+
+@pytest.mark.asyncio
+async def test_health_readings_are_indexed_by_label(hass, mock_hpilo, coordinator):
+    """Test that readings are unwrapped and keyed by label."""
+    await coordinator.async_refresh()
+    data = coordinator.data
+
+    cpu = data.temperatures["02-CPU 1"]
+    assert cpu.value == 40
+    assert cpu.unit == "Celsius"
+    assert cpu.caution == 70
+    assert cpu.critical is None
+    assert data.fans["Fan 2"].value == 18
+    assert data.fans["Fan 2"].status == "OK"
+
+
+def test_storage_labels_are_stable():
+    """Test that drive labels don't depend on the other drives."""
+
+    def health(*controllers):
+        return {
+            "storage": [
+                {
+                    "label": label,
+                    "status": "OK",
+                    "logical_drives": [
+                        {
+                            "label": "01",
+                            "status": "OK",
+                            "physical_drives": [
+                                {"label": f"Port 1I Box 1 Bay {bay}", "status": "OK"}
+                                for bay in bays
+                            ],
+                        }
+                    ],
+                }
+                for label, bays in controllers
+            ]
+        }
+
+    single = index_storage(health(("Slot 1", [1, 2])))
+    assert "Port 1I Box 1 Bay 2" in single
+
+    labels = set(index_storage(health(("Slot 1", [1, 2]), ("Slot 2", [1, 2]))))
+    assert {"Slot 1 Port 1I Box 1 Bay 2", "Slot 2 Port 1I Box 1 Bay 1"} <= labels
+    # Reordered and removed drives don't rename the others
+    assert {"Slot 1 Port 1I Box 1 Bay 2", "Slot 2 Port 1I Box 1 Bay 1"} <= set(
+        index_storage(health(("Slot 2", [1]), ("Slot 1", [2, 1])))
+    )
+
+
+@pytest.mark.asyncio
+async def test_only_changed_listeners_are_updated(hass, mock_hpilo, coordinator):
+    """Test that listeners are only notified when their data changed."""
+    await coordinator.async_refresh()
+
+    updates = []
+    unsubs = [
+        coordinator.async_add_listener(lambda key=key: updates.append(key), key)
+        for key in ("power_status", "power_on_time", ("temperatures", "02-CPU 1"))
+    ]
+
+    # Nothing changed
+    coordinator._tier_due[TIER_HEALTH] = 0.0
+    await coordinator.async_refresh()
+    assert updates == []
+
+    # Only the power status changed
+    mock_hpilo.get_host_power_status.return_value = "OFF"
+    coordinator._tier_due[TIER_POWER] = 0.0
+    await coordinator.async_refresh()
+    assert updates == ["power_status"]
+
+    # Availability changes update everyone
+    updates.clear()
+    mock_hpilo.call_delayed.side_effect = hpilo.IloCommunicationError("down")
+    coordinator._tier_due[TIER_POWER] = 0.0
+    await coordinator.async_refresh()
+    assert len(updates) == 3
+
+    for unsub in unsubs:
+        unsub()
+
+
+@pytest.mark.asyncio
+async def test_layout_is_discovered_and_stored(hass, mock_hpilo, coordinator):
+    """Test that the layout is stored and a changed layout reloads the entry."""
+    await coordinator.async_load_layout()
+    assert coordinator.layout is None
+
+    await coordinator.async_refresh()
+    layout = coordinator.layout
+    assert "02-CPU 1" in layout.temperatures
+    assert "Fan 2" in layout.fans
+    assert layout.power_status and layout.power_on_time
+    assert "bios_hardware" in layout.subsystems
+    assert layout.power_supplies == ["Power Supply 1", "Power Supply 2"]
+    assert "Port 1I Box 1 Bay 1" in layout.storage
+    assert layout.dimms == ["CPU 1 DIMM 1"]
+    assert layout.memory_size
+    assert layout.sw_version == MOCK_ILO_EMBEDDED_HEALTH["firmware_information"]["iLO"]
+
+    await coordinator.store.async_save()
+    reloaded = HpIloDataUpdateCoordinator(hass, coordinator.config_entry)
+    await reloaded.async_load_layout()
+    assert reloaded.layout == layout
+    await reloaded.async_shutdown()
+
+    # A failed health fetch keeps the known sensors
+    mock_hpilo.get_embedded_health.side_effect = hpilo.IloError("busy")
+    mock_hpilo.call_delayed.side_effect = hpilo.IloError("busy")
+    coordinator._tier_due[TIER_HEALTH] = 0.0
+    with patch.object(
+        hass.config_entries, "async_schedule_reload"
+    ) as mock_reload:
+        await coordinator.async_refresh()
+    assert coordinator.layout == layout
+    mock_reload.assert_not_called()
+
+    # A removed fan reloads the entry to drop its entity
+    health = dict(MOCK_ILO_EMBEDDED_HEALTH)
+    health["fans"] = {}
+    mock_hpilo.get_embedded_health.side_effect = None
+    mock_hpilo.get_embedded_health.return_value = health
+    coordinator._tier_due[TIER_HEALTH] = 0.0
+    with patch.object(
+        hass.config_entries, "async_schedule_reload"
+    ) as mock_reload:
+        await coordinator.async_refresh()
+    assert coordinator.layout.fans == []
+    mock_reload.assert_called_once_with(coordinator.config_entry.entry_id)
+
+
+@pytest.mark.asyncio
+async def test_unsupported_calls_are_skipped(hass, mock_hpilo, coordinator):
+    """Test that unsupported calls are skipped until the firmware changes."""
+    mock_hpilo.get_server_power_on_time.side_effect = hpilo.IloFeatureNotSupported(
+        "nope"
+    )
+    await coordinator.async_refresh()
+    assert coordinator.capabilities.unsupported == {"get_server_power_on_time"}
+    assert mock_hpilo.get_server_power_on_time.call_count == 2
+
+    # Skipped on the next cycles, so the batch is no longer rejected
+    await _refresh_all_tiers(coordinator)
+    assert mock_hpilo.get_server_power_on_time.call_count == 2
+    mock_hpilo.call_delayed.assert_called_once()
+    assert coordinator.data.temperatures["02-CPU 1"].value == 40
+
+    # Probed again after a firmware upgrade
+    mock_hpilo.get_fw_version.return_value = {
+        **MOCK_ILO_FW_VERSION,
+        "firmware_version": "2.80",
+    }
+    await _refresh_all_tiers(coordinator)
+    assert coordinator.capabilities.unsupported == set()
+    await _refresh_all_tiers(coordinator)
+    assert mock_hpilo.get_server_power_on_time.call_count == 4
+    assert coordinator.capabilities.unsupported == {"get_server_power_on_time"}
+
+
+
+@pytest.mark.asyncio
+async def test_firmware_version_is_never_skipped(hass, mock_hpilo, coordinator):
+    """Test that an unsupported get_fw_version doesn't stop the probing."""
+    coordinator.store.async_set(
+        "capabilities",
+        {
+            "firmware": firmware_key(TRANSPORT_EXECUTOR, MOCK_ILO_FW_VERSION),
+            "unsupported": ["get_embedded_health", "get_fw_version"],
+        },
+    )
+    coordinator.capabilities.async_load()
+    await coordinator.async_refresh()
+    assert mock_hpilo.get_fw_version.call_count == 1
+    mock_hpilo.get_embedded_health.assert_not_called()
+
+    # Probed again after a firmware upgrade
+    mock_hpilo.get_fw_version.return_value = {
+        **MOCK_ILO_FW_VERSION,
+        "firmware_version": "2.80",
+    }
+    with patch.object(hass.config_entries, "async_schedule_reload"):
+        await _refresh_all_tiers(coordinator)
+    assert coordinator.capabilities.unsupported == set()
+    with patch.object(hass.config_entries, "async_schedule_reload"):
+        await _refresh_all_tiers(coordinator)
+    mock_hpilo.get_embedded_health.assert_called_once()
+    assert coordinator.data.temperatures["02-CPU 1"].value == 40
+
+    # A rejected get_fw_version isn't recorded
+    mock_hpilo.call_delayed.side_effect = hpilo.IloError("nope")
+    mock_hpilo.get_fw_version.side_effect = hpilo.IloFeatureNotSupported("nope")
+    await _refresh_all_tiers(coordinator)
+    assert coordinator.capabilities.unsupported == set()
+
+
+@pytest.mark.asyncio
+async def test_unsupported_calls_of_another_transport_are_dropped(
+    hass, mock_hpilo, coordinator
+):
+    """Test that calls recorded with another transport are probed again."""
+    coordinator.store.async_set(
+        "capabilities",
+        {
+            "firmware": firmware_key(TRANSPORT_REDFISH, MOCK_ILO_FW_VERSION),
+            "unsupported": ["get_embedded_health"],
+        },
+    )
+    coordinator.capabilities.async_load()
+    assert coordinator.capabilities.unsupported == set()
+
+    await coordinator.async_refresh()
+    mock_hpilo.get_embedded_health.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_fallback_stops_at_communication_error(hass, mock_hpilo, coordinator):
+    """Test that the individual calls stop at the first communication error."""
+    mock_hpilo.call_delayed.side_effect = hpilo.IloFeatureNotSupported("nope")
+    # Queued fine for the batch, fails when called on its own
+    mock_hpilo.get_server_name.side_effect = [
+        None,
+        hpilo.IloCommunicationError("down"),
+    ]
+
+    await coordinator.async_refresh()
+
+    assert not coordinator.last_update_success
+    mock_hpilo.get_host_data.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_unreachable_host_is_backed_off(hass, mock_hpilo, coordinator):
+    """Test that the breaker skips polling and probes before resuming."""
+    mock_hpilo.call_delayed.side_effect = hpilo.IloCommunicationError("down")
+    await coordinator.async_refresh()
+    assert coordinator.breaker.state == STATE_OPEN
+    assert mock_hpilo.call_delayed.call_count == 1
+
+    # While open, refreshes fail without talking to the iLO
+    await _refresh_all_tiers(coordinator)
+    assert not coordinator.last_update_success
+    assert mock_hpilo.call_delayed.call_count == 1
+
+    # After the backoff the host is probed first
+    coordinator.breaker._open_until = 0.0
+    with patch(
+        "custom_components.hp_ilo.coordinator.async_probe",
+        side_effect=hpilo.IloCommunicationError("down"),
+    ) as mock_probe:
+        await _refresh_all_tiers(coordinator)
+    mock_probe.assert_called_once()
+    assert coordinator.breaker.failures == 2
+    assert mock_hpilo.call_delayed.call_count == 1
+
+    # A successful probe resumes polling
+    coordinator.breaker._open_until = 0.0
+    mock_hpilo.call_delayed.side_effect = None
+    mock_hpilo.call_delayed.return_value = [None] * 8
+    with patch("custom_components.hp_ilo.coordinator.async_probe", return_value=None):
+        await _refresh_all_tiers(coordinator)
+    assert coordinator.last_update_success
+    assert coordinator.breaker.state == STATE_CLOSED
+
+
+@pytest.mark.asyncio
+async def test_power_follow_up(hass, mock_hpilo, coordinator):
+    """Test that only the power state is polled until it is the target."""
+    await coordinator.async_refresh()
+    assert coordinator.data.power_status == "ON"
+    mock_hpilo.get_embedded_health.reset_mock()
+
+    # The server reacts after the second poll
+    polls = []
+    call_delayed = mock_hpilo.call_delayed.side_effect
+
+    def delayed_power_off():
+        polls.append(mock_hpilo.get_host_power_status.call_count)
+        if len(polls) == 2:
+            mock_hpilo.get_host_power_status.return_value = "OFF"
+        return call_delayed()
+
+    mock_hpilo.call_delayed.side_effect = delayed_power_off
+    with patch(
+        "custom_components.hp_ilo.coordinator.FOLLOW_UP_DELAYS", (0.01,) * 5
+    ):
+        coordinator.async_follow_power("OFF")
+        await coordinator._follow_up
+
+    assert coordinator.data.power_status == "OFF"
+    assert len(polls) == 2
+    mock_hpilo.get_embedded_health.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_power_follow_up_gives_up(hass, mock_hpilo, coordinator):
+    """Test that the follow-up stops after its last poll."""
+    await coordinator.async_refresh()
+    with patch(
+        "custom_components.hp_ilo.coordinator.FOLLOW_UP_DELAYS", (0.01,) * 3
+    ):
+        coordinator.async_follow_power("OFF")
+        await coordinator._follow_up
+
+    assert mock_hpilo.call_delayed.call_count == 4
+    assert coordinator.data.power_status == "ON"
+
+
+@pytest.mark.asyncio
+async def test_power_follow_up_in_target_state(hass, mock_hpilo, coordinator):
+    """Test that nothing is polled when the server already is in the state."""
+    await coordinator.async_refresh()
+
+    coordinator.async_follow_power("ON")
+
+    assert coordinator._follow_up is None
+    mock_hpilo.call_delayed.assert_called_once()
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("button", "target"),
+    [
+        (HpIloPowerButton, "OFF"),
+        (HpIloPowerButtonHold, "OFF"),
+        (HpIloResetButton, None),
+    ],
+)
+async def test_power_buttons_follow_their_target(
+    hass, mock_hpilo, coordinator, button, target
+):
+    """Test that the buttons follow the state they send the server to."""
+    await coordinator.async_refresh()
+    entity = button(coordinator, coordinator.config_entry, DeviceInfo())
+
+    with (
+        patch.object(coordinator, "async_follow_power") as mock_follow,
+        patch.object(coordinator, "async_request_refresh") as mock_refresh,
+    ):
+        await entity.async_press()
+
+    if target is None:
+        # A reset leaves the server on, it is refreshed once
+        mock_follow.assert_not_called()
+        mock_refresh.assert_called_once()
+    else:
+        mock_follow.assert_called_once_with(target)
+        mock_refresh.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_power_button_with_unknown_state(hass, mock_hpilo, coordinator):
+    """Test that the power button refreshes once without a state to follow."""
+    entity = HpIloPowerButton(coordinator, coordinator.config_entry, DeviceInfo())
+
+    with (
+        patch.object(coordinator, "async_follow_power") as mock_follow,
+        patch.object(coordinator, "async_request_refresh") as mock_refresh,
+    ):
+        await entity.async_press()
+
+    mock_follow.assert_not_called()
+    mock_refresh.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_only_subscribed_data_is_fetched(hass, mock_hpilo):
+    """Test that data no entity listens to is only fetched at first."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG_FULL)
+    entry.add_to_hass(hass)
+    coordinator = HpIloDataUpdateCoordinator(hass, entry)
+    try:
+        # Everything is fetched until the layout is known
+        await coordinator.async_refresh()
+        mock_hpilo.get_embedded_health.assert_called_once()
+        mock_hpilo.get_server_power_on_time.assert_called_once()
+
+        unsub = coordinator.async_add_listener(lambda: None, ("fans", "Fan 1"))
+        mock_hpilo.reset_mock()
+        await _refresh_all_tiers(coordinator)
+        mock_hpilo.get_embedded_health.assert_called_once()
+        mock_hpilo.get_host_data.assert_called_once()
+        mock_hpilo.get_server_power_on_time.assert_not_called()
+        mock_hpilo.get_host_power_status.assert_not_called()
+        mock_hpilo.get_power_readings.assert_not_called()
+
+        # The last fan sensor was disabled
+        unsub()
+        mock_hpilo.reset_mock()
+        await _refresh_all_tiers(coordinator)
+        mock_hpilo.get_embedded_health.assert_not_called()
+        assert coordinator.data.fans
+    finally:
+        await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_refresh_is_scheduled_on_the_phase(hass, mock_hpilo, coordinator):
+    """Test that a refresh off the phase starts the interval on it again."""
+    interval = UPDATE_INTERVAL.total_seconds()
+    coordinator.update_interval = UPDATE_INTERVAL
+    coordinator._phase = (hass.loop.time() + interval / 4) % interval
+    with patch(
+        "custom_components.hp_ilo.coordinator.async_call_later"
+    ) as mock_call_later:
+        await coordinator.async_refresh()
+    assert coordinator.update_interval is None
+    mock_call_later.assert_called_once()
+    _, delay, start_interval = mock_call_later.call_args[0]
+    now = hass.loop.time()
+    offset = (now + delay - coordinator._phase) % interval
+    assert min(offset, interval - offset) == pytest.approx(0, abs=0.1)
+    assert interval / 2 <= delay <= interval * 1.5
+
+    # On the phase the interval starts with a refresh
+    coordinator._phase = hass.loop.time() % interval
+    mock_hpilo.get_host_power_status.reset_mock()
+    start_interval(dt_util.utcnow())
+    await hass.async_block_till_done()
+    assert coordinator.update_interval == UPDATE_INTERVAL
+    mock_hpilo.get_host_power_status.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_refresh_on_the_phase_keeps_the_interval(hass, mock_hpilo, coordinator):
+    """Test that refreshes close to the phase don't restart the interval."""
+    coordinator.update_interval = UPDATE_INTERVAL
+    coordinator._phase = (hass.loop.time() - PHASE_TOLERANCE / 2) % (
+        UPDATE_INTERVAL.total_seconds()
+    )
+    with patch(
+        "custom_components.hp_ilo.coordinator.async_call_later"
+    ) as mock_call_later:
+        await coordinator.async_refresh()
+
+    assert coordinator.update_interval == UPDATE_INTERVAL
+    mock_call_later.assert_not_called()
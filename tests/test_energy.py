@@ -0,0 +1,125 @@
+"""Test the power readings and the energy integrated from them."""
+from unittest.mock import patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+
+from custom_components.hp_ilo.coordinator import HpIloDataUpdateCoordinator
+from custom_components.hp_ilo.energy import (
+    MAX_GAP,
+    PERSIST_INTERVAL,
+    SAMPLES,
+    HpIloEnergyMeter,
+    index_power_readings,
+    trapezoid,
+)
+from custom_components.hp_ilo.sensor import DOMAIN
+from custom_components.hp_ilo.store import HpIloStore
+
+from .const import MOCK_CONFIG_FULL, MOCK_ILO_POWER_READINGS
+
+
+def test_index_power_readings():
+    """Test that the readings are unwrapped to W."""
+    assert index_power_readings(MOCK_ILO_POWER_READINGS) == {
+        "present": 67,
+        "average": 65,
+        "minimum": 65,
+        "maximum": 101,
+    }
+    assert index_power_readings({"present_power_reading": ("N/A", "Watts")}) == {}
+    assert index_power_readings(None) == {}
+
+
+def test_trapezoid():
+    """Test the trapezoidal sum, skipping gaps."""
+    # 100 W to 200 W over ten minutes is 25 Wh
+    assert trapezoid([(0, 100), (300, 150), (600, 200)]) == pytest.approx(0.025)
+    # Samples too far apart aren't integrated
+    assert trapezoid([(0, 100), (MAX_GAP + 1, 100)]) == 0
+    assert trapezoid([(0, 100)]) == 0
+
+
+@pytest.mark.asyncio
+async def test_energy_meter_settles_and_persists(hass):
+    """Test that samples leaving the ring buffer keep their energy."""
+    store = HpIloStore(hass, "test")
+    meter = HpIloEnergyMeter(store)
+    with patch.object(store, "async_set", wraps=store.async_set) as mock_set:
+        for index in range(SAMPLES * 2):
+            meter.async_add(index * 36.0, 100)
+    # Every 36 s at 100 W is 1 Wh
+    assert len(meter.samples) == SAMPLES
+    assert meter.total == pytest.approx((SAMPLES * 2 - 1) / 1000)
+    # Stored with the first sample and then every PERSIST_INTERVAL
+    assert mock_set.call_count == 1 + (SAMPLES * 2 - 1) * 36 // PERSIST_INTERVAL
+
+    # Samples that aren't newer are ignored
+    meter.async_add(0, 1000)
+    assert meter.total == pytest.approx((SAMPLES * 2 - 1) / 1000)
+
+    # On shutdown
+    meter.async_persist()
+    await store.async_save()
+    reloaded_store = HpIloStore(hass, "test")
+    await reloaded_store.async_load()
+    reloaded = HpIloEnergyMeter(reloaded_store)
+    reloaded.async_load()
+    assert reloaded.total == pytest.approx(meter.total)
+    # Integrated on from the last sample
+    reloaded.async_add(SAMPLES * 2 * 36.0, 100)
+    assert reloaded.total == pytest.approx(SAMPLES * 2 / 1000)
+
+
+@pytest.mark.asyncio
+async def test_coordinator_integrates_power(hass, mock_hpilo):
+    """Test that every power refresh adds a sample to the energy."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG_FULL)
+    entry.add_to_hass(hass)
+    coordinator = HpIloDataUpdateCoordinator(hass, entry)
+    coordinator.async_add_listener(lambda: None, "energy")
+    try:
+        with patch("custom_components.hp_ilo.coordinator.time", return_value=0):
+            await coordinator.async_refresh()
+        assert coordinator.data.power["present"] == 67
+        assert coordinator.data.energy == 0
+        assert coordinator.layout.power_readings
+
+        mock_hpilo.get_power_readings.return_value = {
+            **MOCK_ILO_POWER_READINGS,
+            "present_power_reading": (133, "Watts"),
+        }
+        with patch("custom_components.hp_ilo.coordinator.time", return_value=36):
+            await coordinator.async_refresh()
+        # (67 W + 133 W) / 2 for 36 s is 1 Wh
+        assert coordinator.data.energy == pytest.approx(0.001)
+    finally:
+        await coordinator.async_shutdown()
+
+
+@pytest.mark.asyncio
+async def test_energy_is_stored_when_home_assistant_stops(hass, mock_hpilo):
+    """Test that the energy is stored although the entry isn't unloaded."""
+    entry = MockConfigEntry(domain=DOMAIN, data=MOCK_CONFIG_FULL)
+    entry.add_to_hass(hass)
+    coordinator = HpIloDataUpdateCoordinator(hass, entry)
+    coordinator.async_add_listener(lambda: None, "energy")
+    try:
+        for timestamp in (0, 36):
+            with patch(
+                "custom_components.hp_ilo.coordinator.time", return_value=timestamp
+            ):
+                await coordinator.async_refresh()
+        # Only the first sample was stored so far
+        assert coordinator.store.async_get("energy")["samples"] == [[0, 67]]
+
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+        await hass.async_block_till_done()
+
+        stored = coordinator.store.async_get("energy")
+        assert stored["samples"] == [[36, 67]]
+        assert stored["settled"] == pytest.approx(coordinator.data.energy)
+    finally:
+        await coordinator.async_shutdown()
@@ -0,0 +1,101 @@
+"""Test the ingestion of the iLO event logs."""
+import pytest
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_capture_events,
+)
+
+from custom_components.hp_ilo.coordinator import (
+    TIER_EVENTS,
+    HpIloDataUpdateCoordinator,
+)
+from custom_components.hp_ilo.events import EVENT_HP_ILO, fingerprint, new_entries
+from custom_components.hp_ilo.sensor import DOMAIN
+
+from .const import MOCK_CONFIG_FULL, MOCK_ILO_SERVER_EVENT_LOG
+
+NEW_EVENT = {
+    "severity": "Critical",
+    "class": "POST Message",
+    "last_update": "02/04/2020 11:00",
+    "initial_update": "02/04/2020 11:00",
+    "count": 1,
+    "description": "POST Error: 1785-Drive Array not Configured",
+}
+
+
+def _cursor(entries):
+    """Return the cursor after the entries."""
+    return {
+        "count": len(entries),
+        "last": fingerprint(entries[-1]) if entries else None,
+    }
+
+
+def test_new_entries():
+    """Test finding the entries after the cursor."""
+    log = [*MOCK_ILO_SERVER_EVENT_LOG, NEW_EVENT]
+    cursor = _cursor(MOCK_ILO_SERVER_EVENT_LOG)
+
+    # The log grew
+    assert new_entries(log, cursor) == [NEW_EVENT]
+    # Nothing new, a repeat only updates the count of an entry
+    repeated = {**MOCK_ILO_SERVER_EVENT_LOG[1], "count": 4}
+    assert new_entries([MOCK_ILO_SERVER_EVENT_LOG[0], repeated], cursor) == []
+    # The oldest entry was dropped from the full log
+    assert new_entries(log[1:], cursor) == [NEW_EVENT]
+    # The log was cleared
+    assert new_entries([NEW_EVENT], cursor) == [NEW_EVENT]
+    # The log was empty
+    assert new_entries(log, _cursor([])) == log
+
+
+async def _create_coordinator(hass, entry):
+    """Return a coordinator with its stored state loaded."""
+    coordinator = HpIloDataUpdateCoordinator(hass, entry)
+    await coordinator.async_load_layout()
+    return coordinator
+
+
+@pytest.mark.asyncio
+async def test_new_entries_are_fired(hass, mock_hpilo):
+    """Test that only entries added after the first poll are fired, once."""
+    entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG_FULL, unique_id="192.168.1.100"
+    )
+    entry.add_to_hass(hass)
+    events = async_capture_events(hass, EVENT_HP_ILO)
+
+    coordinator = await _create_coordinator(hass, entry)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    # The entries that were already there aren't fired
+    assert events == []
+
+    mock_hpilo.get_server_event_log.return_value = [
+        *MOCK_ILO_SERVER_EVENT_LOG,
+        NEW_EVENT,
+    ]
+    # Only polled on the events tier
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert events == []
+
+    coordinator.async_mark_due(TIER_EVENTS)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    assert len(events) == 1
+    assert events[0].data == {
+        "config_entry_id": entry.entry_id,
+        "host": MOCK_CONFIG_FULL["host"],
+        "log": "server",
+        **NEW_EVENT,
+    }
+    await coordinator.async_shutdown()
+
+    # The cursor survives a restart
+    coordinator = await _create_coordinator(hass, entry)
+    await coordinator.async_refresh()
+    await hass.async_block_till_done()
+    await coordinator.async_shutdown()
+    assert len(events) == 1
@@ -0,0 +1,55 @@
+"""Test hp_ilo fleet scheduling."""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from custom_components.hp_ilo.fleet import HpIloFleet
+
+
+@pytest.mark.asyncio
+async def test_phases_are_spread_and_stable(hass):
+    """Test that hosts get distinct phases which survive a reload."""
+    fleet = HpIloFleet(hass)
+    phases = [fleet.async_register(f"entry_{i}") for i in range(5)]
+
+    assert len(set(phases)) == 5
+    assert all(0 <= phase < 1 for phase in phases)
+
+    await fleet.async_unregister("entry_2")
+    assert fleet.async_register("entry_2") == phases[2]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_per_pool_and_host(hass):
+    """Test that the pool size and one job per host are enforced."""
+    fleet = HpIloFleet(hass, max_workers=2)
+    lock = threading.Lock()
+    running = {"total": 0, "max": 0, "entry_0": 0, "max_entry_0": 0}
+
+    def job(entry_id):
+        with lock:
+            running["total"] += 1
+            running["max"] = max(running["max"], running["total"])
+            if entry_id == "entry_0":
+                running["entry_0"] += 1
+                running["max_entry_0"] = max(
+                    running["max_entry_0"], running["entry_0"]
+                )
+        time.sleep(0.02)
+        with lock:
+            running["total"] -= 1
+            if entry_id == "entry_0":
+                running["entry_0"] -= 1
+
+    entries = [f"entry_{i}" for i in range(4)] + ["entry_0"] * 3
+    for entry_id in set(entries):
+        fleet.async_register(entry_id)
+    await asyncio.gather(*(fleet.async_run(entry, job, entry) for entry in entries))
+
+    assert running["max"] == 2
+    assert running["max_entry_0"] == 1
+
+    for entry_id in set(entries):
+        await fleet.async_unregister(entry_id)
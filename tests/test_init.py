@@ -1,6 +1,8 @@
 """Test hp_ilo init."""
 from unittest.mock import patch
 
+import hpilo
+
 import pytest
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 from homeassistant.const import Platform
@@ -62,3 +64,76 @@ async def test_setup_creates_domain_entry(hass, mock_hpilo):
     assert DOMAIN in hass.data
     assert config_entry.entry_id in hass.data[DOMAIN]
     assert config_entry.state.value == "loaded"
+
+
+@pytest.mark.asyncio
+async def test_setup_from_stored_layout(hass, mock_hpilo):
+    """Test that a stored layout creates the entities without waiting for the iLO."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_CONFIG_FULL,
+        unique_id="192.168.1.100",
+    )
+    config_entry.add_to_hass(hass)
+
+    # The first setup discovers and stores the layout
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    assert await hass.config_entries.async_unload(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    # The iLO is unreachable on the next start
+    mock_hpilo.call_delayed.side_effect = hpilo.IloCommunicationError("down")
+
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    assert config_entry.state.value == "loaded"
+    assert hass.states.get("binary_sensor.server_power") is not None
+
+    # The initial data is fetched in the background
+    await hass.async_block_till_done(wait_background_tasks=True)
+    state = hass.states.get("binary_sensor.server_power")
+    assert state is not None
+    assert state.state == "unavailable"
+
+
+@pytest.mark.asyncio
+async def test_health_entities(hass, mock_hpilo):
+    """Test the problem sensors and memory size from the health data."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_CONFIG_FULL,
+        unique_id="192.168.1.100",
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("binary_sensor.storage_health").state == "off"
+    assert hass.states.get("binary_sensor.network_health").state == "off"
+    assert hass.states.get("binary_sensor.power_supply_1").state == "off"
+    drive = hass.states.get("binary_sensor.port_1i_box_1_bay_2")
+    assert drive.state == "on"
+    assert drive.attributes["status"] == "Rebuilding"
+    assert drive.attributes["capacity"] == "558 GB"
+    # Memory modules are disabled by default
+    assert hass.states.get("binary_sensor.cpu_1_dimm_1") is None
+    assert float(hass.states.get("sensor.memory_size").state) == 32
+
+
+@pytest.mark.asyncio
+async def test_power_entities(hass, mock_hpilo):
+    """Test the power readings and energy sensors."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data=MOCK_CONFIG_FULL,
+        unique_id="192.168.1.100",
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.power").state == "67"
+    assert hass.states.get("sensor.power_maximum").state == "101"
+    energy = hass.states.get("sensor.energy")
+    assert float(energy.state) == 0
+    assert energy.attributes["state_class"] == "total_increasing"
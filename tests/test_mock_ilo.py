@@ -0,0 +1,151 @@
+"""Test the transports end to end against the local mock iLO."""
+from unittest.mock import Mock, patch
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.hp_ilo.coordinator import SNAPSHOTS, HpIloDataUpdateCoordinator
+from custom_components.hp_ilo.fleet import CONF_PARSE_PROCESSES
+from custom_components.hp_ilo.health import HpIloHealth
+from custom_components.hp_ilo.sensor import DOMAIN
+from custom_components.hp_ilo.stats import OPERATION_FETCH
+from custom_components.hp_ilo.transport import (
+    CONF_TRANSPORT,
+    TRANSPORT_ASYNC,
+    TRANSPORT_EXECUTOR,
+)
+
+from .const import (
+    MOCK_CONFIG_FULL,
+    MOCK_ILO_FW_VERSION,
+    MOCK_ILO_POWER_ON_TIME,
+    MOCK_ILO_POWER_STATUS,
+    MOCK_ILO_SERVER_NAME,
+)
+
+
+def create_coordinator(hass, server, transport, index=0, **options):
+    """Return a coordinator for an entry pointing at the mock iLO."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            **MOCK_CONFIG_FULL,
+            "host": "127.0.0.1",
+            "port": server.port,
+            "unique_id": f"mock-ilo-{index}",
+        },
+        options={CONF_TRANSPORT: transport, **options},
+        unique_id=f"mock-ilo-{index}",
+    )
+    entry.add_to_hass(hass)
+    return HpIloDataUpdateCoordinator(hass, entry)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("transport", [TRANSPORT_EXECUTOR, TRANSPORT_ASYNC])
+async def test_refresh(hass, mock_ilo_server, transport):
+    """Test a full refresh over HTTPS in a single request."""
+    mock_ilo_server.settings.extra_temperatures = 10
+    coordinator = create_coordinator(hass, mock_ilo_server, transport)
+    try:
+        await coordinator.async_refresh()
+    finally:
+        await coordinator.async_shutdown()
+
+    assert coordinator.last_update_success
+    data = coordinator.data
+    assert data.power_status == MOCK_ILO_POWER_STATUS
+    assert data.power_on_time == MOCK_ILO_POWER_ON_TIME
+    assert data.server_name == MOCK_ILO_SERVER_NAME
+    assert data.fw_version == MOCK_ILO_FW_VERSION
+    assert data.temperatures["02-CPU 1"].value == 40
+    assert len(data.temperatures) == 12
+    assert data.storage["Controller on System Board Logical Drive 01"].problem
+    assert data.storage["Port 1I Box 1 Bay 2"].status == "Rebuilding"
+    assert not data.power_supplies["Power Supply 1"].problem
+    assert list(data.dimms) == ["CPU 1 DIMM 1"]
+    assert data.memory_size == 32
+    assert data.power == {"present": 67, "average": 65, "minimum": 65, "maximum": 101}
+    assert coordinator.layout.model == "ProLiant DL360 Gen10"
+    assert mock_ilo_server.commands.count("GET_EMBEDDED_HEALTH") == 1
+
+
+@pytest.mark.asyncio
+async def test_parse_in_processes(hass, mock_ilo_server):
+    """Test parsing the responses in worker processes."""
+    coordinator = create_coordinator(
+        hass, mock_ilo_server, TRANSPORT_ASYNC, **{CONF_PARSE_PROCESSES: True}
+    )
+    try:
+        await coordinator.async_refresh()
+        health = coordinator.transport._parsed["get_embedded_health"][1]
+        coordinator.async_mark_due()
+        await coordinator.async_refresh()
+        assert coordinator.fleet._parse_executor is not None
+        # The workers only send the reduced health data back
+        assert isinstance(health, HpIloHealth)
+        # The unchanged health data wasn't parsed again
+        assert coordinator.transport._parsed["get_embedded_health"][1] is health
+        # Only the reduced health data is kept
+        assert list(coordinator.transport._parsed) == ["get_embedded_health"]
+        # The parse time is measured like in the event loop
+        summary = coordinator.transport.stats.summary(OPERATION_FETCH)
+        assert summary["last"]["parse_time"] > 0
+    finally:
+        await coordinator.async_shutdown()
+
+    assert coordinator.last_update_success
+    data = coordinator.data
+    assert data.power_status == MOCK_ILO_POWER_STATUS
+    assert data.temperatures["02-CPU 1"].value == 40
+
+
+@pytest.mark.asyncio
+async def test_unchanged_health_is_not_merged_again(hass, mock_ilo_server):
+    """Test that reused health results aren't snapshotted again."""
+    coordinator = create_coordinator(hass, mock_ilo_server, TRANSPORT_ASYNC)
+    snapshot = Mock(wraps=SNAPSHOTS["health"])
+    try:
+        with patch.dict(SNAPSHOTS, {"health": snapshot}):
+            await coordinator.async_refresh()
+            unsub = coordinator.async_add_listener(lambda: None, "temperatures")
+            coordinator.async_mark_due()
+            await coordinator.async_refresh()
+            unsub()
+    finally:
+        await coordinator.async_shutdown()
+
+    assert mock_ilo_server.commands.count("GET_EMBEDDED_HEALTH") == 2
+    assert snapshot.call_count == 1
+    assert coordinator.data.temperatures["02-CPU 1"].value == 40
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("transport", [TRANSPORT_EXECUTOR, TRANSPORT_ASYNC])
+async def test_unsupported_call(hass, mock_ilo_server, transport):
+    """Test that a rejected batch falls back to individual calls."""
+    mock_ilo_server.settings.unsupported = frozenset({"GET_SERVER_POWER_ON_TIME"})
+    coordinator = create_coordinator(hass, mock_ilo_server, transport)
+    try:
+        await coordinator.async_refresh()
+    finally:
+        await coordinator.async_shutdown()
+
+    assert coordinator.last_update_success
+    assert coordinator.data.power_on_time is None
+    assert coordinator.data.power_status == MOCK_ILO_POWER_STATUS
+    assert coordinator.capabilities.unsupported == {"get_server_power_on_time"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("transport", [TRANSPORT_EXECUTOR, TRANSPORT_ASYNC])
+async def test_dropped_connection(hass, mock_ilo_server, transport):
+    """Test that a dropped connection is a communication error."""
+    mock_ilo_server.settings.failure_rate = 1.0
+    coordinator = create_coordinator(hass, mock_ilo_server, transport)
+    try:
+        await coordinator.async_refresh()
+    finally:
+        await coordinator.async_shutdown()
+
+    assert not coordinator.last_update_success
@@ -0,0 +1,43 @@
+"""Test the hp_ilo xmldata probe."""
+import aiohttp
+import hpilo
+import pytest
+
+from custom_components.hp_ilo.probe import HpIloIdentity, async_probe
+
+from .const import MOCK_XMLDATA_RESPONSE
+
+URL = "https://192.168.1.100:443/xmldata?item=all"
+
+
+@pytest.mark.asyncio
+async def test_probe_identity(hass, aioclient_mock):
+    """Test that the identity is read without logging in."""
+    aioclient_mock.get(URL, text=MOCK_XMLDATA_RESPONSE)
+
+    identity = await async_probe(hass, "192.168.1.100", 443)
+
+    assert identity == HpIloIdentity(
+        serial_number="ABC123DEF456",
+        product_name="ProLiant DL360 Gen10",
+        uuid="12345678-1234-1234-1234-123456789012",
+        management_processor="Integrated Lights-Out 4 (iLO 4)",
+        firmware_version="2.53",
+    )
+
+
+@pytest.mark.asyncio
+async def test_probe_xmldata_disabled(hass, aioclient_mock):
+    """Test that a reachable iLO without xmldata has no identity."""
+    aioclient_mock.get(URL, status=404)
+
+    assert await async_probe(hass, "192.168.1.100", 443) is None
+
+
+@pytest.mark.asyncio
+async def test_probe_unreachable(hass, aioclient_mock):
+    """Test that an unreachable iLO raises a communication error."""
+    aioclient_mock.get(URL, exc=aiohttp.ClientConnectionError("refused"))
+
+    with pytest.raises(hpilo.IloCommunicationError):
+        await async_probe(hass, "192.168.1.100", 443)
@@ -0,0 +1,168 @@
+"""Test the hp_ilo Redfish transport."""
+from http import HTTPStatus
+
+import hpilo
+import pytest
+
+from custom_components.hp_ilo.health import HpIloHealth, reduce_health
+from custom_components.hp_ilo.redfish import HpIloRedfishTransport
+
+from .const import (
+    MOCK_ILO_POWER_READINGS,
+    MOCK_REDFISH_MANAGER,
+    MOCK_REDFISH_POWER,
+    MOCK_REDFISH_SYSTEM,
+    MOCK_REDFISH_THERMAL,
+)
+
+BASE_URL = "https://192.168.1.100:443"
+SESSION_URL = f"{BASE_URL}/redfish/v1/SessionService/Sessions/admin1/"
+
+
+@pytest.fixture(name="transport")
+async def transport_fixture(hass, aioclient_mock):
+    """Return a Redfish transport."""
+    transport = HpIloRedfishTransport(
+        hass, "192.168.1.100", 443, "Administrator", "secret"
+    )
+    yield transport
+    await transport.async_close()
+
+
+def mock_redfish(aioclient_mock, status=HTTPStatus.OK):
+    """Mock the Redfish API of an iLO."""
+    aioclient_mock.post(
+        f"{BASE_URL}/redfish/v1/SessionService/Sessions/",
+        status=HTTPStatus.CREATED,
+        headers={"X-Auth-Token": "token", "Location": SESSION_URL},
+    )
+    aioclient_mock.delete(SESSION_URL)
+    for path, body in (
+        ("/redfish/v1/Systems/1/", MOCK_REDFISH_SYSTEM),
+        ("/redfish/v1/Managers/1/", MOCK_REDFISH_MANAGER),
+        ("/redfish/v1/Chassis/1/Thermal/", MOCK_REDFISH_THERMAL),
+        ("/redfish/v1/Chassis/1/Power/", MOCK_REDFISH_POWER),
+    ):
+        aioclient_mock.get(
+            f"{BASE_URL}{path}",
+            status=status,
+            json=body if status == HTTPStatus.OK else None,
+            headers={"ETag": f'W/"{path}"'},
+        )
+
+
+@pytest.mark.asyncio
+async def test_fetch_maps_resources(transport, aioclient_mock):
+    """Test that Redfish resources are mapped to python-hpilo's results."""
+    mock_redfish(aioclient_mock)
+
+    results = await transport.async_fetch(
+        ["get_host_power_status", "get_server_name", "get_embedded_health"]
+    )
+
+    assert results["get_host_power_status"] == "ON"
+    assert results["get_server_name"] == "TESTSERVER"
+    health = results["get_embedded_health"]
+    assert health["temperature"]["01-Inlet Ambient"]["currentreading"] == (
+        21,
+        "Celsius",
+    )
+    assert health["temperature"]["12-P1 DIMM 1-6"]["status"] == "Not Installed"
+    assert health["fans"]["Fan 1"]["speed"] == (18, "Percentage")
+    assert health["firmware_information"]["iLO"] == "iLO 5 v2.44"
+    # One login, each resource fetched once
+    assert aioclient_mock.call_count == 4
+
+
+@pytest.mark.asyncio
+async def test_fetch_maps_power_readings(transport, aioclient_mock):
+    """Test that the power resource is mapped to get_power_readings()."""
+    mock_redfish(aioclient_mock)
+
+    results = await transport.async_fetch(["get_power_readings"])
+
+    assert results["get_power_readings"] == MOCK_ILO_POWER_READINGS
+
+
+@pytest.mark.asyncio
+async def test_unchanged_resources_are_reused(transport, aioclient_mock):
+    """Test that 304 responses are answered from the cache."""
+    mock_redfish(aioclient_mock)
+    await transport.async_fetch(["get_host_power_status"])
+
+    aioclient_mock.clear_requests()
+    mock_redfish(aioclient_mock, status=HTTPStatus.NOT_MODIFIED)
+    results = await transport.async_fetch(["get_host_power_status"])
+
+    assert results["get_host_power_status"] == "ON"
+    # The session is reused
+    assert aioclient_mock.call_count == 1
+    _, _, _, headers = aioclient_mock.mock_calls[0]
+    assert headers["If-None-Match"] == 'W/"/redfish/v1/Systems/1/"'
+
+
+@pytest.mark.asyncio
+async def test_unchanged_results_are_reused(transport, aioclient_mock):
+    """Test that identical bodies without ETags aren't parsed or mapped again."""
+    mock_redfish(aioclient_mock)
+    first = await transport.async_fetch(["get_embedded_health"])
+
+    aioclient_mock.clear_requests()
+    mock_redfish(aioclient_mock)
+    second = await transport.async_fetch(["get_embedded_health"])
+
+    assert second["get_embedded_health"] is first["get_embedded_health"]
+
+
+@pytest.mark.asyncio
+async def test_only_reduced_results_are_kept(transport, aioclient_mock):
+    """Test that the reducers are applied before the results are kept."""
+    transport.reducers = {"get_embedded_health": reduce_health}
+    mock_redfish(aioclient_mock)
+
+    results = await transport.async_fetch(["get_embedded_health"])
+
+    health = results["get_embedded_health"]
+    assert isinstance(health, HpIloHealth)
+    assert health.fans["Fan 1"].value == 18
+    assert transport._mapped["get_embedded_health"][1] is health
+
+
+@pytest.mark.asyncio
+async def test_power_on_time_is_not_supported(transport, aioclient_mock):
+    """Test that queries without a Redfish equivalent are left out."""
+    mock_redfish(aioclient_mock)
+
+    results = await transport.async_fetch(
+        ["get_host_power_status", "get_server_power_on_time"]
+    )
+
+    assert results == {"get_host_power_status": "ON"}
+
+
+@pytest.mark.asyncio
+async def test_login_failed(transport, aioclient_mock):
+    """Test that rejected credentials raise IloLoginFailed."""
+    aioclient_mock.post(
+        f"{BASE_URL}/redfish/v1/SessionService/Sessions/",
+        status=HTTPStatus.UNAUTHORIZED,
+    )
+
+    with pytest.raises(hpilo.IloLoginFailed):
+        await transport.async_fetch(["get_host_power_status"])
+
+
+@pytest.mark.asyncio
+async def test_invalid_json(transport, aioclient_mock):
+    """Test that a malformed body isn't a communication error."""
+    aioclient_mock.post(
+        f"{BASE_URL}/redfish/v1/SessionService/Sessions/",
+        status=HTTPStatus.CREATED,
+        headers={"X-Auth-Token": "token", "Location": SESSION_URL},
+    )
+    aioclient_mock.delete(SESSION_URL)
+    aioclient_mock.get(f"{BASE_URL}/redfish/v1/Systems/1/", text="{not json")
+
+    with pytest.raises(hpilo.IloError) as excinfo:
+        await transport.async_fetch(["get_host_power_status"])
+    assert not isinstance(excinfo.value, hpilo.IloCommunicationError)
@@ -0,0 +1,172 @@
+"""Test capturing iLO responses and replaying them."""
+import pytest
+
+from custom_components.hp_ilo.capture import (
+    CONF_CAPTURE,
+    REDACTED,
+    HpIloCapture,
+    capture_directory,
+    redact_redfish,
+    redact_ribcl,
+)
+from custom_components.hp_ilo.replay import (
+    LOGIN_DOCUMENT,
+    HpIloRedfishReplayTransport,
+    HpIloRibclReplayTransport,
+)
+from custom_components.hp_ilo.transport import TRANSPORT_ASYNC, TRANSPORT_REPLAY
+
+from .const import MOCK_CONFIG_FULL, MOCK_ILO_FW_VERSION, MOCK_ILO_POWER_STATUS
+from .test_mock_ilo import create_coordinator
+
+
+def test_redact_ribcl():
+    """Test that serial numbers, UUIDs and credentials are redacted."""
+    document = (
+        b'<SERIAL_NUMBER VALUE = "ABC123"/>\n'
+        b'<FIELD NAME="Serial Number" VALUE="ABC123"/>\n'
+        b'<FIELD NAME="UUID" VALUE="1234-5678"/>\n'
+        b'<FIELD NAME="Product Name" VALUE="ProLiant DL360 Gen10"/>\n'
+        b'<LOGIN USER_LOGIN="admin" PASSWORD="secret">\n'
+    )
+    redacted = redact_ribcl(document)
+    assert b"ABC123" not in redacted
+    assert b"1234-5678" not in redacted
+    assert b"admin" not in redacted
+    assert b"secret" not in redacted
+    assert b"ProLiant DL360 Gen10" in redacted
+    assert redacted.count(REDACTED.encode()) == 5
+
+
+def test_redact_redfish():
+    """Test that serial numbers and UUIDs are redacted at any depth."""
+    resource = {
+        "Model": "ProLiant DL360 Gen10",
+        "SerialNumber": "ABC123",
+        "Oem": {"Hpe": {"VirtualUUID": "1234-5678"}},
+        "Fans": [{"SerialNumber": "FAN1", "Reading": 20}],
+    }
+    assert redact_redfish(resource) == {
+        "Model": "ProLiant DL360 Gen10",
+        "SerialNumber": REDACTED,
+        "Oem": {"Hpe": {"VirtualUUID": REDACTED}},
+        "Fans": [{"SerialNumber": REDACTED, "Reading": 20}],
+    }
+
+
+@pytest.mark.asyncio
+async def test_capture_pairs_documents_by_content(hass, tmp_path):
+    """Test that documents without a payload aren't taken for an answer."""
+    power = (
+        b'<?xml version="1.0"?>\n<RIBCL VERSION="2.23">\n'
+        b'<RESPONSE STATUS="0x0000" MESSAGE=\'No error\' />\n'
+        b'<GET_HOST_POWER HOST_POWER="ON"/>\n</RIBCL>\n'
+    )
+    unsupported = (
+        b'<?xml version="1.0"?>\n<RIBCL VERSION="2.23">\n'
+        b'<RESPONSE STATUS="0x003C" MESSAGE=\'Not supported.\' />\n</RIBCL>\n'
+    )
+    # An extra document without a payload ahead of the answers
+    body = LOGIN_DOCUMENT + LOGIN_DOCUMENT + power + unsupported
+
+    await HpIloCapture(hass, tmp_path).async_save_ribcl(
+        ["get_host_power_status", "get_server_power_on_time"], body
+    )
+
+    assert (tmp_path / "ribcl" / "get_host_power_status.xml").read_bytes() == power
+    assert (
+        tmp_path / "ribcl" / "get_server_power_on_time.xml"
+    ).read_bytes() == unsupported
+
+
+@pytest.mark.asyncio
+async def test_capture_and_replay(hass, mock_ilo_server, tmp_path):
+    """Test that replayed captures give the same data as the live iLO."""
+    hass.config.config_dir = str(tmp_path)
+    mock_ilo_server.settings.extra_temperatures = 5
+    live = create_coordinator(
+        hass, mock_ilo_server, TRANSPORT_ASYNC, 0, **{CONF_CAPTURE: True}
+    )
+    try:
+        await live.async_refresh()
+    finally:
+        await live.async_shutdown()
+    assert live.last_update_success
+
+    directory = capture_directory(hass, "127.0.0.1")
+    captured = {path.name: path.read_bytes() for path in directory.rglob("*.xml")}
+    assert set(captured) == {
+        "get_embedded_health.xml",
+        "get_fw_version.xml",
+        "get_host_data.xml",
+        "get_host_power_status.xml",
+        "get_ilo_event_log.xml",
+        "get_power_readings.xml",
+        "get_server_event_log.xml",
+        "get_server_name.xml",
+        "get_server_power_on_time.xml",
+    }
+    for document in captured.values():
+        assert b"ABC123DEF456" not in document
+        assert MOCK_CONFIG_FULL["password"].encode() not in document
+
+    requests = mock_ilo_server.requests
+    replay = create_coordinator(hass, mock_ilo_server, TRANSPORT_REPLAY, 1)
+    try:
+        await replay.async_refresh()
+        # Commands are accepted and not sent anywhere
+        await replay.transport.async_call("press_pwr_btn")
+    finally:
+        await replay.async_shutdown()
+
+    assert replay.last_update_success
+    assert mock_ilo_server.requests == requests
+    assert replay.data.power_status == MOCK_ILO_POWER_STATUS
+    assert replay.data.fw_version == MOCK_ILO_FW_VERSION
+    assert replay.data.temperatures == live.data.temperatures
+    assert replay.data.fans == live.data.fans
+    assert replay.layout.model == live.layout.model
+    assert replay.transport.stats.summary("fetch")["bytes_received"] is not None
+    assert isinstance(replay.transport._replay, HpIloRibclReplayTransport)
+
+
+@pytest.mark.asyncio
+async def test_replay_missing_capture(hass, mock_ilo_server, tmp_path):
+    """Test that queries without a capture are unsupported."""
+    hass.config.config_dir = str(tmp_path)
+    live = create_coordinator(
+        hass, mock_ilo_server, TRANSPORT_ASYNC, 0, **{CONF_CAPTURE: True}
+    )
+    try:
+        await live.async_refresh()
+    finally:
+        await live.async_shutdown()
+    directory = capture_directory(hass, "127.0.0.1")
+    (directory / "ribcl" / "get_server_power_on_time.xml").unlink()
+
+    replay = create_coordinator(hass, mock_ilo_server, TRANSPORT_REPLAY, 1)
+    try:
+        await replay.async_refresh()
+    finally:
+        await replay.async_shutdown()
+
+    assert replay.last_update_success
+    assert replay.data.power_on_time is None
+    assert replay.capabilities.unsupported == {"get_server_power_on_time"}
+
+
+@pytest.mark.asyncio
+async def test_replay_redfish_captures(hass, mock_ilo_server, tmp_path):
+    """Test that Redfish captures are replayed when there are no others."""
+    hass.config.config_dir = str(tmp_path)
+    redfish = capture_directory(hass, "127.0.0.1") / "redfish"
+    redfish.mkdir(parents=True)
+    (redfish / "redfish_v1_Systems_1.json").write_text('{"PowerState": "On"}')
+
+    replay = create_coordinator(hass, mock_ilo_server, TRANSPORT_REPLAY)
+    try:
+        assert replay.transport._replay is None
+        assert await replay.transport.async_call("get_host_power_status") == "ON"
+    finally:
+        await replay.async_shutdown()
+    assert isinstance(replay.transport._replay, HpIloRedfishReplayTransport)
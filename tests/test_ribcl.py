@@ -0,0 +1,167 @@
+"""Test the hp_ilo asyncio RIBCL transport."""
+from unittest.mock import patch
+
+import hpilo
+import pytest
+
+from custom_components.hp_ilo.health import HpIloHealth, reduce_health
+from custom_components.hp_ilo.ribcl import HpIloRibclTransport, RibclRequest
+
+from .const import (
+    MOCK_RIBCL_EMBEDDED_HEALTH_RESPONSE,
+    MOCK_RIBCL_LOGIN_FAILED_RESPONSE,
+    MOCK_RIBCL_POWER_AND_NAME_RESPONSE,
+)
+
+URL = "https://192.168.1.100:443/ribcl"
+
+
+def test_request_document():
+    """Test that all calls are sent in one document with one login."""
+    request = RibclRequest("Administrator", "secret")
+    request.add("get_host_power_status")
+    request.add("get_server_name")
+    xml = request.to_xml().decode()
+
+    assert xml.count("<LOGIN") == 1
+    assert 'PASSWORD="secret"' in xml
+    assert "<GET_HOST_POWER_STATUS" in xml
+    assert "<GET_SERVER_NAME" in xml
+
+
+@pytest.mark.asyncio
+async def test_fetch(hass, aioclient_mock):
+    """Test a batched fetch over HTTPS."""
+    aioclient_mock.post(URL, text=MOCK_RIBCL_POWER_AND_NAME_RESPONSE)
+    transport = HpIloRibclTransport(
+        hass, "192.168.1.100", 443, "Administrator", "secret"
+    )
+
+    results = await transport.async_fetch(
+        ["get_host_power_status", "get_server_name"]
+    )
+
+    assert results == {
+        "get_host_power_status": "ON",
+        "get_server_name": "TESTSERVER",
+    }
+    assert aioclient_mock.call_count == 1
+    # Results without a reducer aren't kept
+    assert not transport._parsed
+
+
+@pytest.mark.asyncio
+async def test_unchanged_responses_are_not_parsed_again(hass, aioclient_mock):
+    """Test that an identical response document returns the previous result."""
+    aioclient_mock.post(URL, text=MOCK_RIBCL_EMBEDDED_HEALTH_RESPONSE)
+    transport = HpIloRibclTransport(
+        hass, "192.168.1.100", 443, "Administrator", "secret"
+    )
+    transport.reducers = {"get_embedded_health": reduce_health}
+
+    first = await transport.async_fetch(["get_embedded_health"])
+    second = await transport.async_fetch(["get_embedded_health"])
+    assert second["get_embedded_health"] is first["get_embedded_health"]
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.post(
+        URL,
+        text=MOCK_RIBCL_EMBEDDED_HEALTH_RESPONSE.replace(
+            '<CURRENTREADING VALUE = "40"', '<CURRENTREADING VALUE = "41"'
+        ),
+    )
+    third = await transport.async_fetch(["get_embedded_health"])
+    health = third["get_embedded_health"]
+    assert health is not first["get_embedded_health"]
+    assert health.temperatures["02-CPU 1"].value == 41
+
+
+@pytest.mark.asyncio
+async def test_only_reduced_results_are_kept(hass, aioclient_mock):
+    """Test that results with a reducer are reduced before they are cached."""
+    aioclient_mock.post(URL, text=MOCK_RIBCL_EMBEDDED_HEALTH_RESPONSE)
+    transport = HpIloRibclTransport(
+        hass, "192.168.1.100", 443, "Administrator", "secret"
+    )
+    transport.reducers = {"get_embedded_health": reduce_health}
+
+    health = (await transport.async_fetch(["get_embedded_health"]))[
+        "get_embedded_health"
+    ]
+    assert isinstance(health, HpIloHealth)
+    assert health.temperatures["02-CPU 1"].value == 40
+    assert transport._parsed["get_embedded_health"][1] is health
+
+    # Single calls aren't reduced
+    raw = await transport.async_call("get_embedded_health")
+    assert raw["temperature"]["02-CPU 1"]["currentreading"] == (40, "Celsius")
+
+
+@pytest.mark.asyncio
+async def test_large_responses_are_parsed_in_the_executor(hass, aioclient_mock):
+    """Test that only responses above the size threshold leave the event loop."""
+    aioclient_mock.post(URL, text=MOCK_RIBCL_EMBEDDED_HEALTH_RESPONSE)
+    transport = HpIloRibclTransport(
+        hass, "192.168.1.100", 443, "Administrator", "secret"
+    )
+
+    with patch.object(
+        hass, "async_add_executor_job", wraps=hass.async_add_executor_job
+    ) as mock_executor_job:
+        with patch("custom_components.hp_ilo.ribcl.PARSE_IN_EXECUTOR_SIZE", 1024):
+            results = await transport.async_fetch(["get_embedded_health"])
+        assert mock_executor_job.call_count == 1
+        health = results["get_embedded_health"]
+        assert health["temperature"]["02-CPU 1"]["currentreading"] == (40, "Celsius")
+
+        # The default threshold keeps the small mock response in the loop
+        await transport.async_fetch(["get_embedded_health"])
+        assert mock_executor_job.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_login_failed(hass, aioclient_mock):
+    """Test that iLO errors are raised as python-hpilo exceptions."""
+    aioclient_mock.post(URL, text=MOCK_RIBCL_LOGIN_FAILED_RESPONSE)
+    transport = HpIloRibclTransport(
+        hass, "192.168.1.100", 443, "Administrator", "wrong"
+    )
+
+    with pytest.raises(hpilo.IloLoginFailed):
+        await transport.async_fetch(["get_host_power_status"])
+
+
+@pytest.mark.asyncio
+async def test_communication_error(hass, aioclient_mock):
+    """Test that connection errors are raised as communication errors."""
+    aioclient_mock.post(URL, exc=TimeoutError())
+    transport = HpIloRibclTransport(
+        hass, "192.168.1.100", 443, "Administrator", "secret"
+    )
+
+    with pytest.raises(hpilo.IloCommunicationError):
+        await transport.async_fetch(["get_host_power_status"])
+
+
+@pytest.mark.asyncio
+async def test_embedded_health_is_parsed_selectively(hass, aioclient_mock):
+    """Test that only the requested health sections are parsed."""
+    aioclient_mock.post(URL, text=MOCK_RIBCL_EMBEDDED_HEALTH_RESPONSE)
+    transport = HpIloRibclTransport(
+        hass, "192.168.1.100", 443, "Administrator", "secret"
+    )
+
+    full = (await transport.async_fetch(["get_embedded_health"]))[
+        "get_embedded_health"
+    ]
+    transport.health_sections = ("temperature", "fans", "firmware_information")
+    selective = (await transport.async_fetch(["get_embedded_health"]))[
+        "get_embedded_health"
+    ]
+
+    assert set(full) > set(selective)
+    assert set(selective) == {"temperature", "fans", "firmware_information"}
+    for section in selective:
+        assert selective[section] == full[section]
+    assert selective["temperature"]["02-CPU 1"]["currentreading"] == (40, "Celsius")
+    assert selective["firmware_information"]["iLO"] == "2.53 Feb 17 2017"
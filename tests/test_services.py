@@ -0,0 +1,82 @@
+"""Test the services of the hp_ilo integration."""
+import cProfile
+from pathlib import Path
+import tracemalloc
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+
+from custom_components.hp_ilo.sensor import DOMAIN
+from custom_components.hp_ilo.services import SERVICE_PROFILE_REFRESH
+
+from .const import MOCK_CONFIG_FULL
+
+
+@pytest.fixture(name="config_entry")
+async def config_entry_fixture(hass, mock_hpilo, tmp_path):
+    """Set up a config entry, with the config directory in tmp_path."""
+    hass.config.config_dir = str(tmp_path)
+    config_entry = MockConfigEntry(
+        domain=DOMAIN, data=MOCK_CONFIG_FULL, unique_id="192.168.1.100"
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+    return config_entry
+
+
+@pytest.mark.asyncio
+async def test_profile_refresh(hass, config_entry, mock_hpilo, tmp_path):
+    """Test that a profiled refresh fetches everything and saves the stats."""
+    mock_hpilo.get_embedded_health.reset_mock()
+    response = await hass.services.async_call(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        {"config_entry_id": config_entry.entry_id, "trace_memory": True, "top": 5},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response["success"]
+    assert Path(response["file"]).parent == tmp_path
+    assert Path(response["file"]).is_file()
+    assert set(response["categories"]) == {"network", "parsing", "entities", "other"}
+    assert len(response["top"]) == 5
+    assert len(response["memory"]) <= 5
+    # All tiers were refreshed
+    assert mock_hpilo.get_embedded_health.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_profile_refresh_other_profiler(hass, config_entry):
+    """Test that memory isn't traced when another profiler is active."""
+    other = cProfile.Profile()
+    other.enable()
+    try:
+        with pytest.raises(HomeAssistantError):
+            await hass.services.async_call(
+                DOMAIN,
+                SERVICE_PROFILE_REFRESH,
+                {"config_entry_id": config_entry.entry_id, "trace_memory": True},
+                blocking=True,
+                return_response=True,
+            )
+    finally:
+        other.disable()
+
+    assert not tracemalloc.is_tracing()
+
+
+@pytest.mark.asyncio
+async def test_profile_refresh_unknown_entry(hass, config_entry):
+    """Test that entries of other integrations are rejected."""
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(
+            DOMAIN,
+            SERVICE_PROFILE_REFRESH,
+            {"config_entry_id": "unknown"},
+            blocking=True,
+            return_response=True,
+        )
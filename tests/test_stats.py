@@ -0,0 +1,64 @@
+"""Test the hp_ilo request statistics."""
+import hpilo
+import pytest
+
+from custom_components.hp_ilo.diagnostics import async_get_config_entry_diagnostics
+from custom_components.hp_ilo.sensor import DOMAIN
+from custom_components.hp_ilo.stats import OPERATION_FETCH, HpIloStats, note
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from .const import MOCK_CONFIG_FULL
+
+
+@pytest.mark.asyncio
+async def test_rolling_statistics():
+    """Test percentiles, notes and errors over the last calls."""
+    stats = HpIloStats(history=20)
+    for size in range(1, 31):
+        async with stats.async_measure(OPERATION_FETCH):
+            note(bytes_received=size, parse_time=0.001)
+            note(bytes_received=1000)
+    with pytest.raises(hpilo.IloCommunicationError):
+        async with stats.async_measure(OPERATION_FETCH):
+            note(retries=1)
+            raise hpilo.IloCommunicationError("down")
+
+    summary = stats.summary(OPERATION_FETCH)
+    assert summary["count"] == 20
+    # The last 19 successful calls received 1012..1030 bytes
+    assert summary["bytes_received"] == {"p50": 1021, "p95": 1030, "max": 1030}
+    assert summary["retries"] == 1
+    assert summary["errors"] == {"IloCommunicationError": 1}
+    assert summary["last"]["error"] == "IloCommunicationError"
+    assert stats.summary("get_host_power_status") is None
+
+    # Outside of a measured call notes are ignored
+    note(bytes_received=1)
+
+
+@pytest.mark.asyncio
+async def test_diagnostics(hass, mock_hpilo):
+    """Test that diagnostics contain the request statistics and no secrets."""
+    config_entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={**MOCK_CONFIG_FULL, "unique_id": "192.168.1.100_CZ12345678"},
+        unique_id="192.168.1.100_CZ12345678",
+    )
+    config_entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(config_entry.entry_id)
+    await hass.async_block_till_done()
+
+    diagnostics = await async_get_config_entry_diagnostics(hass, config_entry)
+
+    assert diagnostics["entry"]["data"]["password"] == "**REDACTED**"
+    # The unique ID holds the serial number
+    assert diagnostics["entry"]["unique_id"] == "**REDACTED**"
+    assert diagnostics["entry"]["data"]["unique_id"] == "**REDACTED**"
+    assert "CZ12345678" not in repr(diagnostics)
+    assert diagnostics["requests"][OPERATION_FETCH]["count"] == 1
+    assert diagnostics["breaker"]["state"] == "closed"
+    assert "Fan 1" in diagnostics["layout"]["fans"]
+    # The raw results are fetched, without serial numbers
+    host_data = diagnostics["raw"]["get_host_data"]
+    assert {"Serial Number": "**REDACTED**"} in host_data
+    assert "temperature" in diagnostics["raw"]["get_embedded_health"]